@@ -1,2 +1,10 @@
+from django.contrib import admin
 
-# Register your models here.
+from .models import SimulationJob
+
+
+@admin.register(SimulationJob)
+class SimulationJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'generation', 'max_generations', 'population', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('id', 'created_at', 'started_at', 'finished_at', 'heartbeat_at')
@@ -5,6 +5,14 @@ This package contains the core engine and utilities for running
 Conway's Game of Life simulations.
 """
 
-from .engine import check_cell, play_game_of_life
+from .cycles import CycleDetector
+from .delta import decode_deltas, encode_deltas
+from .engine import check_cell, create_engine, iter_game_of_life, iter_game_of_life_steps, play_game_of_life, select_engine
+from .generation import Generation
+from .hashlife import advance_game_of_life
+from .incremental import IncrementalEngine
+from .keyframes import KeyframeIndex
+from .rules import CONWAY, Rule, parse_rule
+from .serialization import decode_cells, encode_cells
 
-__all__ = ['check_cell', 'play_game_of_life']
+__all__ = ['CONWAY', 'CycleDetector', 'Generation', 'IncrementalEngine', 'KeyframeIndex', 'Rule', 'advance_game_of_life', 'check_cell', 'create_engine', 'decode_cells', 'decode_deltas', 'encode_cells', 'encode_deltas', 'iter_game_of_life', 'iter_game_of_life_steps', 'parse_rule', 'play_game_of_life', 'select_engine']
@@ -0,0 +1,235 @@
+"""
+Cost estimation and admission control for Game of Life simulations.
+
+The work of a simulation is roughly the work of one generation times the
+number of generations. Per generation, the incremental engine pays for every
+alive cell and its 8 neighbours, while the dense and bitset engines pay (much
+less) for every cell of the bounding box and the tiled engine for every cell
+of its occupied tiles; all of them then pay for every alive cell they send
+back. Estimates are expressed in cell updates and compared against budgets:
+
+- a hard limit on population and bounding-box area, beyond which a pattern
+  is rejected outright,
+- a per-request budget, which shortens the run when it is exceeded,
+- a per-process budget shared by all simulations in flight, which turns new
+  requests away while the process is busy.
+"""
+
+import logging
+import math
+import threading
+from typing import NamedTuple
+
+from .bitset import BitsetEngine
+from .dense import DenseEngine
+from .engine import select_engine
+from .tiled import TILE_SIZE, TiledEngine
+from .serialization import bounding_box
+
+logger = logging.getLogger('playground.game_of_life.admission')
+
+# Cell updates per alive cell per generation on the incremental engine (the cell and its neighbours)
+INCREMENTAL_CELL_COST = 9
+
+# Cell updates per bounding-box cell per generation on the dense engine, which is vectorized
+DENSE_CELL_COST = 0.25
+
+# Cell updates per bounding-box cell per generation on the bitset engine, which works a row at a time
+BITSET_CELL_COST = 0.5
+
+# Cell updates per alive cell per generation for building the output (lists, pickling and JSON)
+OUTPUT_CELL_COST = 4
+
+# Headroom for patterns that grow while they run, applied to the initial population
+GROWTH_FACTOR = 2
+
+# Cell updates per alive cell per doubling of the generations of a Hashlife jump. Regular patterns
+# cost far less, but chaotic ones defeat the memo tables and come close to it.
+HASHLIFE_CELL_COST = 1000
+
+
+class PatternTooLarge(ValueError):
+    """The pattern or the requested run is larger than any budget allows."""
+
+
+class Overloaded(RuntimeError):
+    """The process is already running as many simulations as its budget allows."""
+
+
+class CostEstimate(NamedTuple):
+    """Estimated cost of simulating a pattern."""
+
+    population: int
+    area: int
+    engine: str
+    cost_per_generation: float
+
+    def cost(self, generations: int) -> float:
+        """Return the estimated cell updates needed for a number of generations."""
+        return self.cost_per_generation * generations
+
+
+class Ticket(NamedTuple):
+    """An admitted simulation: how many generations it may run, and the cost it holds."""
+
+    generations: int
+    cost: float
+    downscaled: bool
+
+
+def estimate_cost(cells, engine: str = 'auto') -> CostEstimate:
+    """
+    Estimate the per-generation cost of simulating a pattern.
+
+    Args:
+        cells: Collection of (x, y) coordinates of alive cells
+        engine: Engine that will run the pattern, or 'auto' for the one select_engine picks
+
+    Returns:
+        CostEstimate with the pattern's size and the engine that would run it
+    """
+    if not cells:
+        return CostEstimate(0, 0, 'incremental', 1)
+
+    min_x, min_y, max_x, max_y = bounding_box(cells)
+    area = (max_x - min_x + 1) * (max_y - min_y + 1)
+    population = len(cells)
+    if engine == 'auto':
+        engine = select_engine(cells)
+    if engine in (DenseEngine.name, BitsetEngine.name):
+        # Both engines grow their board with the pattern, so the box gets the same headroom
+        cell_cost = DENSE_CELL_COST if engine == DenseEngine.name else BITSET_CELL_COST
+        cost_per_generation = (cell_cost * area + OUTPUT_CELL_COST * population) * GROWTH_FACTOR
+    elif engine == TiledEngine.name:
+        tiles = len({(x_pos // TILE_SIZE, y_pos // TILE_SIZE) for x_pos, y_pos in cells})
+        cost_per_generation = (DENSE_CELL_COST * tiles * TILE_SIZE * TILE_SIZE + OUTPUT_CELL_COST * population) * GROWTH_FACTOR
+    else:
+        cost_per_generation = (INCREMENTAL_CELL_COST + OUTPUT_CELL_COST) * population * GROWTH_FACTOR
+    return CostEstimate(population, area, engine, max(cost_per_generation, 1))
+
+
+def estimate_jump_cost(cells, generations: int) -> float:
+    """
+    Estimate the cost of jumping a pattern ahead by a number of generations with Hashlife.
+
+    Hashlife advances by powers of two, so the cost grows with the logarithm of the
+    generations rather than with the generations themselves. Empty space is shared
+    between quadtree nodes, so the bounding box only adds a few tree levels.
+    """
+    return max(HASHLIFE_CELL_COST * len(cells) * math.log2(generations + 1), 1)
+
+
+class AdmissionController:
+    """
+    Decides whether simulations may run, and for how many generations.
+
+    Admitted simulations hold their estimated cost until they are released,
+    so concurrent requests in the same process share one budget.
+    """
+
+    def __init__(self, max_population: int, max_area: int, request_budget: float, process_budget: float, min_generations: int = 10, engine: str = 'auto'):
+        self.engine = engine
+        self.max_population = max_population
+        self.max_area = max_area
+        self.request_budget = request_budget
+        self.process_budget = process_budget
+        self.min_generations = min_generations
+        self.in_flight = 0.0
+        self._lock = threading.Lock()
+
+    def check_size(self, cells) -> CostEstimate:
+        """
+        Check a pattern against the population and bounding-box limits.
+
+        Returns:
+            The pattern's CostEstimate
+
+        Raises:
+            PatternTooLarge: If the pattern is over either limit
+        """
+        estimate = estimate_cost(cells, self.engine)
+        if estimate.population > self.max_population:
+            raise PatternTooLarge(f"Pattern has {estimate.population} alive cells, the limit is {self.max_population}")
+        if estimate.area > self.max_area:
+            raise PatternTooLarge(f"Pattern spans {estimate.area} cells, the limit is {self.max_area}")
+        return estimate
+
+    def admit(self, cells, generations: int, allow_downscale: bool = True) -> Ticket:
+        """
+        Admit a simulation, shortening it if it is over the per-request budget.
+
+        Args:
+            cells: Collection of (x, y) coordinates of alive cells
+            generations: Number of generations requested
+            allow_downscale: Whether the run may be shortened instead of rejected
+
+        Returns:
+            Ticket to pass to release() once the simulation is over
+
+        Raises:
+            PatternTooLarge: If the pattern is over the size limits, or the run can't be
+                shortened enough to fit the per-request budget
+            Overloaded: If the process budget is used up by simulations in flight
+        """
+        estimate = self.check_size(cells)
+
+        downscaled = False
+        if estimate.cost(generations) > self.request_budget:
+            affordable = int(self.request_budget // estimate.cost_per_generation)
+            if not allow_downscale or affordable < self.min_generations:
+                raise PatternTooLarge(f"Simulation would cost about {estimate.cost(generations):.0f} cell updates, the limit is {self.request_budget:.0f}")
+            logger.info(f"Downscaling simulation of {estimate.population} cells from {generations} to {affordable} generations")
+            generations = affordable
+            downscaled = True
+
+        cost = estimate.cost(generations)
+        self._reserve(cost)
+        return Ticket(generations, cost, downscaled)
+
+    def admit_jump(self, cells, generations: int) -> Ticket:
+        """
+        Admit a Hashlife jump, see estimate_jump_cost. A jump can't be shortened, only rejected.
+
+        Returns:
+            Ticket to pass to release() once the jump is over
+
+        Raises:
+            PatternTooLarge: If the pattern is over the size limits, or the jump over the per-request budget
+            Overloaded: If the process budget is used up by simulations in flight
+        """
+        self.check_size(cells)
+        cost = estimate_jump_cost(cells, generations)
+        if cost > self.request_budget:
+            raise PatternTooLarge(f"Jumping {len(cells)} cells ahead by {generations} generations would cost about {cost:.0f} cell updates, the limit is {self.request_budget:.0f}")
+        self._reserve(cost)
+        return Ticket(generations, cost, False)
+
+    def admit_batch(self, patterns, generations: int, max_cost: float) -> Ticket:
+        """
+        Admit a batch of simulations, such as a search, cut short by a deadline rather than downscaled.
+
+        The batch holds the summed cost of its patterns, up to max_cost: work past that is
+        left out by the batch's time budget, so it never reaches the process.
+
+        Returns:
+            Ticket to pass to release() once the batch is over
+
+        Raises:
+            PatternTooLarge: If a pattern is over the size limits
+            Overloaded: If the process budget is used up by simulations in flight
+        """
+        cost = min(sum(self.check_size(cells).cost(generations) for cells in patterns), max_cost)
+        self._reserve(cost)
+        return Ticket(generations, cost, False)
+
+    def _reserve(self, cost: float) -> None:
+        """Hold cost from the process budget, or raise Overloaded if it is used up."""
+        with self._lock:
+            if self.in_flight + cost > self.process_budget:
+                raise Overloaded(f"{self.in_flight:.0f} cell updates already in flight, the limit is {self.process_budget:.0f}")
+            self.in_flight += cost
+
+    def release(self, ticket: Ticket) -> None:
+        """Give back the budget held by an admitted simulation."""
+        with self._lock:
+            self.in_flight = max(self.in_flight - ticket.cost, 0.0)
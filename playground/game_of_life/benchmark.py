@@ -0,0 +1,217 @@
+"""
+Benchmark suite for the Game of Life engines.
+
+A fixed corpus (the preset patterns, two classic methuselahs and seeded
+random soups) is run through play_game_of_life with every engine, recording
+generations per second and peak traced memory. The generations of each
+pattern are then serialized in every output format and encoding, the way the
+stream endpoint sends them. Results are plain JSON, so that runs from two
+commits can be compared and regressions past a threshold reported.
+"""
+
+import json
+import logging
+import platform
+import random
+import time
+import tracemalloc
+
+from .catalog import preset_patterns
+from .delta import DEFAULT_KEYFRAME_INTERVAL, encode_deltas, steps_from_generations
+from .dense import NUMPY_AVAILABLE
+from .engine import ENGINES, play_game_of_life
+from .search import random_soup
+from .serialization import ENCODINGS, encode_cells, encode_frame
+
+logger = logging.getLogger('playground.game_of_life.benchmark')
+
+# Bump whenever results stop being comparable with earlier ones (corpus or measurements changed)
+RESULTS_VERSION = 1
+
+DEFAULT_GENERATIONS = 300
+DEFAULT_REPEAT = 3
+
+# Relative slowdown (or memory growth) past which a measurement counts as a regression. Timings of
+# the same commit vary by a few tens of percent between runs on shared machines.
+DEFAULT_REGRESSION_THRESHOLD = 0.5
+# Measurements shorter than this are mostly timer noise and are never reported as regressions
+REGRESSION_MIN_SECONDS = 0.01
+
+METHUSELAHS = {
+    'r-pentomino': [(1, 0), (2, 0), (0, 1), (1, 1), (1, 2)],
+    'acorn': [(1, 0), (3, 1), (0, 2), (1, 2), (4, 2), (5, 2), (6, 2)],
+}
+
+# Random soups as (side, density), each generated from its own fixed seed
+SOUPS = ((32, 0.2), (32, 0.5), (96, 0.375))
+SOUP_SEED = 1970
+
+OUTPUT_FORMATS = ('full', 'delta')
+
+
+def benchmark_corpus() -> dict[str, list[tuple[int, int]]]:
+    """Return the benchmarked patterns by name, the same on every run."""
+    corpus = dict(preset_patterns())
+    corpus.update(METHUSELAHS)
+    for side, density in SOUPS:
+        corpus[f'soup-{side}-{density}'] = random_soup(side, side, density, random.Random(f'{SOUP_SEED}-{side}-{density}'))
+    return corpus
+
+
+def available_engines() -> list[str]:
+    """Return the engines that can run here, the NumPy ones only when it is installed."""
+    return [name for name in ENGINES if NUMPY_AVAILABLE or name not in ('dense', 'tiled')]
+
+
+def serialize(cells, generations, output_format: str, encoding: str, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> bytes:
+    """Serialize generations like the stream endpoint's frames mode."""
+    if output_format == 'delta':
+        frames = encode_deltas(steps_from_generations(cells, generations), keyframe_interval)
+        payload = [encode_frame(frame, encoding) for frame in frames]
+    else:
+        payload = [encode_cells(generation, encoding) for generation in generations]
+    return json.dumps(payload).encode()
+
+
+def benchmark_engine(cells, engine: str, generations: int, repeat: int) -> dict:
+    """
+    Measure one engine on one pattern.
+
+    The timed runs and the traced run are separate, since tracemalloc slows
+    allocations down severalfold. Memory used by the tiled engine's worker
+    processes is not traced.
+
+    Returns:
+        Dict with the 'generations' simulated, the best 'seconds' of repeat runs,
+        'generations_per_second' and 'peak_memory_bytes'
+    """
+    best = None
+    simulated = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        simulated = len(play_game_of_life(cells, generations, engine))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        play_game_of_life(cells, generations, engine)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'generations': simulated,
+        'seconds': best,
+        'generations_per_second': simulated / best if best else None,
+        'peak_memory_bytes': peak,
+    }
+
+
+def benchmark_serialization(cells, generations, repeat: int) -> list[dict]:
+    """Measure every output format and encoding on a pattern's generations, keeping the best of repeat runs."""
+    results = []
+    for output_format in OUTPUT_FORMATS:
+        for encoding in ENCODINGS:
+            best = None
+            size = 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                size = len(serialize(cells, generations, output_format, encoding))
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results.append({'format': output_format, 'encoding': encoding, 'seconds': best, 'bytes': size})
+    return results
+
+
+def run_benchmarks(generations: int = DEFAULT_GENERATIONS, repeat: int = DEFAULT_REPEAT, engines=None, patterns=None) -> dict:
+    """
+    Run the benchmark suite.
+
+    Args:
+        generations: Maximum generations simulated per pattern
+        repeat: Timed runs per measurement, the fastest one is kept
+        engines: Engines to measure (default: every engine available here)
+        patterns: Names of the corpus patterns to run (default: all of them)
+
+    Returns:
+        JSON-serializable results, see compare_results
+    """
+    corpus = benchmark_corpus()
+    if patterns:
+        unknown = set(patterns) - corpus.keys()
+        if unknown:
+            raise ValueError(f"Unknown benchmark patterns: {', '.join(sorted(unknown))}")
+        corpus = {name: corpus[name] for name in patterns}
+    engines = list(engines or available_engines())
+
+    engine_results = []
+    serialization_results = []
+    for name, cells in corpus.items():
+        for engine in engines:
+            result = benchmark_engine(cells, engine, generations, repeat)
+            engine_results.append({'pattern': name, 'engine': engine, **result})
+            logger.info(f"Benchmarked {name} on the {engine} engine: {result['generations_per_second'] or 0:.0f} generations/s, peak {result['peak_memory_bytes']} bytes")
+
+        # Every engine computes the same generations, serialization only depends on the pattern
+        simulated = play_game_of_life(cells, generations)
+        for result in benchmark_serialization(cells, simulated, repeat):
+            serialization_results.append({'pattern': name, **result})
+
+    return {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'numpy': NUMPY_AVAILABLE,
+        'generations': generations,
+        'repeat': repeat,
+        'engines': engine_results,
+        'serialization': serialization_results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> list[str]:
+    """
+    Find the measurements of current that regressed from baseline by more than threshold.
+
+    Only measurements present in both runs are compared: engine time and peak
+    memory per pattern and engine, and serialization time per pattern, format
+    and encoding.
+
+    Returns:
+        A description of every regression, empty if there is none
+
+    Raises:
+        ValueError: If the results were produced by incompatible benchmark runs
+    """
+    if baseline.get('version') != current.get('version'):
+        raise ValueError(f"Cannot compare benchmark results of version {baseline.get('version')} with version {current.get('version')}")
+    if baseline.get('generations') != current.get('generations'):
+        raise ValueError("Cannot compare benchmark results simulated over a different number of generations")
+
+    regressions = []
+
+    def check(label: str, metric: str, before, after, timed: bool = True):
+        if not before or after is None:
+            return
+        if timed and max(before, after) < REGRESSION_MIN_SECONDS:
+            return
+        change = after / before - 1
+        if change > threshold:
+            regressions.append(f"{label}: {metric} went from {before:.4g} to {after:.4g} (+{change:.0%})")
+
+    engines = {(result['pattern'], result['engine']): result for result in baseline.get('engines', [])}
+    for result in current.get('engines', []):
+        before = engines.get((result['pattern'], result['engine']))
+        if before is None:
+            continue
+        label = f"{result['pattern']} on {result['engine']}"
+        check(label, 'time', before['seconds'], result['seconds'])
+        check(label, 'peak memory', before['peak_memory_bytes'], result['peak_memory_bytes'], timed=False)
+
+    serialization = {(result['pattern'], result['format'], result['encoding']): result for result in baseline.get('serialization', [])}
+    for result in current.get('serialization', []):
+        before = serialization.get((result['pattern'], result['format'], result['encoding']))
+        if before is not None:
+            check(f"{result['pattern']} as {result['format']}/{result['encoding']}", 'serialization time', before['seconds'], result['seconds'])
+
+    return regressions
@@ -0,0 +1,138 @@
+"""
+In-memory cache of Game of Life simulation results.
+
+The Game of Life is translation invariant: shifting the initial pattern
+shifts every generation by the same amount. Results are therefore stored
+for the pattern moved to its bounding-box origin, and the offset is applied
+back on read, so the same shape drawn anywhere on the grid shares one entry.
+Entries are also keyed by rule, as the same shape evolves differently under
+each rule.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from .generation import Generation
+from .rules import CONWAY, Rule
+
+logger = logging.getLogger('playground.game_of_life.cache')
+
+# Rough memory cost of one cell kept as a tuple: a 2-tuple, its two ints and a slot in the frame
+BYTES_PER_CELL = 72
+BYTES_PER_GENERATION = 64
+
+
+class CachedSimulation(NamedTuple):
+    """A cached simulation result, positioned for the requested pattern."""
+
+    generations: list[Generation]
+    period: int | None
+    cycle_start: int | None
+
+
+def normalize_cells(cells) -> tuple[frozenset, int, int]:
+    """
+    Move a pattern to its bounding-box origin.
+
+    Returns:
+        Tuple of (normalized cells, x offset, y offset)
+    """
+    min_x = min(cell[0] for cell in cells)
+    min_y = min(cell[1] for cell in cells)
+    return frozenset((cell[0] - min_x, cell[1] - min_y) for cell in cells), min_x, min_y
+
+
+class SimulationCache:
+    """
+    LRU cache of simulation results keyed by the translation-normalized pattern.
+
+    Entries are evicted least recently used first whenever either the number
+    of entries or their estimated size in bytes goes over its limit.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        self._entries: OrderedDict[tuple, tuple[tuple[Generation, ...], int | None, int | None, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current usage."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.size_bytes,
+        }
+
+    def get(self, cells, max_generations: int, rule: Rule = CONWAY) -> CachedSimulation | None:
+        """
+        Look up the result of simulating cells under rule for up to max_generations.
+
+        Returns:
+            The cached result translated to the pattern's position, or None on a miss
+        """
+        if not cells:
+            return None
+
+        key, offset_x, offset_y = self._key(cells, max_generations, rule)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        generations, period, cycle_start, _ = entry
+        generations = [generation.translated(offset_x, offset_y) for generation in generations]
+        logger.debug(f"Simulation cache hit ({self.hits} hits, {self.misses} misses)")
+        return CachedSimulation(generations, period, cycle_start)
+
+    def put(self, cells, max_generations: int, generations, period: int | None, cycle_start: int | None, rule: Rule = CONWAY) -> None:
+        """Store the result of simulating cells under rule for up to max_generations."""
+        if not cells:
+            return
+
+        key, offset_x, offset_y = self._key(cells, max_generations, rule)
+        stored = tuple(
+            (generation if isinstance(generation, Generation) else Generation.from_cells(generation)).translated(-offset_x, -offset_y)
+            for generation in generations
+        )
+        size = sum(BYTES_PER_GENERATION + generation.nbytes for generation in stored)
+        if size > self.max_bytes:
+            logger.debug(f"Simulation result of {size} bytes is larger than the whole cache, not caching it")
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous[3]
+            self._entries[key] = (stored, period, cycle_start, size)
+            self.size_bytes += size
+
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= evicted[3]
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def _key(self, cells, max_generations: int, rule: Rule) -> tuple[tuple, int, int]:
+        normalized, offset_x, offset_y = normalize_cells(cells)
+        return (normalized, max_generations, rule.rulestring), offset_x, offset_y
@@ -0,0 +1,246 @@
+"""
+Precomputed catalog of the preset patterns.
+
+The presets never change between deployments, so their simulations are run
+once, by the build_pattern_catalog management command, and written to a
+versioned artifact. Web workers memory-map the artifact at startup: the
+patterns listing and each preset's delta-encoded generations are stored as
+ready-to-send JSON, so serving them costs neither simulation CPU nor any
+parsing.
+
+Artifact layout (little-endian):
+
+- header: the magic bytes, the format version and the length of the index,
+- index: JSON describing the catalog and where each blob starts and ends,
+- blobs: the listing response, then one JSON array of frames per pattern.
+"""
+
+import base64
+import functools
+import hashlib
+import io
+import json
+import logging
+import mmap
+import struct
+from pathlib import Path
+
+from django.utils.text import slugify
+from PIL import Image, ImageDraw
+
+from .cycles import CycleDetector
+from .delta import encode_deltas, steps_from_generations
+from .engine import play_game_of_life
+from .search import CYCLE, DIED, RUNNING
+from .serialization import bounding_box, encode_cells
+
+logger = logging.getLogger('playground.game_of_life.catalog')
+
+CATALOG_MAGIC = b'GOLCAT'
+# Bump whenever the layout or the content of the artifact changes, older artifacts are then ignored
+CATALOG_VERSION = 1
+HEADER = struct.Struct('<6sHI')
+
+# Size of the preview thumbnails in pixels, the size of the previews drawn by conways.js
+THUMBNAIL_WIDTH = 100
+THUMBNAIL_HEIGHT = 60
+THUMBNAIL_PADDING = 8
+THUMBNAIL_MAX_CELL_SIZE = 8
+
+# Preset patterns the catalog is built from
+PATTERNS_PATH = Path(__file__).resolve().parent / 'patterns.json'
+
+
+class CatalogError(ValueError):
+    """The artifact is not a pattern catalog, or was built by another version."""
+
+
+@functools.cache
+def preset_patterns() -> dict[str, list[tuple[int, int]]]:
+    """Return the cells of the preset patterns by slug, read once per process."""
+    with open(PATTERNS_PATH, 'r', encoding='utf-8') as file:
+        patterns = json.load(file)['patterns']
+    return {slugify(pattern['name']): [(cell[0], cell[1]) for cell in pattern['cells']] for pattern in patterns}
+
+
+def source_hash(source: bytes) -> str:
+    """Return the hash identifying the patterns file a catalog was built from."""
+    return hashlib.sha256(source).hexdigest()
+
+
+def render_thumbnail(cells, width: int = THUMBNAIL_WIDTH, height: int = THUMBNAIL_HEIGHT) -> str:
+    """
+    Draw a pattern centred in a small image.
+
+    Returns:
+        The image as a PNG data URI
+    """
+    image = Image.new('RGB', (width, height), '#222222')
+    if cells:
+        min_x, min_y, max_x, max_y = bounding_box(cells)
+        pattern_width = max_x - min_x + 1
+        pattern_height = max_y - min_y + 1
+        scale = min((width - 2 * THUMBNAIL_PADDING) / pattern_width, (height - 2 * THUMBNAIL_PADDING) / pattern_height, THUMBNAIL_MAX_CELL_SIZE)
+        cell_size = max(1, int(scale))
+        offset_x = (width - pattern_width * cell_size) // 2
+        offset_y = (height - pattern_height * cell_size) // 2
+
+        draw = ImageDraw.Draw(image)
+        for x_pos, y_pos in cells:
+            left = offset_x + (x_pos - min_x) * cell_size
+            top = offset_y + (y_pos - min_y) * cell_size
+            draw.rectangle((left, top, left + cell_size - 1, top + cell_size - 1), fill='#00ff00')
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def build_catalog(patterns_source: bytes, max_generations: int, keyframe_interval: int) -> bytes:
+    """
+    Simulate every pattern of a patterns file and pack the results into an artifact.
+
+    Args:
+        patterns_source: Contents of patterns.json
+        max_generations: Generations simulated per pattern, like a request's first chunk
+        keyframe_interval: Keyframe interval of the delta-encoded frames
+
+    Returns:
+        The artifact's bytes
+    """
+    patterns = json.loads(patterns_source)['patterns']
+    listing = []
+    entries = []
+    blobs = []
+    for pattern in patterns:
+        cells = [(cell[0], cell[1]) for cell in pattern['cells']]
+        detector = CycleDetector(cells)
+        generations = play_game_of_life(cells, max_generations, detector=detector)
+
+        if detector.period is not None:
+            outcome, lifespan = CYCLE, detector.cycle_start
+        elif generations and not generations[-1]:
+            outcome, lifespan = DIED, len(generations)
+        else:
+            outcome, lifespan = RUNNING, len(generations)
+
+        frames = list(encode_deltas(steps_from_generations(cells, generations), keyframe_interval))
+        summary = {
+            'name': pattern['name'],
+            'slug': slugify(pattern['name']),
+            'description': pattern['description'],
+            'outcome': outcome,
+            'lifespan': lifespan,
+            'period': detector.period,
+            'cycle_start': detector.cycle_start,
+            'total_generations': len(generations),
+        }
+        listing.append({**pattern, **summary, 'thumbnail': render_thumbnail(cells)})
+        entries.append({
+            **summary,
+            # Still evolving at the end of the run: the last generation lets the client continue from there
+            'last_cells': encode_cells(generations[-1], 'rle') if outcome == RUNNING and generations else None,
+        })
+        blobs.append(json.dumps(frames, separators=(',', ':')).encode())
+        logger.info(f"Catalogued pattern {pattern['name']}: {outcome} after {lifespan} generations")
+
+    blobs.insert(0, json.dumps({'patterns': listing}, separators=(',', ':')).encode())
+    offsets = []
+    position = 0
+    for blob in blobs:
+        offsets.append([position, position + len(blob)])
+        position += len(blob)
+
+    for entry, span in zip(entries, offsets[1:]):
+        entry['frames'] = span
+    index = json.dumps({
+        'source_hash': source_hash(patterns_source),
+        'max_generations': max_generations,
+        'keyframe_interval': keyframe_interval,
+        'listing': offsets[0],
+        'patterns': entries,
+    }).encode()
+    return HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, len(index)) + index + b''.join(blobs)
+
+
+class PatternCatalog:
+    """
+    Memory-mapped pattern catalog.
+
+    Only the index is parsed when the catalog is opened; the listing and the
+    frames are handed out as slices of the mapping.
+    """
+
+    def __init__(self, mapping: mmap.mmap):
+        self._mapping = mapping
+        magic, version, index_length = HEADER.unpack_from(mapping, 0) if len(mapping) >= HEADER.size else (None, None, 0)
+        if magic != CATALOG_MAGIC:
+            raise CatalogError("Not a pattern catalog")
+        if version != CATALOG_VERSION:
+            raise CatalogError(f"Pattern catalog version {version} is not supported, expected {CATALOG_VERSION}")
+
+        self._data_start = HEADER.size + index_length
+        index = json.loads(mapping[HEADER.size:self._data_start])
+        self.source_hash: str = index['source_hash']
+        self.max_generations: int = index['max_generations']
+        self.keyframe_interval: int = index['keyframe_interval']
+        self._listing = index['listing']
+        self.patterns: dict[str, dict] = {entry['slug']: entry for entry in index['patterns']}
+
+    @classmethod
+    def open(cls, path) -> 'PatternCatalog':
+        """
+        Memory-map a catalog artifact.
+
+        Raises:
+            OSError: If the file can't be read
+            CatalogError: If the file is not a catalog of the current version
+        """
+        with open(path, 'rb') as file:
+            # The mapping stays valid after the file is closed, and after the artifact is replaced
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapping)
+        except (ValueError, KeyError, struct.error):
+            mapping.close()
+            raise
+
+    def listing(self) -> memoryview:
+        """Return the patterns listing, as the JSON body of the patterns endpoint."""
+        return self._slice(self._listing)
+
+    def frames(self, slug: str) -> memoryview:
+        """Return a pattern's delta-encoded frames as a JSON array."""
+        return self._slice(self.patterns[slug]['frames'])
+
+    def _slice(self, span) -> memoryview:
+        start, end = span
+        return memoryview(self._mapping)[self._data_start + start:self._data_start + end]
+
+
+def load_catalog(path) -> PatternCatalog | None:
+    """
+    Open the catalog artifact, if there is a usable one.
+
+    A missing, invalid or stale artifact (built from other patterns than the
+    current patterns.json) is not an error: presets are then simulated on
+    request like any other pattern.
+
+    Returns:
+        The catalog, or None
+    """
+    try:
+        catalog = PatternCatalog.open(path)
+    except FileNotFoundError:
+        logger.warning(f"No pattern catalog at {path}, run the build_pattern_catalog command to precompute the presets")
+        return None
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        logger.warning(f"Ignoring unusable pattern catalog at {path}: {e}")
+        return None
+
+    if catalog.source_hash != source_hash(PATTERNS_PATH.read_bytes()):
+        logger.warning(f"Ignoring stale pattern catalog at {path}, it was built from other patterns")
+        return None
+
+    logger.info(f"Loaded pattern catalog with {len(catalog.patterns)} patterns from {path}")
+    return catalog
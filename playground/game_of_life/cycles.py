@@ -0,0 +1,104 @@
+"""
+Cycle detection for Game of Life simulations.
+
+Every generation is fingerprinted with a Zobrist-style hash: each cell has
+a fixed pseudo-random 64-bit key and the fingerprint of a generation is the
+XOR of the keys of its alive cells. Because XOR is its own inverse, the
+fingerprint is updated from the births and deaths of a step alone, without
+touching the rest of the population.
+"""
+
+import logging
+from collections import deque
+
+from .generation import Generation
+
+logger = logging.getLogger('playground.game_of_life.cycles')
+
+MASK_32 = (1 << 32) - 1
+MASK_64 = (1 << 64) - 1
+
+
+def cell_key(x_pos: int, y_pos: int) -> int:
+    """
+    Return the 64-bit Zobrist key of a cell.
+
+    The coordinates are packed into one 64-bit integer and scrambled with the
+    SplitMix64 finalizer, so keys are well distributed and stable across
+    processes (unlike the built-in hash, which may be randomized).
+    """
+    z = ((((x_pos & MASK_32) << 32) | (y_pos & MASK_32)) + 0x9E3779B97F4A7C15) & MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return z ^ (z >> 31)
+
+
+def fingerprint(cells) -> int:
+    """Return the Zobrist fingerprint of a collection of (x, y) cells."""
+    value = 0
+    for x_pos, y_pos in cells:
+        value ^= cell_key(x_pos, y_pos)
+    return value
+
+
+class CycleDetector:
+    """
+    Detects the first repeated generation of a simulation.
+
+    Fingerprints are kept in a dict of hash -> generation, so a repeat of any
+    period is found in constant time. Matches are confirmed with an exact
+    comparison of the cell sets, which rules out hash collisions; the cells
+    are kept packed for that, which keeps long histories small.
+
+    By default every generation is remembered. Streaming callers can pass
+    max_period to only remember the most recent generations, which bounds
+    memory at the cost of missing cycles longer than max_period.
+    """
+
+    def __init__(self, initial_alive_cells=(), max_period: int | None = None):
+        self.hash = fingerprint({(cell[0], cell[1]) for cell in initial_alive_cells})
+        self.max_period = max_period
+        self.period: int | None = None
+        self.cycle_start: int | None = None
+        self._seen: dict[int, list[tuple[int, Generation]]] = {}
+        self._history: deque[int] = deque()
+
+    def observe(self, generation: int, births, deaths, cells) -> bool:
+        """
+        Record a new generation and check whether it repeats an earlier one.
+
+        Args:
+            generation: Index of the generation being observed
+            births: Cells that became alive in this generation
+            deaths: Cells that died in this generation
+            cells: Set of all alive cells in this generation
+
+        Returns:
+            True if the generation repeats an earlier one, in which case
+            period and cycle_start are set
+        """
+        for x_pos, y_pos in births:
+            self.hash ^= cell_key(x_pos, y_pos)
+        for x_pos, y_pos in deaths:
+            self.hash ^= cell_key(x_pos, y_pos)
+
+        candidates = self._seen.setdefault(self.hash, [])
+        for earlier_generation, earlier_cells in candidates:
+            if len(earlier_cells) == len(cells) and all(cell in cells for cell in earlier_cells):
+                self.cycle_start = earlier_generation
+                self.period = generation - earlier_generation
+                logger.debug(f"Generation {generation} repeats generation {earlier_generation} (period {self.period})")
+                return True
+
+        candidates.append((generation, Generation.from_cells(cells)))
+
+        # Forget the oldest generation once the history window is full
+        if self.max_period is not None:
+            self._history.append(self.hash)
+            if len(self._history) > self.max_period:
+                oldest = self._history.popleft()
+                self._seen[oldest].pop(0)
+                if not self._seen[oldest]:
+                    del self._seen[oldest]
+
+        return False
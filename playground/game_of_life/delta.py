@@ -0,0 +1,78 @@
+"""
+Delta encoding for Game of Life generations.
+
+Most of a pattern stays put from one generation to the next, so instead of
+sending every alive cell of every generation, the delta format sends a full
+keyframe every K generations and only the births and deaths in between.
+Keyframes let a client start decoding (or jump back to a cycle start) from
+any multiple of K.
+"""
+
+import logging
+
+logger = logging.getLogger('playground.game_of_life.delta')
+
+DEFAULT_KEYFRAME_INTERVAL = 50
+
+
+def encode_deltas(steps, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+    """
+    Delta-encode a sequence of generations.
+
+    Args:
+        steps: Iterable of (cells, births, deaths) tuples, as yielded by iter_game_of_life_steps
+        keyframe_interval: Number of generations between two keyframes
+
+    Yields:
+        Dicts with 'alive_cells' for keyframes, or 'births' and 'deaths' for the
+        generations in between
+    """
+    if keyframe_interval < 1:
+        raise ValueError("Keyframe interval must be at least 1")
+
+    for generation, (cells, births, deaths) in enumerate(steps):
+        if generation % keyframe_interval == 0:
+            yield {'alive_cells': list(cells)}
+        else:
+            yield {'births': list(births), 'deaths': list(deaths)}
+
+
+def decode_deltas(frames):
+    """
+    Rebuild full generations from delta-encoded frames.
+
+    Args:
+        frames: Iterable of dicts produced by encode_deltas
+
+    Yields:
+        Each generation as a set of (x, y) coordinates of alive cells
+    """
+    cells: set[tuple[int, int]] = set()
+    for frame in frames:
+        if 'alive_cells' in frame:
+            cells = {(cell[0], cell[1]) for cell in frame['alive_cells']}
+        else:
+            cells = cells - {(cell[0], cell[1]) for cell in frame['deaths']}
+            cells |= {(cell[0], cell[1]) for cell in frame['births']}
+        yield cells
+
+
+def steps_from_generations(initial_alive_cells, generations):
+    """
+    Recover births and deaths from a list of full generations.
+
+    Used when generations come from storage rather than from a running
+    engine, so they can still be fed to encode_deltas.
+
+    Args:
+        initial_alive_cells: Cells the first generation evolved from
+        generations: Iterable of generations, each a collection of (x, y) coordinates
+
+    Yields:
+        Tuples of (cells, births, deaths), like iter_game_of_life_steps
+    """
+    previous = {(cell[0], cell[1]) for cell in initial_alive_cells}
+    for generation in generations:
+        cells = set(generation)
+        yield cells, cells - previous, previous - cells
+        previous = cells
@@ -6,79 +6,92 @@ including cell checking and generation streaming functionality.
 """
 
 import logging
+import os
+from typing import TYPE_CHECKING
+
+from .bitset import BitsetEngine
+from .cycles import CycleDetector
+from .dense import NUMPY_AVAILABLE, DenseEngine
+from .generation import Generation
+from .incremental import NEIGHBOUR_OFFSETS, IncrementalEngine
+from .rules import CONWAY, Rule
+from .tiled import TILE_SIZE, TiledEngine
+
+if TYPE_CHECKING:
+    from .keyframes import KeyframeIndex
 
 logger = logging.getLogger('playground.game_of_life.engine')
 
-def check_cell(x_pos: int, y_pos: int, cell_state: bool, grid: set[tuple[int, int]]) -> bool:    
+# Thresholds used by select_engine to decide between the incremental and dense engines.
+# The dense engine pays for every cell of the bounding box, so it only wins when
+# a reasonable fraction of that box is alive and the box itself is not huge.
+# Without NumPy, the bitset engine takes its place for the same patterns.
+DENSE_MIN_POPULATION = 16
+DENSE_MIN_DENSITY = 0.05
+DENSE_MAX_AREA = 1_000_000
+
+# The tiled engine splits large populations across processes. It needs enough
+# cells to pay for sending tiles around, and only pays for occupied tiles, so
+# those must be about as full as the dense engine's bounding box.
+TILED_MIN_POPULATION = 20_000
+
+def check_cell(x_pos: int, y_pos: int, cell_state: bool, grid: set[tuple[int, int]], rule: Rule = CONWAY) -> bool:
     """
     Check if a cell should be alive or dead in the next generation.
-    
+
     Args:
         x_pos: X coordinate of the cell
-        y_pos: Y coordinate of the cell  
+        y_pos: Y coordinate of the cell
         cell_state: Current state of the cell (True if alive, False if dead)
         grid: Set of all currently alive cells as (x, y) tuples
-        
+        rule: Rule deciding births and survivals (default: Conway's B3/S23)
+
     Returns:
         True if the cell should be alive in the next generation, False otherwise
     """
     # Count neighbors
     total = 0
-    for i in range(-1, 2):
-        for j in range(-1, 2):
-            if i == 0 and j == 0:
-                continue  # Skip the cell itself
-            neighbor_pos = (x_pos + i, y_pos + j)
-            if neighbor_pos in grid:
-                total += 1
-
-    if not cell_state:
-        # Dead cell with exactly 3 neighbors becomes alive
-        if total == 3:
-            return True
-        # Otherwise remains dead
-        return False
-    
-    else:  # Cell is alive
-        # Live cell with 2 or 3 neighbors survives
-        if total == 2 or total == 3:
-            return True
-        # Otherwise dies
-        return False
-
-
-def play_game_of_life(initial_alive_cells: list[tuple[int, int]], max_generations: int = 1000) -> list[list[tuple[int, int]]]:
+    for i, j in NEIGHBOUR_OFFSETS:
+        if (x_pos + i, y_pos + j) in grid:
+            total += 1
+
+    # The rule's table holds the dead cell outcomes first, then the live cell ones
+    return rule.next_state[9 + total if cell_state else total]
+
+
+class SparseEngine:
     """
-    Core Game of Life logic that generates all generations from an initial state.
-    
-    Args:
-        initial_alive_cells: List of (x, y) coordinates representing initially alive cells
-        max_generations: Maximum number of generations to simulate (default: 1000)
-        
-    Returns:
-        List of generations, where each generation is a list of (x, y) coordinates of alive cells
+    Set-based engine that only visits alive cells and their neighbours.
+
+    Work per generation is proportional to the population, regardless of how
+    far apart the cells are, which makes it the right choice for small or
+    widely scattered patterns.
     """
-    logger.debug(f"Starting Game of Life simulation with {len(initial_alive_cells)} initial cells, max {max_generations} generations")
-    
-    # The grid is a set of cells, with the key being a tuple of the x and y position of the cell
-    # The middle of the grid is at (0, 0)
-    grid: set[tuple[int, int]] = set()
-
-    # Add the initial grid to the grid set
-    for cell in initial_alive_cells:
-        grid.add((cell[0], cell[1]))
-
-    # Generate all generations and collect them
-    generations = []
-    
-    # Start the game loop (limit to maximum generations)
-    # This is to avoid infinite loops
-    for generation in range(max_generations):
-        # If the grid is empty, break the loop
-        if len(grid) == 0:
-            logger.debug(f"Game of Life ended at generation {generation}: no alive cells")
-            generations.append([])
-            break
+
+    name = 'sparse'
+
+    def __init__(self, initial_alive_cells: list[tuple[int, int]], rule: Rule = CONWAY):
+        # The grid is a set of cells, with the key being a tuple of the x and y position of the cell
+        # The middle of the grid is at (0, 0)
+        self.grid: set[tuple[int, int]] = {(cell[0], cell[1]) for cell in initial_alive_cells}
+        self.rule = rule
+
+    @property
+    def population(self) -> int:
+        return len(self.grid)
+
+    def cells(self) -> set[tuple[int, int]]:
+        """Return the set of currently alive cells."""
+        return self.grid
+
+    def step(self) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+        """
+        Advance the grid by one generation.
+
+        Returns:
+            Tuple of (births, deaths) as sets of (x, y) coordinates
+        """
+        grid = self.grid
 
         # Create a set to store the cells that have already been checked
         # So we don't check the same cell multiple times
@@ -105,6 +118,7 @@ def play_game_of_life(initial_alive_cells: list[tuple[int, int]], max_generation
                             y_pos = current_cell_pos[1],
                             cell_state = current_cell_pos in grid, # False if the cell is not in the grid
                             grid = grid,
+                            rule = self.rule,
                         )
 
                         # If it is alive, add the current cell to the auxiliary grid,
@@ -115,20 +129,189 @@ def play_game_of_life(initial_alive_cells: list[tuple[int, int]], max_generation
                         checked_cells.add(current_cell_pos)
 
         # Update the grid with the new state
-        grid = aux_grid
-
-        # Add the current generation to our list
-        generations.append(list(grid))
-
-        # Check for oscillators or still lifes by comparing with previous generations
-        if generation > 10:  # Only check after a few generations
-            # Check if current state matches any of the last 10 states (for oscillators)
-            current_state = set(grid)
-            for i in range(1, min(11, generation + 1)):
-                if i < len(generations) and set(generations[generation - i]) == current_state:
-                    # Found a cycle, stop generating
-                    logger.debug(f"Game of Life ended at generation {generation}: cycle detected (period {i})")
-                    break
-    
+        self.grid = aux_grid
+        return aux_grid - grid, grid - aux_grid
+
+
+ENGINES = {
+    SparseEngine.name: SparseEngine,
+    IncrementalEngine.name: IncrementalEngine,
+    DenseEngine.name: DenseEngine,
+    TiledEngine.name: TiledEngine,
+    BitsetEngine.name: BitsetEngine,
+}
+
+
+def select_engine(initial_alive_cells: list[tuple[int, int]]) -> str:
+    """
+    Pick the engine best suited to an initial pattern.
+
+    The dense engine is chosen when the pattern fills enough of a reasonably
+    sized bounding box, or the bitset engine when NumPy is not installed.
+    Large populations go to the tiled engine instead when there are several
+    cores to spread them over, or when their bounding box is too large for the
+    dense engine but their tiles are full enough. Everything else runs on the
+    incremental engine.
+
+    Args:
+        initial_alive_cells: List of (x, y) coordinates representing initially alive cells
+
+    Returns:
+        Name of the selected engine (a key of ENGINES)
+    """
+    population = len(initial_alive_cells)
+    if population < DENSE_MIN_POPULATION:
+        return IncrementalEngine.name
+
+    xs = [cell[0] for cell in initial_alive_cells]
+    ys = [cell[1] for cell in initial_alive_cells]
+    area = (max(xs) - min(xs) + 1) * (max(ys) - min(ys) + 1)
+
+    if not NUMPY_AVAILABLE:
+        if area <= DENSE_MAX_AREA and population / area >= DENSE_MIN_DENSITY:
+            return BitsetEngine.name
+        return IncrementalEngine.name
+
+    if population >= TILED_MIN_POPULATION and ((os.cpu_count() or 1) > 1 or area > DENSE_MAX_AREA):
+        tiles = {(x_pos // TILE_SIZE, y_pos // TILE_SIZE) for x_pos, y_pos in zip(xs, ys)}
+        if population / (len(tiles) * TILE_SIZE * TILE_SIZE) >= DENSE_MIN_DENSITY:
+            return TiledEngine.name
+
+    if area <= DENSE_MAX_AREA and population / area >= DENSE_MIN_DENSITY:
+        return DenseEngine.name
+    return IncrementalEngine.name
+
+
+def create_engine(initial_alive_cells: list[tuple[int, int]], engine: str = 'auto', rule: Rule = CONWAY):
+    """
+    Instantiate a Game of Life engine for the given initial cells.
+
+    Args:
+        initial_alive_cells: List of (x, y) coordinates representing initially alive cells
+        engine: Engine name from ENGINES, or 'auto' to let select_engine decide
+        rule: Rule the engine applies (default: Conway's B3/S23)
+
+    Returns:
+        Engine instance exposing step(), cells() and population
+
+    Raises:
+        ValueError: If the engine name is unknown or its dependencies are missing
+    """
+    if engine == 'auto':
+        engine = select_engine(initial_alive_cells)
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown Game of Life engine: {engine}")
+    if engine in (DenseEngine.name, TiledEngine.name) and not NUMPY_AVAILABLE:
+        raise ValueError(f"The {engine} Game of Life engine requires NumPy")
+
+    return ENGINES[engine](initial_alive_cells, rule=rule)
+
+
+def iter_game_of_life_steps(initial_alive_cells: list[tuple[int, int]], max_generations: int = 1000, engine: str = 'auto', detector: CycleDetector | None = None, keyframes: 'KeyframeIndex | None' = None, rule: Rule = CONWAY):
+    """
+    Lazily yield each generation together with the changes that produced it.
+
+    Each generation is computed only when the consumer asks for it, so callers
+    can stream results as soon as they exist without holding every generation
+    in memory.
+
+    The simulation stops early when the pattern dies out, or as soon as a
+    generation repeats an earlier one (still lifes and oscillators of any
+    period). In the latter case the repeated generation is not yielded, so
+    the generations from detector.cycle_start onwards form one full period
+    that can be looped.
+
+    Args:
+        initial_alive_cells: List of (x, y) coordinates representing initially alive cells
+        max_generations: Maximum number of generations to simulate (default: 1000)
+        engine: Engine used to compute generations, or 'auto' to pick one from the pattern
+        detector: Optional CycleDetector, pass one in to read period and cycle_start afterwards
+        keyframes: Optional KeyframeIndex that records the run for later seeks
+        rule: Rule deciding births and survivals (default: Conway's B3/S23)
+
+    Yields:
+        Tuples of (cells, births, deaths). cells is the engine's own set of alive
+        cells and is only valid until the next generation is requested.
+    """
+    board = create_engine(initial_alive_cells, engine, rule)
+    if detector is None:
+        detector = CycleDetector(initial_alive_cells)
+    logger.debug(f"Starting Game of Life simulation with {len(initial_alive_cells)} initial cells, max {max_generations} generations, {board.name} engine, rule {rule.rulestring}")
+
+    # Start the game loop (limit to maximum generations)
+    # This is to avoid infinite loops
+    for generation in range(max_generations):
+        # If the grid is empty, stop
+        if board.population == 0:
+            logger.debug(f"Game of Life ended at generation {generation}: no alive cells")
+            if keyframes is not None:
+                keyframes.record(generation, ())
+            yield set(), set(), set()
+            return
+
+        births, deaths = board.step()
+
+        # Stop at the first generation that repeats an earlier one (still lifes and oscillators)
+        if detector.observe(generation, births, deaths, board.cells()):
+            logger.debug(f"Game of Life ended at generation {generation}: cycle detected (period {detector.period})")
+            if keyframes is not None:
+                keyframes.record_cycle(detector.cycle_start, detector.period)
+            return
+
+        if keyframes is not None:
+            keyframes.record(generation, board.cells())
+        yield board.cells(), births, deaths
+
+        # An empty generation is final, there is nothing left to evolve
+        if board.population == 0:
+            logger.debug(f"Game of Life ended at generation {generation}: no alive cells")
+            return
+
+
+def iter_game_of_life(initial_alive_cells: list[tuple[int, int]], max_generations: int = 1000, engine: str = 'auto', detector: CycleDetector | None = None, keyframes: 'KeyframeIndex | None' = None, rule: Rule = CONWAY):
+    """
+    Lazily yield the generations of a pattern, one at a time.
+
+    See iter_game_of_life_steps for the stopping rules.
+
+    Args:
+        initial_alive_cells: List of (x, y) coordinates representing initially alive cells
+        max_generations: Maximum number of generations to simulate (default: 1000)
+        engine: Engine used to compute generations, or 'auto' to pick one from the pattern
+        detector: Optional CycleDetector, pass one in to read period and cycle_start afterwards
+        keyframes: Optional KeyframeIndex that records the run for later seeks
+        rule: Rule deciding births and survivals (default: Conway's B3/S23)
+
+    Yields:
+        Each generation as a list of (x, y) coordinates of alive cells
+    """
+    for cells, _, _ in iter_game_of_life_steps(initial_alive_cells, max_generations, engine, detector, keyframes, rule):
+        yield list(cells)
+
+
+def play_game_of_life(initial_alive_cells: list[tuple[int, int]], max_generations: int = 1000, engine: str = 'auto', detector: CycleDetector | None = None, keyframes: 'KeyframeIndex | None' = None, rule: Rule = CONWAY) -> list[list[tuple[int, int]]]:
+    """
+    Core Game of Life logic that generates all generations from an initial state.
+
+    See iter_game_of_life_steps for the stopping rules; this function simply
+    collects every generation into a list, packed to keep long runs small.
+
+    Args:
+        initial_alive_cells: List of (x, y) coordinates representing initially alive cells
+        max_generations: Maximum number of generations to simulate (default: 1000)
+        engine: Engine used to compute generations, or 'auto' to pick one from the pattern
+        detector: Optional CycleDetector, pass one in to read period and cycle_start afterwards
+        keyframes: Optional KeyframeIndex that records the run for later seeks
+        rule: Rule deciding births and survivals (default: Conway's B3/S23)
+
+    Returns:
+        List of generations, where each generation is a Generation: a compact, read-only
+        sequence of the (x, y) coordinates of alive cells
+    """
+    generations = [
+        Generation.from_cells(cells)
+        for cells, _, _ in iter_game_of_life_steps(initial_alive_cells, max_generations, engine, detector, keyframes, rule)
+    ]
     logger.debug(f"Game of Life simulation completed with {len(generations)} total generations")
     return generations
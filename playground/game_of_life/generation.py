@@ -0,0 +1,72 @@
+"""
+Compact storage for simulated generations.
+
+A generation kept as a list of (x, y) tuples costs about 120 bytes per
+alive cell (the list slot, the tuple and its two ints). Runs that keep
+every generation, for the response or the simulation cache, store them as
+two packed arrays of 64-bit coordinates instead, 16 bytes per cell, and
+only build tuples when a generation is serialized.
+"""
+
+from array import array
+from collections.abc import Sequence
+
+# Type code of the coordinate arrays: signed 64-bit, so any coordinate the API accepts fits
+COORDINATE_TYPECODE = 'q'
+
+
+class Generation(Sequence):
+    """
+    Read-only sequence of the (x, y) coordinates of one generation's alive cells.
+
+    Iterating yields tuples, so a Generation can be passed wherever a list
+    of cells is expected; call to_list() when the tuples themselves are needed.
+    """
+
+    __slots__ = ('xs', 'ys')
+
+    def __init__(self, xs: array, ys: array):
+        self.xs = xs
+        self.ys = ys
+
+    @classmethod
+    def from_cells(cls, cells) -> 'Generation':
+        """Pack a collection of (x, y) coordinates."""
+        return cls(
+            array(COORDINATE_TYPECODE, [cell[0] for cell in cells]),
+            array(COORDINATE_TYPECODE, [cell[1] for cell in cells]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, index: int) -> tuple[int, int]:
+        return self.xs[index], self.ys[index]
+
+    def __iter__(self):
+        return zip(self.xs, self.ys)
+
+    def __repr__(self) -> str:
+        return f"Generation({len(self)} cells)"
+
+    def __reduce__(self):
+        # Arrays pickle as raw bytes, which keeps results cheap to send between processes
+        return self.__class__, (self.xs, self.ys)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the packed coordinates in bytes."""
+        return (len(self.xs) + len(self.ys)) * self.xs.itemsize
+
+    def to_list(self) -> list[tuple[int, int]]:
+        """Unpack into a list of (x, y) tuples."""
+        return list(zip(self.xs, self.ys))
+
+    def translated(self, dx: int, dy: int) -> 'Generation':
+        """Return a copy moved by (dx, dy)."""
+        if not dx and not dy:
+            return self
+        return Generation(
+            array(COORDINATE_TYPECODE, [x_pos + dx for x_pos in self.xs]),
+            array(COORDINATE_TYPECODE, [y_pos + dy for y_pos in self.ys]),
+        )
@@ -0,0 +1,286 @@
+"""
+Hashlife engine for Conway's Game of Life and other Life-like rules.
+
+The universe is stored as a quadtree of canonicalized nodes: identical
+sub-patterns anywhere in space or time share a single node, and the result
+of advancing a node is memoized. Regular patterns (oscillators, guns,
+spaceship streams) therefore advance by millions of generations with only
+a few thousand node evaluations.
+
+Quadrants follow the usual convention: ``a`` is the top-left (north-west),
+``b`` the top-right, ``c`` the bottom-left and ``d`` the bottom-right
+quadrant, with x growing to the right and y growing downwards.
+"""
+
+import logging
+import time
+
+from .rules import CONWAY, Rule
+
+logger = logging.getLogger('playground.game_of_life.hashlife')
+
+# Upper bound on memoized nodes and results kept by a single universe.
+# When exceeded the tables are cleared, trading some recomputation for bounded memory.
+MAX_MEMO_ENTRIES = 1 << 20
+
+
+class Node:
+    """Immutable quadtree node covering a 2**k x 2**k square."""
+
+    __slots__ = ('k', 'a', 'b', 'c', 'd', 'n')
+
+    def __init__(self, k: int, a, b, c, d, n: int):
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n  # Population
+
+    def __repr__(self) -> str:
+        return f"Node(k={self.k}, n={self.n})"
+
+
+# Level 0 leaves
+ON = Node(0, None, None, None, None, 1)
+OFF = Node(0, None, None, None, None, 0)
+
+
+class HashlifeUniverse:
+    """
+    Hashlife evaluator holding its own canonical node and result tables.
+
+    Each universe owns its memo tables, so concurrent requests never share
+    mutable state and the memory used by one simulation is released with it.
+    """
+
+    def __init__(self, max_memo_entries: int = MAX_MEMO_ENTRIES, rule: Rule = CONWAY, deadline: float | None = None):
+        self.max_memo_entries = max_memo_entries
+        self.rule = rule
+        # time.monotonic() past which successor() gives up with TimeoutError
+        self.deadline = deadline
+        self._nodes: dict[tuple, Node] = {}
+        self._results: dict[tuple[Node, int], Node] = {}
+        self._zeros: dict[int, Node] = {0: OFF}
+
+    @property
+    def memo_size(self) -> int:
+        return len(self._nodes) + len(self._results)
+
+    def join(self, a: Node, b: Node, c: Node, d: Node) -> Node:
+        """Return the canonical node made of the four given quadrants."""
+        key = (a, b, c, d)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self._nodes[key] = node
+        return node
+
+    def zero(self, k: int) -> Node:
+        """Return the empty node of level k."""
+        node = self._zeros.get(k)
+        if node is None:
+            half = self.zero(k - 1)
+            node = self.join(half, half, half, half)
+            self._zeros[k] = node
+        return node
+
+    def centre(self, m: Node) -> Node:
+        """Return a node one level up with m in its centre."""
+        z = self.zero(m.k - 1)
+        return self.join(
+            self.join(z, z, z, m.a),
+            self.join(z, z, m.b, z),
+            self.join(z, m.c, z, z),
+            self.join(m.d, z, z, z),
+        )
+
+    def inner(self, m: Node) -> Node:
+        """Return the central node one level down from m."""
+        return self.join(m.a.d, m.b.c, m.c.b, m.d.a)
+
+    def _life(self, a, b, c, d, e, f, g, h, i) -> Node:
+        """Apply the rule to the centre cell e of a 3x3 block of leaves, given row by row."""
+        block = a.n << 8 | b.n << 7 | c.n << 6 | d.n << 5 | e.n << 4 | f.n << 3 | g.n << 2 | h.n << 1 | i.n
+        return ON if self.rule.neighbourhoods[block] else OFF
+
+    def _life_4x4(self, m: Node) -> Node:
+        """Advance the centre 2x2 cells of a level-2 node by one generation."""
+        ad = self._life(m.a.a, m.a.b, m.b.a, m.a.c, m.a.d, m.b.c, m.c.a, m.c.b, m.d.a)
+        bc = self._life(m.a.b, m.b.a, m.b.b, m.a.d, m.b.c, m.b.d, m.c.b, m.d.a, m.d.b)
+        cb = self._life(m.a.c, m.a.d, m.b.c, m.c.a, m.c.b, m.d.a, m.c.c, m.c.d, m.d.c)
+        da = self._life(m.a.d, m.b.c, m.b.d, m.c.b, m.d.a, m.d.b, m.c.d, m.d.c, m.d.d)
+        return self.join(ad, bc, cb, da)
+
+    def successor(self, m: Node, j: int) -> Node:
+        """
+        Return the centre of m (one level down) advanced by 2**j generations.
+
+        j is clamped to m.k - 2, the furthest a level-k node can be advanced
+        without information from outside of it.
+        """
+        if m.n == 0:
+            return m.a
+
+        j = min(j, m.k - 2)
+        key = (m, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if m.k == 2:
+            result = self._life_4x4(m)
+        else:
+            # Checked on memo misses only, which are what makes a jump slow
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                raise TimeoutError("Hashlife jump ran past its deadline")
+            join = self.join
+            # Nine overlapping sub-squares of level k-1, each advanced to level k-2
+            c1 = self.successor(join(m.a.a, m.a.b, m.a.c, m.a.d), j)
+            c2 = self.successor(join(m.a.b, m.b.a, m.a.d, m.b.c), j)
+            c3 = self.successor(join(m.b.a, m.b.b, m.b.c, m.b.d), j)
+            c4 = self.successor(join(m.a.c, m.a.d, m.c.a, m.c.b), j)
+            c5 = self.successor(join(m.a.d, m.b.c, m.c.b, m.d.a), j)
+            c6 = self.successor(join(m.b.c, m.b.d, m.d.a, m.d.b), j)
+            c7 = self.successor(join(m.c.a, m.c.b, m.c.c, m.c.d), j)
+            c8 = self.successor(join(m.c.b, m.d.a, m.c.d, m.d.c), j)
+            c9 = self.successor(join(m.d.a, m.d.b, m.d.c, m.d.d), j)
+
+            if j < m.k - 2:
+                # The first pass already covered 2**j generations, only re-assemble the centre
+                result = join(
+                    join(c1.d, c2.c, c4.b, c5.a),
+                    join(c2.d, c3.c, c5.b, c6.a),
+                    join(c4.d, c5.c, c7.b, c8.a),
+                    join(c5.d, c6.c, c8.b, c9.a),
+                )
+            else:
+                # Full speed: advance the four intermediate squares a second time
+                result = join(
+                    self.successor(join(c1, c2, c4, c5), j),
+                    self.successor(join(c2, c3, c5, c6), j),
+                    self.successor(join(c4, c5, c7, c8), j),
+                    self.successor(join(c5, c6, c8, c9), j),
+                )
+
+        self._results[key] = result
+        return result
+
+    def from_cells(self, cells: list[tuple[int, int]]) -> tuple[Node, int, int]:
+        """
+        Build a quadtree from alive cell coordinates.
+
+        Returns:
+            Tuple of (root node, x of its top-left corner, y of its top-left corner)
+        """
+        cells = {(cell[0], cell[1]) for cell in cells}
+        if not cells:
+            return self.zero(3), 0, 0
+
+        origin_x = min(x for x, _ in cells)
+        origin_y = min(y for _, y in cells)
+
+        # Merge leaves pairwise, level by level, until a single root remains
+        level = {(x - origin_x, y - origin_y): ON for x, y in cells}
+        k = 0
+        while len(level) > 1 or k < 3:
+            z = self.zero(k)
+            parents: dict[tuple[int, int], list[Node]] = {}
+            for (x, y), node in level.items():
+                quadrants = parents.setdefault((x >> 1, y >> 1), [z, z, z, z])
+                quadrants[(x & 1) + 2 * (y & 1)] = node
+            level = {pos: self.join(*quadrants) for pos, quadrants in parents.items()}
+            k += 1
+
+        ((x, y), root), = level.items()
+        size = 1 << k
+        return root, origin_x + x * size, origin_y + y * size
+
+    def to_cells(self, node: Node, x: int = 0, y: int = 0) -> list[tuple[int, int]]:
+        """Return the alive cells of a node whose top-left corner is at (x, y)."""
+        cells = []
+        stack = [(node, x, y)]
+        while stack:
+            node, x, y = stack.pop()
+            if node.n == 0:
+                continue
+            if node.k == 0:
+                cells.append((x, y))
+                continue
+            half = 1 << (node.k - 1)
+            stack.append((node.a, x, y))
+            stack.append((node.b, x + half, y))
+            stack.append((node.c, x, y + half))
+            stack.append((node.d, x + half, y + half))
+        return cells
+
+    def _is_padded(self, m: Node) -> bool:
+        """Check whether all of m's population sits in its central quarter-width square."""
+        return m.k >= 3 and self.inner(self.inner(m)).n == m.n
+
+    def advance(self, node: Node, x: int, y: int, generations: int) -> tuple[Node, int, int]:
+        """
+        Advance a positioned node by an exact number of generations.
+
+        The number of generations is decomposed into powers of two, and the
+        node is padded with empty space before each jump so nothing can
+        escape its borders.
+
+        Returns:
+            Tuple of (node, x, y) for the advanced universe
+        """
+        j = 0
+        while generations:
+            if generations & 1:
+                # Pattern within the central quarter and k >= j + 3 keeps 2**j cells of slack on every side
+                while node.k < j + 3 or not self._is_padded(node):
+                    offset = 1 << (node.k - 1)
+                    node = self.centre(node)
+                    x -= offset
+                    y -= offset
+
+                offset = 1 << (node.k - 2)
+                node = self.successor(node, j)
+                x += offset
+                y += offset
+
+                if self.memo_size > self.max_memo_entries:
+                    logger.debug(f"Hashlife memo table exceeded {self.max_memo_entries} entries, clearing it")
+                    self._nodes.clear()
+                    self._results.clear()
+                    self._zeros = {0: OFF}
+
+            generations >>= 1
+            j += 1
+
+        return node, x, y
+
+
+def advance_game_of_life(initial_alive_cells: list[tuple[int, int]], generations: int, max_population: int | None = None, rule: Rule = CONWAY, budget: float | None = None) -> list[tuple[int, int]]:
+    """
+    Compute the state of a pattern after a given number of generations using Hashlife.
+
+    Args:
+        initial_alive_cells: List of (x, y) coordinates representing initially alive cells
+        generations: Number of generations to advance
+        max_population: Largest final population that may be expanded into a cell list
+        rule: Rule deciding births and survivals (default: Conway's B3/S23)
+        budget: Wall-clock budget in seconds, or None for no limit
+
+    Returns:
+        List of (x, y) coordinates of the alive cells after the given number of generations
+
+    Raises:
+        ValueError: If the final population exceeds max_population
+        TimeoutError: If the budget runs out first
+    """
+    universe = HashlifeUniverse(rule=rule, deadline=time.monotonic() + budget if budget is not None else None)
+    node, x, y = universe.from_cells(initial_alive_cells)
+    node, x, y = universe.advance(node, x, y, generations)
+    logger.debug(f"Hashlife advanced {len(initial_alive_cells)} cells by {generations} generations, {universe.memo_size} memo entries")
+
+    # The quadtree can describe populations far too large to list cell by cell
+    if max_population is not None and node.n > max_population:
+        raise ValueError(f"Final population of {node.n} cells exceeds the limit of {max_population}")
+
+    return universe.to_cells(node, x, y)
@@ -0,0 +1,315 @@
+"""
+Keyframe index for random access into a Game of Life timeline.
+
+A run records the full state of every K-th generation. Seeking to
+generation N then restores the nearest keyframe at or before N and steps
+forward at most K - 1 generations, so a seek costs O(K) instead of O(N).
+Generations past the recorded range are computed once, recording new
+keyframes on the way, and every later seek into that range is cheap.
+
+Keyframes sit at the same generations as the keyframes of the delta
+format (multiples of K), and indexes are shared between translated copies
+of a pattern under the same rule, like simulation results are.
+
+The simulating itself is done by run_timeline and restore, which only take
+cells and plain values, so that a SimulationPool can run them in another
+process while the index stays in the web worker (see SimulationPool.seek).
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from .cache import BYTES_PER_CELL, BYTES_PER_GENERATION, normalize_cells
+from .cycles import CycleDetector
+from .delta import DEFAULT_KEYFRAME_INTERVAL
+from .engine import create_engine
+from .rules import CONWAY, Rule
+
+logger = logging.getLogger('playground.game_of_life.keyframes')
+
+# Longest period looked for while extending an index, like streamed simulations do
+EXTEND_MAX_PERIOD = 100
+
+
+class TimelineRun(NamedTuple):
+    """Generations of a timeline worth recording, computed by run_timeline."""
+
+    # (generation, cells) of every keyframe reached, and of the generation the pattern died out at
+    records: list[tuple[int, frozenset]]
+    cycle_start: int | None
+    period: int | None
+    # Whether the run reached its target, found a cycle or died out before the budget ran out
+    complete: bool
+
+
+def run_timeline(cells, current: int, target: int, interval: int, rule: Rule = CONWAY, engine: str = 'auto', budget: float | None = None) -> TimelineRun:
+    """
+    Simulate a timeline from one generation to a later keyframe, see KeyframeIndex.merge.
+
+    Args:
+        cells: Alive cells of generation current
+        current: Generation of cells, -1 for the initial pattern
+        target: Generation of the keyframe to reach
+        interval: Keyframe interval of the index
+        rule: Rule deciding births and survivals
+        engine: Engine used to compute generations
+        budget: Wall-clock budget in seconds, or None for no limit
+
+    Returns:
+        TimelineRun with what was found before the budget ran out
+    """
+    deadline = time.monotonic() + budget if budget is not None else None
+    board = create_engine(cells, engine, rule)
+    detector = CycleDetector(board.cells(), max_period=EXTEND_MAX_PERIOD)
+    start = current + 1
+    records = []
+    logger.debug(f"Extending keyframe index from generation {current} to {target}")
+
+    while current < target:
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.info(f"Keyframe budget of {budget}s ran out at generation {current} of {target}")
+            return TimelineRun(records, None, None, False)
+        births, deaths = board.step()
+        current += 1
+        if detector.observe(current - start, births, deaths, board.cells()):
+            return TimelineRun(records, start + detector.cycle_start, detector.period, True)
+        if current % interval == 0 or board.population == 0:
+            records.append((current, frozenset(board.cells())))
+        if board.population == 0:
+            break
+    return TimelineRun(records, None, None, True)
+
+
+def restore(cells, steps: int, rule: Rule = CONWAY, engine: str = 'auto', budget: float | None = None) -> set[tuple[int, int]] | None:
+    """
+    Step a keyframe forward to the generation being sought.
+
+    Returns:
+        Set of (x, y) coordinates of the alive cells, or None if the budget ran out first
+    """
+    deadline = time.monotonic() + budget if budget is not None else None
+    board = create_engine(cells, engine, rule)
+    for _ in range(steps):
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        board.step()
+    return set(board.cells())
+
+
+class KeyframeIndex:
+    """
+    Keyframes of one pattern's timeline, extended on demand.
+
+    Generation numbers follow the rest of the API: generation 0 is the
+    pattern after one step.
+    """
+
+    def __init__(self, initial_alive_cells, interval: int = DEFAULT_KEYFRAME_INTERVAL, rule: Rule = CONWAY, engine: str = 'auto'):
+        if interval < 1:
+            raise ValueError("Keyframe interval must be at least 1")
+
+        self.interval = interval
+        self.rule = rule
+        self.engine = engine
+        self.initial = frozenset((cell[0], cell[1]) for cell in initial_alive_cells)
+        # keyframes[i] holds generation i * interval
+        self.keyframes: list[frozenset] = []
+        self.period: int | None = None
+        self.cycle_start: int | None = None
+        # First generation with no alive cells, every later one is empty as well
+        self.extinct_at: int | None = None
+        self.size_bytes = BYTES_PER_GENERATION + BYTES_PER_CELL * len(self.initial)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole timeline is known, because the pattern died out or cycles."""
+        return self.period is not None or self.extinct_at is not None
+
+    def record(self, generation: int, cells) -> None:
+        """
+        Record a generation produced by a run, keeping it if it is the next keyframe.
+
+        Runs feed every generation in order; anything already indexed is ignored.
+        """
+        if not cells and self.extinct_at is None:
+            self.extinct_at = generation
+
+        if generation == len(self.keyframes) * self.interval:
+            keyframe = frozenset(cells)
+            self.keyframes.append(keyframe)
+            self.size_bytes += BYTES_PER_GENERATION + BYTES_PER_CELL * len(keyframe)
+
+    def record_cycle(self, cycle_start: int, period: int) -> None:
+        """Record that generations repeat with the given period from cycle_start onwards."""
+        if self.period is None:
+            self.cycle_start = cycle_start
+            self.period = period
+
+    def record_run(self, generations, period: int | None = None, cycle_start: int | None = None) -> None:
+        """Record the generations of a finished run, and its cycle if one was found."""
+        for generation in range(len(self.keyframes) * self.interval, len(generations), self.interval):
+            self.record(generation, generations[generation])
+        if generations and not generations[-1]:
+            self.record(len(generations) - 1, generations[-1])
+        if period is not None:
+            self.record_cycle(cycle_start, period)
+
+    def merge(self, run: TimelineRun) -> None:
+        """Record what a run_timeline call found, even when its budget ran out halfway."""
+        for generation, cells in run.records:
+            self.record(generation, cells)
+        if run.period is not None:
+            self.record_cycle(run.cycle_start, run.period)
+
+    def seek(self, generation: int) -> set[tuple[int, int]]:
+        """
+        Compute one generation of the timeline, in this process and without a budget.
+
+        Args:
+            generation: Index of the generation to return
+
+        Returns:
+            Set of (x, y) coordinates of the alive cells of that generation
+
+        Raises:
+            ValueError: If generation is negative
+        """
+        extension = self.extension(generation)
+        if extension is not None:
+            self.merge(run_timeline(*extension, self.interval, self.rule, self.engine))
+
+        location = self.locate(generation)
+        if location is None:
+            return set()
+        return restore(*location, self.rule, self.engine)
+
+    def extension(self, generation: int) -> tuple[frozenset, int, int] | None:
+        """
+        Return what run_timeline needs to index a generation, or None if it is indexed already.
+
+        Returns:
+            Tuple of (cells, their generation, target keyframe generation)
+
+        Raises:
+            ValueError: If generation is negative
+        """
+        if generation < 0:
+            raise ValueError("Generation must not be negative")
+
+        generation = self._fold(generation)
+        if self.extinct_at is not None and generation >= self.extinct_at:
+            return None
+        if generation // self.interval < len(self.keyframes):
+            return None
+
+        target = generation - generation % self.interval
+        if self.keyframes:
+            return self.keyframes[-1], (len(self.keyframes) - 1) * self.interval, target
+        return self.initial, -1, target
+
+    def locate(self, generation: int) -> tuple[frozenset, int] | None:
+        """
+        Return the keyframe to restore a generation from, once it is indexed.
+
+        Returns:
+            Tuple of (keyframe cells, generations to step them), or None if the generation is empty
+        """
+        # Extending may have found the cycle or the extinction that bounds the timeline
+        generation = self._fold(generation)
+        if self.extinct_at is not None and generation >= self.extinct_at:
+            return None
+        keyframe, offset = divmod(generation, self.interval)
+        return self.keyframes[keyframe], offset
+
+    def steps_to(self, generation: int) -> int:
+        """Return how many generations seek(generation) would have to simulate."""
+        generation = self._fold(generation)
+        if self.extinct_at is not None and generation >= self.extinct_at:
+            return 0
+        if generation // self.interval < len(self.keyframes):
+            return generation % self.interval
+        if not self.keyframes:
+            return generation + 1
+        return generation - (len(self.keyframes) - 1) * self.interval
+
+    def _fold(self, generation: int) -> int:
+        """Map a generation past the first period of a cycle back into it."""
+        if self.period is not None and generation >= self.cycle_start + self.period:
+            return self.cycle_start + (generation - self.cycle_start) % self.period
+        return generation
+
+
+class KeyframeIndexCache:
+    """
+    LRU cache of keyframe indexes keyed by the translation-normalized pattern and the rule.
+
+    Indexes grow as they are extended, so their size is accounted again
+    every time one is handed out.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 64 * 1024 * 1024, interval: int = DEFAULT_KEYFRAME_INTERVAL, engine: str = 'auto'):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.engine = engine
+        self._entries: OrderedDict[tuple[frozenset, str], tuple[KeyframeIndex, int, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, cells, rule: Rule = CONWAY) -> tuple[KeyframeIndex, int, int]:
+        """
+        Return the index of a pattern under a rule, creating an empty one on a miss.
+
+        Returns:
+            Tuple of (index, x shift, y shift), where the shifts move generations of
+            the index to the position of the requested cells
+        """
+        normalized, offset_x, offset_y = normalize_cells(cells) if cells else (frozenset(), 0, 0)
+        key = (normalized, rule.rulestring)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = (KeyframeIndex(cells, self.interval, rule, self.engine), offset_x, offset_y)
+                self._entries[key] = entry
+            else:
+                self._entries.move_to_end(key)
+            self._evict(keep=key)
+
+        index, origin_x, origin_y = entry
+        return index, offset_x - origin_x, offset_y - origin_y
+
+    def seek(self, cells, generation: int, rule: Rule = CONWAY, pool=None, budget: float | None = None) -> set[tuple[int, int]] | None:
+        """
+        Return one generation of a pattern's timeline, positioned like the requested cells.
+
+        With a SimulationPool, the generations are computed in the pool within budget seconds
+        and None is returned if they take longer. Keyframes found meanwhile are kept.
+        """
+        index, shift_x, shift_y = self.get(cells, rule)
+        result = index.seek(generation) if pool is None else pool.seek(index, generation, budget)
+        with self._lock:
+            self._evict()
+        if result is None:
+            return None
+        if shift_x or shift_y:
+            result = {(x + shift_x, y + shift_y) for x, y in result}
+        return result
+
+    def clear(self) -> None:
+        """Remove every index."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self, keep=None) -> None:
+        size = sum(index.size_bytes for index, _, _ in self._entries.values())
+        while self._entries and (len(self._entries) > self.max_entries or size > self.max_bytes):
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            index, _, _ = self._entries.pop(key)
+            size -= index.size_bytes
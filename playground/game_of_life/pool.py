@@ -0,0 +1,280 @@
+"""
+Process pool for running Game of Life simulations off the web worker.
+
+Simulations are pure CPU work. Under gunicorn's gevent workers, running one
+inline blocks the event loop, and with it every other request served by the
+same worker. Here simulations run in a pool of separate processes instead,
+each with a wall-clock budget, while the calling greenlet waits cooperatively.
+
+The pool is started lazily in each web worker, with the 'spawn' start
+method so that children never inherit a monkey-patched gevent hub.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+
+from .cycles import CycleDetector
+from .engine import iter_game_of_life_steps
+from .generation import Generation
+from .hashlife import advance_game_of_life
+from .keyframes import KeyframeIndex, restore, run_timeline
+from .render import render_simulation
+from .rules import CONWAY, Rule
+from .search import summarize_patterns
+from .tiled import compute_tiles_inline
+from .viewport import Viewport
+
+logger = logging.getLogger('playground.game_of_life.pool')
+
+# How often a waiting request checks on its simulation; time.sleep yields to the hub under gevent
+POLL_INTERVAL = 0.01
+
+# Batch searches queue several chunks per process, of at most MAX_CHUNK_SIZE patterns, so that
+# a missed budget only leaves a few patterns out
+CHUNKS_PER_WORKER = 4
+MAX_CHUNK_SIZE = 8
+
+# Extra time given to a worker past its budget before the request stops waiting for it,
+# which also covers sending the generations back from the worker process
+BUDGET_GRACE = 2.0
+
+# Extra time given to a render past its simulation budget, for drawing and encoding the frames
+RENDER_GRACE = 10.0
+
+
+class SimulationResult(NamedTuple):
+    """Generations computed within the budget, and whether the budget cut them short."""
+
+    generations: list[Generation]
+    period: int | None
+    cycle_start: int | None
+    truncated: bool
+
+
+def simulate(initial_alive_cells, max_generations: int, budget: float | None, rule: Rule = CONWAY, engine: str = 'auto') -> SimulationResult:
+    """
+    Run a simulation, stopping early once budget seconds have elapsed.
+
+    Args:
+        initial_alive_cells: List of (x, y) coordinates representing initially alive cells
+        max_generations: Maximum number of generations to simulate
+        budget: Wall-clock budget in seconds, or None for no limit
+        rule: Rule deciding births and survivals (default: Conway's B3/S23)
+        engine: Engine used to compute generations, or 'auto' to pick one from the pattern
+
+    Returns:
+        SimulationResult with the generations computed so far
+    """
+    deadline = time.monotonic() + budget if budget is not None else None
+    detector = CycleDetector(initial_alive_cells)
+    generations = []
+    for cells, _, _ in iter_game_of_life_steps(initial_alive_cells, max_generations, engine, detector=detector, rule=rule):
+        generations.append(Generation.from_cells(cells))
+        if deadline is not None and time.monotonic() >= deadline and len(generations) < max_generations:
+            logger.info(f"Simulation budget of {budget}s ran out after {len(generations)} generations")
+            return SimulationResult(generations, None, None, True)
+    return SimulationResult(generations, detector.period, detector.cycle_start, False)
+
+
+def jump(initial_alive_cells, generations: int, budget: float | None, rule: Rule = CONWAY, max_population: int | None = None) -> list[tuple[int, int]] | None:
+    """
+    Jump a pattern ahead with Hashlife, see advance_game_of_life.
+
+    Returns:
+        The alive cells after generations, or None if the budget ran out first
+    """
+    try:
+        return advance_game_of_life(initial_alive_cells, generations, max_population, rule, budget)
+    except TimeoutError:
+        logger.info(f"Hashlife budget of {budget}s ran out before generation {generations}")
+        return None
+
+
+class SimulationPool:
+    """
+    Lazily started pool of simulation processes.
+
+    With max_workers set to 0 simulations run inline, which keeps the budget
+    but gives up the isolation (useful for development servers).
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting simulation pool with {self.max_workers} processes")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=compute_tiles_inline,
+                )
+            return self._executor
+
+    def _submit(self, fn, *args):
+        try:
+            return self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            # A crashed worker breaks the whole pool, start a fresh one for this and later requests
+            logger.error("Simulation pool is broken, restarting it")
+            self.shutdown()
+            return self._get_executor().submit(fn, *args)
+
+    def _wait(self, futures, deadline: float | None) -> bool:
+        """Wait for futures while yielding to other greenlets, returning False once the deadline passes."""
+        while not all(future.done() for future in futures):
+            if deadline is not None and time.monotonic() >= deadline:
+                for future in futures:
+                    future.cancel()
+                return False
+            time.sleep(POLL_INTERVAL)
+        return True
+
+    def _result(self, future):
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            logger.error("Simulation worker died, restarting the pool")
+            self.shutdown()
+            raise
+
+    def run(self, initial_alive_cells, max_generations: int, budget: float | None, rule: Rule = CONWAY, engine: str = 'auto') -> SimulationResult:
+        """
+        Run a simulation in the pool and wait for it without blocking other greenlets.
+
+        If the worker misses its budget by more than BUDGET_GRACE (a single
+        generation can be slow), the request stops waiting and an empty
+        truncated result is returned; the worker finishes in the background.
+        """
+        if self.max_workers <= 0:
+            return simulate(initial_alive_cells, max_generations, budget, rule, engine)
+
+        future = self._submit(simulate, list(initial_alive_cells), max_generations, budget, rule, engine)
+        deadline = time.monotonic() + budget + BUDGET_GRACE if budget is not None else None
+        if not self._wait([future], deadline):
+            logger.warning(f"Simulation did not finish within its {budget}s budget")
+            return SimulationResult([], None, None, True)
+        return self._result(future)
+
+    def jump(self, initial_alive_cells, generations: int, budget: float | None, rule: Rule = CONWAY, max_population: int | None = None) -> list[tuple[int, int]] | None:
+        """
+        Jump a pattern ahead with Hashlife in the pool, see jump.
+
+        Returns:
+            The alive cells after generations, or None if the budget ran out first
+
+        Raises:
+            ValueError: If the final population exceeds max_population
+        """
+        if self.max_workers <= 0:
+            return jump(initial_alive_cells, generations, budget, rule, max_population)
+
+        future = self._submit(jump, list(initial_alive_cells), generations, budget, rule, max_population)
+        deadline = time.monotonic() + budget + BUDGET_GRACE if budget is not None else None
+        if not self._wait([future], deadline):
+            logger.warning(f"Hashlife jump did not finish within its {budget}s budget")
+            return None
+        return self._result(future)
+
+    def seek(self, index: KeyframeIndex, generation: int, budget: float | None) -> set[tuple[int, int]] | None:
+        """
+        Compute one generation of a keyframe index's timeline in the pool, see KeyframeIndex.seek.
+
+        The index stays in this process: the pool extends the timeline up to the
+        keyframe before generation and steps that keyframe forward. Keyframes found
+        before the budget ran out are kept, so a retry carries on from them.
+
+        Returns:
+            Set of (x, y) coordinates of the alive cells, or None if the budget ran out first
+        """
+        deadline = time.monotonic() + budget if budget is not None else None
+        extension = index.extension(generation)
+        if extension is not None:
+            run = self._call(run_timeline, deadline, *extension, index.interval, index.rule, index.engine, budget)
+            if run is None:
+                return None
+            index.merge(run)
+            if not run.complete:
+                return None
+
+        location = index.locate(generation)
+        if location is None:
+            return set()
+        remaining = max(deadline - time.monotonic(), 0.0) if deadline is not None else None
+        return self._call(restore, deadline, *location, index.rule, index.engine, remaining)
+
+    def _call(self, fn, deadline: float | None, *args):
+        """Run fn in the pool, or inline without workers, returning None if it misses deadline by BUDGET_GRACE."""
+        if self.max_workers <= 0:
+            return fn(*args)
+
+        future = self._submit(fn, *args)
+        if not self._wait([future], deadline + BUDGET_GRACE if deadline is not None else None):
+            logger.warning(f"{fn.__name__} did not finish within its budget")
+            return None
+        return self._result(future)
+
+    def render(self, initial_alive_cells, max_generations: int, budget: float | None, output_format: str, delay: int, rule: Rule = CONWAY, engine: str = 'auto', viewport: Viewport | None = None) -> tuple[bytes, bool] | None:
+        """
+        Simulate and render a pattern in the pool, see render_simulation.
+
+        Returns:
+            Tuple of (encoded image, whether the budget cut the simulation short), or None
+            if the worker did not finish in time
+        """
+        if self.max_workers <= 0:
+            return render_simulation(initial_alive_cells, max_generations, budget, output_format, delay, rule, engine, viewport)
+
+        future = self._submit(render_simulation, list(initial_alive_cells), max_generations, budget, output_format, delay, rule, engine, viewport)
+        deadline = time.monotonic() + budget + BUDGET_GRACE + RENDER_GRACE if budget is not None else None
+        if not self._wait([future], deadline):
+            logger.warning(f"Render did not finish within its {budget}s budget")
+            return None
+        return self._result(future)
+
+    def summarize(self, patterns, max_generations: int, budget: float | None, rule: Rule = CONWAY, engine: str = 'auto') -> tuple[list[dict | None], bool]:
+        """
+        Summarize many patterns, spread across the pool's processes.
+
+        Patterns are sent in small chunks, several per process, so that work is
+        spread evenly and a missed budget only leaves the unfinished chunks out.
+
+        Returns:
+            Tuple of (summaries in the order of patterns, with None for the patterns
+            left out by the budget, whether any pattern was left out)
+        """
+        # Chunks already running stop at the same deadline, which is wall-clock time to hold across processes
+        worker_deadline = time.time() + budget if budget is not None else None
+        if self.max_workers <= 0:
+            summaries = summarize_patterns(patterns, max_generations, rule, engine, worker_deadline)
+            return summaries, None in summaries
+
+        deadline = time.monotonic() + budget + BUDGET_GRACE if budget is not None else None
+        chunk_size = min(max(1, -(-len(patterns) // (self.max_workers * CHUNKS_PER_WORKER))), MAX_CHUNK_SIZE)
+        chunks = [[list(cells) for cells in patterns[start:start + chunk_size]] for start in range(0, len(patterns), chunk_size)]
+        futures = [self._submit(summarize_patterns, chunk, max_generations, rule, engine, worker_deadline) for chunk in chunks]
+        if not self._wait(futures, deadline):
+            logger.warning(f"Pattern search did not finish within its {budget}s budget")
+
+        summaries = []
+        for chunk, future in zip(chunks, futures):
+            if future.done() and not future.cancelled():
+                summaries.extend(self._result(future))
+            else:
+                summaries.extend([None] * len(chunk))
+        return summaries, None in summaries
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool starts again on the next run."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
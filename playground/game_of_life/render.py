@@ -0,0 +1,167 @@
+"""
+Server-side rendering of simulations to animated images.
+
+Animating a long simulation in the browser is too much for low-end phones,
+and link previews can't run scripts at all, so a simulation can also be
+rendered to an animated WebP or GIF.
+
+Rendering is incremental: a single palette frame buffer is drawn once for
+the first generation, then only each generation's births and deaths are
+painted onto it before it is snapshotted as the next frame.
+"""
+
+import hashlib
+import io
+import logging
+import time
+
+from PIL import Image, ImageDraw
+
+from .cache import normalize_cells
+from .cycles import CycleDetector
+from .engine import iter_game_of_life_steps
+from .rules import CONWAY, Rule
+from .serialization import bounding_box
+from .viewport import Viewport
+
+logger = logging.getLogger('playground.game_of_life.render')
+
+RENDER_FORMATS = {
+    'webp': 'image/webp',
+    'gif': 'image/gif',
+}
+
+# Largest side of a rendered image in pixels; every frame is kept in memory until the image is encoded
+MAX_RENDER_SIDE = 256
+MAX_CELL_SIZE = 8
+
+# Palette of the frame buffer: index 0 is a dead cell, index 1 an alive one
+DEAD_COLOUR = (0x22, 0x22, 0x22)
+ALIVE_COLOUR = (0x00, 0xff, 0x00)
+
+# Bump when the drawing changes, so cached renders of the old look are not served
+RENDER_VERSION = 1
+
+
+def render_cache_key(cells, max_generations: int, output_format: str, delay: int, rule: Rule = CONWAY, viewport: Viewport | None = None) -> str:
+    """
+    Return the cache key of a render.
+
+    Without a viewport the image does not depend on where the pattern was
+    drawn, so the pattern is hashed at its bounding-box origin and the same
+    shape shares one entry wherever it is on the grid.
+    """
+    if viewport is None:
+        cells = normalize_cells(cells)[0] if cells else frozenset()
+    digest = hashlib.sha256()
+    for x_pos, y_pos in sorted(cells):
+        digest.update(f'{x_pos},{y_pos};'.encode())
+    digest.update(f'{RENDER_VERSION}|{max_generations}|{output_format}|{delay}|{rule.rulestring}|{tuple(viewport) if viewport else None}'.encode())
+    return f'game_of_life:render:{digest.hexdigest()}'
+
+
+def fit_region(initial_alive_cells, changes, viewport: Viewport | None = None) -> tuple[Viewport, int]:
+    """
+    Choose the cells shown in the image, and the size in pixels of each cell.
+
+    The region is the viewport when one is given. Otherwise it covers every
+    cell the simulation ever touches, cropped around the initial pattern when
+    that would not fit MAX_RENDER_SIDE pixels even at one pixel per cell.
+
+    Returns:
+        Tuple of (region, cell size)
+    """
+    if viewport is None:
+        touched = list(initial_alive_cells)
+        for births, _ in changes:
+            touched.extend(births)
+        if not touched:
+            return Viewport(0, 0, 0, 0), MAX_CELL_SIZE
+
+        min_x, min_y, max_x, max_y = bounding_box(touched)
+        if max_x - min_x + 1 > MAX_RENDER_SIDE or max_y - min_y + 1 > MAX_RENDER_SIDE:
+            # Debris flew too far: keep the part around where the pattern started
+            start_x, start_y, end_x, end_y = bounding_box(initial_alive_cells) if initial_alive_cells else (min_x, min_y, max_x, max_y)
+            centre_x = (start_x + end_x) // 2
+            centre_y = (start_y + end_y) // 2
+            if max_x - min_x + 1 > MAX_RENDER_SIDE:
+                min_x = centre_x - MAX_RENDER_SIDE // 2
+                max_x = min_x + MAX_RENDER_SIDE - 1
+            if max_y - min_y + 1 > MAX_RENDER_SIDE:
+                min_y = centre_y - MAX_RENDER_SIDE // 2
+                max_y = min_y + MAX_RENDER_SIDE - 1
+        viewport = Viewport(min_x, min_y, max_x, max_y)
+
+    width = viewport.max_x - viewport.min_x + 1
+    height = viewport.max_y - viewport.min_y + 1
+    if width > MAX_RENDER_SIDE or height > MAX_RENDER_SIDE:
+        raise ValueError(f"Rendered region must be at most {MAX_RENDER_SIDE}x{MAX_RENDER_SIDE} cells")
+    return viewport, max(1, min(MAX_CELL_SIZE, MAX_RENDER_SIDE // width, MAX_RENDER_SIDE // height))
+
+
+def render_animation(initial_alive_cells, changes, output_format: str, delay: int, viewport: Viewport | None = None) -> bytes:
+    """
+    Render generations to an animated image.
+
+    Args:
+        initial_alive_cells: Cells of the first frame
+        changes: List of (births, deaths) of every following generation
+        output_format: 'webp' or 'gif'
+        delay: Time each frame is shown, in milliseconds
+        viewport: Cells to show, or None to fit the whole simulation
+
+    Returns:
+        The encoded image
+    """
+    if output_format not in RENDER_FORMATS:
+        raise ValueError(f"Render format must be one of: {', '.join(RENDER_FORMATS)}")
+
+    region, cell_size = fit_region(initial_alive_cells, changes, viewport)
+    frame = Image.new('P', ((region.max_x - region.min_x + 1) * cell_size, (region.max_y - region.min_y + 1) * cell_size), 0)
+    frame.putpalette(DEAD_COLOUR + ALIVE_COLOUR)
+    draw = ImageDraw.Draw(frame)
+
+    def paint(cells, colour):
+        for x_pos, y_pos in region.clip(cells):
+            left = (x_pos - region.min_x) * cell_size
+            top = (y_pos - region.min_y) * cell_size
+            draw.rectangle((left, top, left + cell_size - 1, top + cell_size - 1), fill=colour)
+
+    paint(initial_alive_cells, 1)
+    frames = [frame.copy()]
+    for births, deaths in changes:
+        paint(deaths, 0)
+        paint(births, 1)
+        frames.append(frame.copy())
+
+    buffer = io.BytesIO()
+    if output_format == 'webp':
+        frames[0].save(buffer, format='WEBP', save_all=True, append_images=frames[1:], duration=delay, loop=0, lossless=True, method=0)
+    else:
+        # Without optimize, Pillow still only stores the part of each frame that changed
+        frames[0].save(buffer, format='GIF', save_all=True, append_images=frames[1:], duration=delay, loop=0)
+    logger.debug(f"Rendered {len(frames)} frames of {frame.width}x{frame.height} pixels to {buffer.tell()} bytes of {output_format}")
+    return buffer.getvalue()
+
+
+def render_simulation(initial_alive_cells, max_generations: int, budget: float | None, output_format: str, delay: int, rule: Rule = CONWAY, engine: str = 'auto', viewport: Viewport | None = None) -> tuple[bytes, bool]:
+    """
+    Simulate a pattern and render it, stopping the simulation early once budget seconds have elapsed.
+
+    Only births and deaths are kept between the simulation and the drawing.
+    Like every simulation, patterns that settle into a cycle stop at the first
+    repeated generation.
+
+    Returns:
+        Tuple of (encoded image, whether the budget cut the simulation short)
+    """
+    deadline = time.monotonic() + budget if budget is not None else None
+    changes = []
+    truncated = False
+    for _, births, deaths in iter_game_of_life_steps(initial_alive_cells, max_generations, engine, detector=CycleDetector(initial_alive_cells), rule=rule):
+        changes.append((list(births), list(deaths)))
+        if deadline is not None and time.monotonic() >= deadline and len(changes) < max_generations:
+            logger.info(f"Render budget of {budget}s ran out after {len(changes)} generations")
+            truncated = True
+            break
+    return render_animation(initial_alive_cells, changes, output_format, delay, viewport), truncated
@@ -0,0 +1,109 @@
+"""
+Life-like cellular automaton rules.
+
+A Life-like rule is written as a B/S rulestring: the neighbour counts at
+which a dead cell is born, then the counts at which a live cell survives.
+Conway's Game of Life is B3/S23, HighLife is B36/S23, Seeds is B2/S.
+
+Rulestrings are compiled once into lookup tables, so engines apply any rule
+with a single index instead of branching on neighbour counts:
+
+- next_state, indexed by alive * 9 + neighbour count (18 entries),
+- neighbourhoods, indexed by the 9 bits of a 3x3 block, read row by row
+  from the top-left cell (512 entries).
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+logger = logging.getLogger('playground.game_of_life.rules')
+
+# Well-known rules accepted by name, in lower case
+NAMED_RULES = {
+    'life': 'B3/S23',
+    'conway': 'B3/S23',
+    'highlife': 'B36/S23',
+    'seeds': 'B2/S',
+    'day_and_night': 'B3678/S34678',
+    'life_without_death': 'B3/S012345678',
+    'diamoeba': 'B35678/S5678',
+    'morley': 'B368/S245',
+    'two_by_two': 'B36/S125',
+    'replicator': 'B1357/S1357',
+}
+
+RULESTRING_PATTERN = re.compile(r'^B(?P<birth>[0-8]*)/?S(?P<survival>[0-8]*)$|^S(?P<s_first>[0-8]*)/?B(?P<b_last>[0-8]*)$')
+
+# Bit of the centre cell in a 3x3 neighbourhood index
+CENTRE_BIT = 1 << 4
+
+
+class Rule(NamedTuple):
+    """A compiled Life-like rule."""
+
+    rulestring: str
+    birth: frozenset[int]
+    survival: frozenset[int]
+    next_state: tuple[bool, ...]
+    neighbourhoods: bytes
+
+    @classmethod
+    def from_counts(cls, birth, survival) -> 'Rule':
+        """
+        Compile a rule from its birth and survival neighbour counts.
+
+        Raises:
+            ValueError: If a count is outside 0-8, or the rule gives birth with 0 neighbours
+        """
+        birth = frozenset(birth)
+        survival = frozenset(survival)
+        if not birth | survival <= set(range(9)):
+            raise ValueError("Neighbour counts must be between 0 and 8")
+        if 0 in birth:
+            # Every empty cell of the infinite grid would be born, which no engine can represent
+            raise ValueError("Rules with birth on 0 neighbours are not supported")
+
+        next_state = tuple(count in birth for count in range(9)) + tuple(count in survival for count in range(9))
+        neighbourhoods = bytes(
+            next_state[(9 if block & CENTRE_BIT else 0) + (block & ~CENTRE_BIT).bit_count()]
+            for block in range(512)
+        )
+        rulestring = f"B{''.join(map(str, sorted(birth)))}/S{''.join(map(str, sorted(survival)))}"
+        return cls(rulestring, birth, survival, next_state, neighbourhoods)
+
+
+def parse_rule(rulestring: str) -> Rule:
+    """
+    Compile a rulestring or a rule name into a Rule.
+
+    Args:
+        rulestring: B/S rulestring such as 'B36/S23' (case-insensitive, the slash is
+            optional and 'S23/B3' is accepted too), or a name from NAMED_RULES
+
+    Returns:
+        The compiled Rule
+
+    Raises:
+        ValueError: If the rulestring is invalid or the rule is not supported
+    """
+    if not isinstance(rulestring, str):
+        raise ValueError("Rule must be a string")
+    return _parse_rulestring(rulestring)
+
+
+@lru_cache(maxsize=256)
+def _parse_rulestring(rulestring: str) -> Rule:
+    text = NAMED_RULES.get(rulestring.strip().lower().replace(' ', '_').replace('-', '_'), rulestring)
+    match = RULESTRING_PATTERN.match(text.strip().upper())
+    if match is None:
+        raise ValueError(f"Invalid rulestring: {rulestring}")
+
+    birth = match['birth'] if match['birth'] is not None else match['b_last']
+    survival = match['survival'] if match['survival'] is not None else match['s_first']
+    return Rule.from_counts(map(int, birth), map(int, survival))
+
+
+# Conway's Game of Life, the default rule everywhere
+CONWAY = parse_rule('B3/S23')
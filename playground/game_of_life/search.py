@@ -0,0 +1,102 @@
+"""
+Batch search over many patterns, summarizing each one instead of keeping its frames.
+
+Soup searches run hundreds of random patterns to find the few that live
+long or end in something interesting. Only the outcome of each run matters,
+so no frames are kept: only the latest generation is copied out of the
+engine, and every pattern is reduced to a small summary.
+"""
+
+import logging
+import random
+import time
+
+from .cycles import CycleDetector
+from .engine import iter_game_of_life_steps
+from .generation import Generation
+from .rules import CONWAY, Rule
+from .serialization import bounding_box
+
+logger = logging.getLogger('playground.game_of_life.search')
+
+# Outcomes of a summarized run
+DIED = 'died'
+CYCLE = 'cycle'
+RUNNING = 'running'
+
+
+def random_soup(width: int, height: int, density: float, rng: random.Random) -> list[tuple[int, int]]:
+    """
+    Generate a random soup filling a width x height box.
+
+    Args:
+        width: Width of the box
+        height: Height of the box
+        density: Probability of each cell being alive, between 0 and 1
+        rng: Random number generator, seeded by the caller for reproducible searches
+
+    Returns:
+        List of (x, y) coordinates of alive cells
+    """
+    return [(x, y) for y in range(height) for x in range(width) if rng.random() < density]
+
+
+def summarize_pattern(initial_alive_cells, max_generations: int = 1000, rule: Rule = CONWAY, engine: str = 'auto', deadline: float | None = None) -> dict | None:
+    """
+    Simulate a pattern and describe how its run ended.
+
+    Args:
+        initial_alive_cells: List of (x, y) coordinates representing initially alive cells
+        max_generations: Maximum number of generations to simulate
+        rule: Rule deciding births and survivals (default: Conway's B3/S23)
+        engine: Engine used to compute generations, or 'auto' to pick one from the pattern
+        deadline: time.time() after which the run is abandoned, or None for no limit. Wall-clock
+            time, unlike the monotonic clock, means the same in every process of a pool
+
+    Returns:
+        Dict with the run's 'outcome' ('died', 'cycle' or 'running'), its 'lifespan'
+        (generations before it died out or entered its cycle), the 'final_population',
+        'period' and 'bounding_box' ([min_x, min_y, max_x, max_y], or None once empty),
+        or None if the deadline passed first
+    """
+    if not initial_alive_cells:
+        return {'outcome': DIED, 'lifespan': 0, 'final_population': 0, 'period': None, 'bounding_box': None}
+
+    detector = CycleDetector(initial_alive_cells)
+    cells = ()
+    generations = 0
+    for step_cells, _, _ in iter_game_of_life_steps(initial_alive_cells, max_generations, engine, detector=detector, rule=rule):
+        # Copied, as the engine's own set may already be one generation further when a cycle stops the run
+        cells = Generation.from_cells(step_cells)
+        generations += 1
+        if deadline is not None and time.time() >= deadline:
+            return None
+
+    if detector.period is not None:
+        outcome = CYCLE
+        lifespan = detector.cycle_start
+    elif not cells:
+        outcome = DIED
+        lifespan = generations
+    else:
+        outcome = RUNNING
+        lifespan = generations
+
+    return {
+        'outcome': outcome,
+        'lifespan': lifespan,
+        'final_population': len(cells),
+        'period': detector.period,
+        'bounding_box': list(bounding_box(cells)) if cells else None,
+    }
+
+
+def summarize_patterns(patterns, max_generations: int = 1000, rule: Rule = CONWAY, engine: str = 'auto', deadline: float | None = None) -> list[dict | None]:
+    """Summarize several patterns one after the other, with None for those the deadline left out, see summarize_pattern."""
+    summaries = []
+    for cells in patterns:
+        if deadline is not None and time.time() >= deadline:
+            summaries.append(None)
+        else:
+            summaries.append(summarize_pattern(cells, max_generations, rule, engine, deadline))
+    return summaries
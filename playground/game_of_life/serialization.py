@@ -0,0 +1,305 @@
+"""
+Compact wire formats for Game of Life patterns.
+
+Besides plain lists of [x, y] pairs, patterns can be exchanged as:
+
+- RLE: the standard Life run-length encoding (``x = 3, y = 3`` header,
+  ``b`` for dead cells, ``o`` for alive cells, ``$`` for new rows and ``!``
+  to end), sent as ``{"rle": "...", "x": 0, "y": 0}`` where x and y place
+  the top-left corner of the pattern.
+- Bitmap: the bounding box packed row by row into bits (most significant
+  bit first) and base64 encoded, sent as
+  ``{"bitmap": "...", "x": 0, "y": 0, "width": 8, "height": 8}``.
+
+Both are decoded and encoded in bulk; bitmaps use NumPy when it is available.
+"""
+
+import base64
+import logging
+import re
+from itertools import repeat
+
+from .dense import NUMPY_AVAILABLE, np
+from .rules import CONWAY, Rule
+
+logger = logging.getLogger('playground.game_of_life.serialization')
+
+ENCODINGS = ('pairs', 'rle', 'bitmap')
+
+# Upper bound on cells produced by decoding, so a tiny RLE like "999999999o" can't exhaust memory
+MAX_DECODED_CELLS = 1_000_000
+
+# Largest bounding box (in cells) packed as a bitmap; sparser spreads are sent as RLE instead
+MAX_BITMAP_AREA = 1 << 24
+
+# Maximum line length of RLE bodies, as recommended by the format
+RLE_LINE_LENGTH = 70
+
+RLE_TOKEN = re.compile(r'(\d*)([a-zA-Z$!])')
+
+
+def bounding_box(cells) -> tuple[int, int, int, int]:
+    """Return (min_x, min_y, max_x, max_y) of a non-empty collection of cells."""
+    xs = [cell[0] for cell in cells]
+    ys = [cell[1] for cell in cells]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def decode_rle(rle: str, x: int = 0, y: int = 0, max_cells: int = MAX_DECODED_CELLS) -> list[tuple[int, int]]:
+    """
+    Decode a Life RLE pattern.
+
+    Args:
+        rle: RLE text, optionally with '#' comment lines and an 'x = ..., y = ...' header
+        x: X coordinate of the pattern's top-left corner
+        y: Y coordinate of the pattern's top-left corner
+        max_cells: Maximum number of alive cells the pattern may decode to
+
+    Returns:
+        List of (x, y) coordinates of alive cells
+
+    Raises:
+        ValueError: If the RLE is malformed or decodes to more than max_cells cells
+    """
+    # Drop comments and the header line, keep only the run-length body
+    body = ''.join(
+        line.strip() for line in rle.splitlines()
+        if line.strip() and not line.lstrip().startswith(('#', 'x'))
+    )
+
+    cells = []
+    column = 0
+    row = 0
+    position = 0
+    for match in RLE_TOKEN.finditer(body):
+        if match.start() != position and body[position:match.start()].strip():
+            raise ValueError(f"Invalid RLE content near position {position}")
+        position = match.end()
+
+        count = int(match.group(1)) if match.group(1) else 1
+        tag = match.group(2)
+        if tag == '!':
+            break
+        elif tag == '$':
+            row += count
+            column = 0
+        elif tag == 'b':
+            column += count
+        else:
+            # Any other letter is an alive cell in two-state patterns
+            if len(cells) + count > max_cells:
+                raise ValueError(f"RLE pattern decodes to more than {max_cells} cells")
+            start = x + column
+            cells.extend(zip(range(start, start + count), repeat(y + row, count)))
+            column += count
+
+    return cells
+
+
+def encode_rle(cells, rule: Rule = CONWAY) -> dict:
+    """
+    Encode alive cells as Life RLE.
+
+    Args:
+        cells: Collection of (x, y) coordinates of alive cells
+        rule: Rule the pattern runs under, written to the header
+
+    Returns:
+        Dict with the 'rle' text and the 'x' and 'y' of its top-left corner
+    """
+    cells = {(cell[0], cell[1]) for cell in cells}
+    if not cells:
+        return {'rle': f'x = 0, y = 0, rule = {rule.rulestring}\n!', 'x': 0, 'y': 0}
+
+    min_x, min_y, max_x, max_y = bounding_box(cells)
+
+    # Group alive columns by row, then emit runs of alive cells separated by runs of dead ones
+    rows: dict[int, list[int]] = {}
+    for cell_x, cell_y in cells:
+        rows.setdefault(cell_y - min_y, []).append(cell_x - min_x)
+
+    tokens = []
+    previous_row = 0
+    for row in sorted(rows):
+        if row != previous_row:
+            skipped = row - previous_row
+            tokens.append(f"{skipped if skipped > 1 else ''}$")
+            previous_row = row
+
+        column = 0
+        columns = sorted(rows[row])
+        start = 0
+        while start < len(columns):
+            end = start
+            while end + 1 < len(columns) and columns[end + 1] == columns[end] + 1:
+                end += 1
+            gap = columns[start] - column
+            if gap:
+                tokens.append(f"{gap if gap > 1 else ''}b")
+            run = end - start + 1
+            tokens.append(f"{run if run > 1 else ''}o")
+            column = columns[end] + 1
+            start = end + 1
+    tokens.append('!')
+
+    # Wrap the body without splitting tokens
+    lines = []
+    line = ''
+    for token in tokens:
+        if len(line) + len(token) > RLE_LINE_LENGTH:
+            lines.append(line)
+            line = ''
+        line += token
+    lines.append(line)
+
+    header = f"x = {max_x - min_x + 1}, y = {max_y - min_y + 1}, rule = {rule.rulestring}"
+    return {'rle': '\n'.join([header] + lines), 'x': min_x, 'y': min_y}
+
+
+def decode_bitmap(bitmap: str, x: int, y: int, width: int, height: int, max_cells: int = MAX_DECODED_CELLS) -> list[tuple[int, int]]:
+    """
+    Decode a base64 packed bitmap of a bounding box.
+
+    Args:
+        bitmap: Base64 string of the box's bits, row by row, most significant bit first
+        x: X coordinate of the box's top-left corner
+        y: Y coordinate of the box's top-left corner
+        width: Width of the box in cells
+        height: Height of the box in cells
+        max_cells: Maximum number of alive cells the bitmap may decode to
+
+    Returns:
+        List of (x, y) coordinates of alive cells
+
+    Raises:
+        ValueError: If the bitmap is malformed or decodes to more than max_cells cells
+    """
+    if width < 0 or height < 0:
+        raise ValueError("Bitmap dimensions must not be negative")
+
+    data = base64.b64decode(bitmap, validate=True)
+    if len(data) != (width * height + 7) // 8:
+        raise ValueError(f"Bitmap of {len(data)} bytes does not match a {width}x{height} box")
+
+    if NUMPY_AVAILABLE:
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=width * height)
+        indices = np.flatnonzero(bits)
+        if len(indices) > max_cells:
+            raise ValueError(f"Bitmap decodes to more than {max_cells} cells")
+        rows, columns = np.divmod(indices, width) if width else (indices, indices)
+        return list(zip((columns + x).tolist(), (rows + y).tolist()))
+
+    cells = []
+    for byte_index, byte in enumerate(data):
+        if not byte:
+            continue
+        for bit in range(8):
+            if byte & (0x80 >> bit):
+                row, column = divmod(byte_index * 8 + bit, width)
+                cells.append((x + column, y + row))
+        if len(cells) > max_cells:
+            raise ValueError(f"Bitmap decodes to more than {max_cells} cells")
+    return cells
+
+
+def encode_bitmap(cells) -> dict:
+    """
+    Encode alive cells as a base64 packed bitmap of their bounding box.
+
+    Returns:
+        Dict with the 'bitmap' data and the box's 'x', 'y', 'width' and 'height'
+    """
+    cells = list(cells)
+    if not cells:
+        return {'bitmap': '', 'x': 0, 'y': 0, 'width': 0, 'height': 0}
+
+    if NUMPY_AVAILABLE:
+        coordinates = np.array(cells, dtype=np.int64)
+        min_x, min_y = (int(value) for value in coordinates.min(axis=0))
+        max_x, max_y = (int(value) for value in coordinates.max(axis=0))
+        width = max_x - min_x + 1
+        height = max_y - min_y + 1
+        bits = np.zeros(width * height, dtype=np.uint8)
+        bits[(coordinates[:, 1] - min_y) * width + (coordinates[:, 0] - min_x)] = 1
+        data = np.packbits(bits).tobytes()
+    else:
+        min_x, min_y, max_x, max_y = bounding_box(cells)
+        width = max_x - min_x + 1
+        height = max_y - min_y + 1
+        buffer = bytearray((width * height + 7) // 8)
+        for cell_x, cell_y in cells:
+            index = (cell_y - min_y) * width + (cell_x - min_x)
+            buffer[index >> 3] |= 0x80 >> (index & 7)
+        data = bytes(buffer)
+
+    return {
+        'bitmap': base64.b64encode(data).decode('ascii'),
+        'x': min_x,
+        'y': min_y,
+        'width': width,
+        'height': height,
+    }
+
+
+def decode_cells(value, max_cells: int = MAX_DECODED_CELLS) -> list[tuple[int, int]]:
+    """
+    Decode cells from any supported wire format.
+
+    Args:
+        value: List of [x, y] pairs, an RLE object or a bitmap object
+
+    Returns:
+        List of (x, y) coordinates of alive cells
+
+    Raises:
+        ValueError, TypeError, IndexError, KeyError: If the value is malformed
+    """
+    if isinstance(value, dict):
+        if 'rle' in value:
+            return decode_rle(str(value['rle']), int(value.get('x', 0)), int(value.get('y', 0)), max_cells)
+        if 'bitmap' in value:
+            return decode_bitmap(
+                str(value['bitmap']),
+                int(value.get('x', 0)),
+                int(value.get('y', 0)),
+                int(value['width']),
+                int(value['height']),
+                max_cells,
+            )
+        raise ValueError("Encoded cells must contain 'rle' or 'bitmap'")
+
+    if len(value) > max_cells:
+        raise ValueError(f"More than {max_cells} cells received")
+    return [(int(cell[0]), int(cell[1])) for cell in value]
+
+
+def encode_cells(cells, encoding: str = 'pairs', rule: Rule = CONWAY):
+    """
+    Encode cells into one of the supported wire formats.
+
+    Bitmaps are only used while the bounding box stays under MAX_BITMAP_AREA;
+    cells spread over a larger box are encoded as RLE, which is self-describing
+    and decoded by the same decode_cells call.
+
+    Args:
+        cells: Collection of (x, y) coordinates of alive cells
+        encoding: 'pairs', 'rle' or 'bitmap'
+        rule: Rule the cells run under, written to RLE headers
+
+    Returns:
+        A list of (x, y) pairs, or an RLE or bitmap object
+    """
+    if encoding == 'rle':
+        return encode_rle(cells, rule)
+    if encoding == 'bitmap':
+        if cells:
+            min_x, min_y, max_x, max_y = bounding_box(cells)
+            if (max_x - min_x + 1) * (max_y - min_y + 1) > MAX_BITMAP_AREA:
+                return encode_rle(cells, rule)
+        return encode_bitmap(cells)
+    return list(cells)
+
+
+def encode_frame(frame: dict, encoding: str = 'pairs', rule: Rule = CONWAY) -> dict:
+    """Encode every cell list of a generation frame ('alive_cells', 'births' and 'deaths')."""
+    return {key: encode_cells(cells, encoding, rule) for key, cells in frame.items()}
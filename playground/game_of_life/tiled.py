@@ -0,0 +1,277 @@
+"""
+Tiled multi-process engine for large Game of Life universes.
+
+The universe is split into fixed-size square tiles, each a NumPy boolean
+array. A generation only steps the tiles that may change: tiles that
+changed in the previous generation and their neighbours. Empty tiles are
+dropped, and tiles whose whole neighbourhood was stable are skipped.
+
+To step a tile, it is padded with a one-cell halo copied from its 8
+neighbours, so tiles can be stepped independently of each other. When
+enough tiles are active, the padded tiles are bit-packed and stepped in
+parallel by a pool of processes, shared by every tiled engine of the
+process. Simulation pool workers step their tiles inline instead, see
+compute_tiles_inline: the simulation pool already spreads simulations over
+the cores, and a tile pool per worker would only oversubscribe them.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .dense import NUMPY_AVAILABLE, apply_rule, np
+from .rules import CONWAY, Rule
+
+logger = logging.getLogger('playground.game_of_life.tiled')
+
+# Side of a tile in cells; larger tiles amortize the halo copies and process round trips
+TILE_SIZE = 256
+
+# Below this many active tiles a generation is stepped inline, as sending tiles costs more than it saves
+PARALLEL_MIN_TILES = 8
+
+# Offsets of the 8 neighbouring tiles, and of the tile itself
+TILE_NEIGHBOURHOOD = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+# Longest wait for the tile pool to step one generation, in seconds
+TILE_TIMEOUT = 30.0
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+# Set in processes that must not start a tile pool, see compute_tiles_inline
+_inline = False
+
+
+def compute_tiles_inline() -> None:
+    """Step the tiles of every tiled engine of this process inline, never starting a tile pool."""
+    global _inline
+    _inline = True
+
+
+def step_padded(padded, rule: Rule):
+    """
+    Compute the next generation of a tile padded with its one-cell halo.
+
+    Args:
+        padded: Boolean array of shape (TILE_SIZE + 2, TILE_SIZE + 2)
+        rule: Rule deciding births and survivals
+
+    Returns:
+        Boolean array of shape (TILE_SIZE, TILE_SIZE) with the tile's next generation
+    """
+    cells = padded.view(np.uint8)
+    neighbours = cells[:-2, :-2] + cells[:-2, 1:-1]
+    neighbours += cells[:-2, 2:]
+    neighbours += cells[1:-1, :-2]
+    neighbours += cells[1:-1, 2:]
+    neighbours += cells[2:, :-2]
+    neighbours += cells[2:, 1:-1]
+    neighbours += cells[2:, 2:]
+    return apply_rule(padded[1:-1, 1:-1], neighbours, rule)
+
+
+def step_packed_tiles(packed_tiles: list[bytes], rule: Rule) -> list[bytes]:
+    """
+    Step a batch of bit-packed padded tiles, in a pool process.
+
+    Tiles travel bit-packed to keep the data sent between processes small.
+    """
+    side = TILE_SIZE + 2
+    results = []
+    for packed in packed_tiles:
+        padded = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=side * side).reshape(side, side).astype(bool)
+        results.append(np.packbits(step_padded(padded, rule)).tobytes())
+    return results
+
+
+def get_executor(max_workers: int) -> ProcessPoolExecutor:
+    """Return the tile pool shared by every tiled engine of this process, starting it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            logger.info(f"Starting tile pool with {max_workers} processes")
+            _executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the tile pool, cancelling the batches not started yet. The next parallel step starts a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+atexit.register(shutdown_executor)
+
+
+class TiledEngine:
+    """
+    Engine that steps a universe tile by tile, in parallel for large populations.
+
+    Best suited to populations in the tens of thousands spread over a large
+    area, where even one vectorized pass over the whole bounding box is slow.
+    """
+
+    name = 'tiled'
+
+    def __init__(self, initial_alive_cells: list[tuple[int, int]], max_workers: int | None = None, rule: Rule = CONWAY):
+        if not NUMPY_AVAILABLE:
+            raise ValueError("The tiled engine requires NumPy")
+
+        self.rule = rule
+        if max_workers is None:
+            max_workers = 1 if _inline else (os.cpu_count() or 1)
+        self.max_workers = max_workers
+        self.tiles: dict[tuple[int, int], np.ndarray] = {}
+        cells = {(cell[0], cell[1]) for cell in initial_alive_cells}
+        for x_pos, y_pos in cells:
+            key = (x_pos // TILE_SIZE, y_pos // TILE_SIZE)
+            tile = self.tiles.get(key)
+            if tile is None:
+                tile = self.tiles[key] = np.zeros((TILE_SIZE, TILE_SIZE), dtype=bool)
+            tile[x_pos % TILE_SIZE, y_pos % TILE_SIZE] = True
+
+        self._population = len(cells)
+        self._cells: set[tuple[int, int]] | None = cells
+        # Tiles that changed in the last generation; initially every tile may change
+        self.changed: set[tuple[int, int]] = set(self.tiles)
+
+    @property
+    def population(self) -> int:
+        return self._population
+
+    def cells(self) -> set[tuple[int, int]]:
+        """Return the set of currently alive cells."""
+        if self._cells is None:
+            cells = set()
+            for key, tile in self.tiles.items():
+                cells |= self._to_set(key, *np.nonzero(tile))
+            self._cells = cells
+        return self._cells
+
+    def step(self) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+        """
+        Advance the universe by one generation.
+
+        Returns:
+            Tuple of (births, deaths) as sets of (x, y) coordinates
+        """
+        # Only tiles next to a change can change; the halo decides whether an empty one comes alive
+        candidates = {(tx + dx, ty + dy) for tx, ty in self.changed for dx, dy in TILE_NEIGHBOURHOOD}
+        padded_tiles = {}
+        for key in candidates:
+            padded = self._pad(key)
+            if padded is not None:
+                padded_tiles[key] = padded
+
+        if len(padded_tiles) >= PARALLEL_MIN_TILES and self.max_workers > 1:
+            new_tiles = self._step_parallel(padded_tiles)
+        else:
+            new_tiles = {key: step_padded(padded, self.rule) for key, padded in padded_tiles.items()}
+
+        births = set()
+        deaths = set()
+        changed = set()
+        empty = np.zeros((TILE_SIZE, TILE_SIZE), dtype=bool)
+        for key, new_tile in new_tiles.items():
+            old_tile = self.tiles.get(key, empty)
+            difference = new_tile ^ old_tile
+            if not difference.any():
+                continue
+
+            changed.add(key)
+            xs, ys = np.nonzero(difference)
+            born = new_tile[xs, ys]
+            births |= self._to_set(key, xs[born], ys[born])
+            deaths |= self._to_set(key, xs[~born], ys[~born])
+
+        # Apply the new tiles only once every tile has been stepped, the halos read the old ones
+        for key in changed:
+            new_tile = new_tiles[key]
+            if new_tile.any():
+                self.tiles[key] = new_tile
+            else:
+                self.tiles.pop(key, None)
+
+        self.changed = changed
+        self._population += len(births) - len(deaths)
+        self._cells = None
+        return births, deaths
+
+    def _pad(self, key: tuple[int, int]):
+        """Build a tile padded with its halo, or None if the tile and its halo are empty."""
+        tx, ty = key
+        tiles = self.tiles
+        tile = tiles.get(key)
+        padded = np.zeros((TILE_SIZE + 2, TILE_SIZE + 2), dtype=bool)
+        if tile is not None:
+            padded[1:-1, 1:-1] = tile
+
+        # Edges and corners of the 8 neighbours, board[x, y] indexing like the dense engine
+        halo = (
+            ((-1, 0), (0, slice(1, -1)), (-1, slice(None))),
+            ((1, 0), (-1, slice(1, -1)), (0, slice(None))),
+            ((0, -1), (slice(1, -1), 0), (slice(None), -1)),
+            ((0, 1), (slice(1, -1), -1), (slice(None), 0)),
+            ((-1, -1), (0, 0), (-1, -1)),
+            ((1, -1), (-1, 0), (0, -1)),
+            ((-1, 1), (0, -1), (-1, 0)),
+            ((1, 1), (-1, -1), (0, 0)),
+        )
+        found = tile is not None
+        for (dx, dy), target, source in halo:
+            neighbour = tiles.get((tx + dx, ty + dy))
+            if neighbour is not None:
+                padded[target] = neighbour[source]
+                found = True
+
+        if not found or (tile is None and not padded.any()):
+            return None
+        return padded
+
+    def _step_parallel(self, padded_tiles: dict) -> dict:
+        """
+        Step padded tiles across the tile pool, in one batch per process.
+
+        Raises:
+            TimeoutError: If the tile pool takes longer than TILE_TIMEOUT, which restarts it
+        """
+        keys = list(padded_tiles)
+        batches = [keys[index::self.max_workers] for index in range(self.max_workers)]
+        packed_batches = [(batch, [np.packbits(padded_tiles[key]).tobytes() for key in batch]) for batch in batches if batch]
+        try:
+            executor = get_executor(self.max_workers)
+            futures = [(batch, executor.submit(step_packed_tiles, packed, self.rule)) for batch, packed in packed_batches]
+        except BrokenProcessPool:
+            # A crashed process breaks the whole pool, start a fresh one for this and later generations
+            logger.error("Tile pool is broken, restarting it")
+            shutdown_executor()
+            executor = get_executor(self.max_workers)
+            futures = [(batch, executor.submit(step_packed_tiles, packed, self.rule)) for batch, packed in packed_batches]
+
+        done, pending = wait([future for _, future in futures], timeout=TILE_TIMEOUT, return_when=FIRST_EXCEPTION)
+        if pending:
+            # Also drops a pool that is stuck or broken, later generations start a fresh one
+            shutdown_executor()
+            if not any(future.exception() for future in done):
+                raise TimeoutError(f"Tile pool took longer than {TILE_TIMEOUT}s to step {len(keys)} tiles")
+
+        new_tiles = {}
+        for batch, future in futures:
+            for key, packed in zip(batch, future.result()):
+                bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=TILE_SIZE * TILE_SIZE)
+                new_tiles[key] = bits.reshape(TILE_SIZE, TILE_SIZE).astype(bool)
+        return new_tiles
+
+    def _to_set(self, key: tuple[int, int], xs, ys) -> set[tuple[int, int]]:
+        """Convert indices within a tile into a set of grid coordinates."""
+        origin_x = key[0] * TILE_SIZE
+        origin_y = key[1] * TILE_SIZE
+        return set(zip((xs + origin_x).tolist(), (ys + origin_y).tolist()))
@@ -0,0 +1,93 @@
+"""
+Viewport clipping of simulation output.
+
+Clients only draw a finite window of the grid, while debris such as gliders
+can travel thousands of cells away from it. When a request names a viewport,
+each generation only carries the cells inside it, plus a small summary of
+what is outside (how many cells, and their bounding box), so payloads stay
+bounded by the viewport's area however far a pattern spreads.
+"""
+
+import logging
+from typing import NamedTuple
+
+logger = logging.getLogger('playground.game_of_life.viewport')
+
+
+class Viewport(NamedTuple):
+    """A rectangle of cells, bounds included."""
+
+    min_x: int
+    min_y: int
+    max_x: int
+    max_y: int
+
+    @classmethod
+    def from_dict(cls, data) -> 'Viewport':
+        """
+        Build a viewport from its API form, {'x', 'y', 'width', 'height'} with (x, y) the top-left cell.
+
+        Raises:
+            ValueError: If a field is missing or not an integer, or the viewport is empty
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Viewport must be an object with x, y, width and height")
+        try:
+            x_pos, y_pos, width, height = (int(data[field]) for field in ('x', 'y', 'width', 'height'))
+        except (KeyError, ValueError, TypeError):
+            raise ValueError("Viewport must have integer x, y, width and height")
+        if width < 1 or height < 1:
+            raise ValueError("Viewport width and height must be at least 1")
+        return cls(x_pos, y_pos, x_pos + width - 1, y_pos + height - 1)
+
+    @property
+    def area(self) -> int:
+        return (self.max_x - self.min_x + 1) * (self.max_y - self.min_y + 1)
+
+    def clip(self, cells) -> list[tuple[int, int]]:
+        """Return the cells inside the viewport."""
+        min_x, min_y, max_x, max_y = self
+        return [(x_pos, y_pos) for x_pos, y_pos in cells if min_x <= x_pos <= max_x and min_y <= y_pos <= max_y]
+
+    def clip_with_summary(self, cells) -> tuple[list[tuple[int, int]], dict]:
+        """
+        Split cells into those inside the viewport and a summary of the others, in one pass.
+
+        Returns:
+            Tuple of (cells inside the viewport, dict with the 'population' and
+            'bounding_box' ([min_x, min_y, max_x, max_y], or None) of the cells outside)
+        """
+        min_x, min_y, max_x, max_y = self
+        inside = []
+        outside = 0
+        box = None
+        for x_pos, y_pos in cells:
+            if min_x <= x_pos <= max_x and min_y <= y_pos <= max_y:
+                inside.append((x_pos, y_pos))
+                continue
+
+            outside += 1
+            if box is None:
+                box = [x_pos, y_pos, x_pos, y_pos]
+            else:
+                if x_pos < box[0]:
+                    box[0] = x_pos
+                elif x_pos > box[2]:
+                    box[2] = x_pos
+                if y_pos < box[1]:
+                    box[1] = y_pos
+                elif y_pos > box[3]:
+                    box[3] = y_pos
+        return inside, {'population': outside, 'bounding_box': box}
+
+    def clip_steps(self, steps, summaries: list):
+        """
+        Clip (cells, births, deaths) steps, appending each generation's off-screen summary to summaries.
+
+        Births and deaths outside the viewport are dropped as well, so delta frames
+        encoded from the clipped steps decode to the clipped generations.
+        """
+        for cells, births, deaths in steps:
+            inside, summary = self.clip_with_summary(cells)
+            summaries.append(summary)
+            yield inside, self.clip(births), self.clip(deaths)
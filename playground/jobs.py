@@ -0,0 +1,149 @@
+"""
+Background simulation jobs.
+
+Jobs are rows of the SimulationJob model in the project's database, so no
+broker is needed: the web process inserts pending jobs, and the worker
+started with the run_simulation_worker management command claims them one
+at a time, runs the engine and writes progress back to the same row.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .game_of_life.cycles import CycleDetector
+from .game_of_life.engine import iter_game_of_life_steps
+from .game_of_life.generation import Generation
+from .game_of_life.rules import CONWAY, Rule, parse_rule
+from .game_of_life.serialization import decode_cells, encode_cells
+from .models import SimulationJob
+
+logger = logging.getLogger('playground.jobs')
+
+# Seconds between two progress updates of a running job
+PROGRESS_INTERVAL = 1.0
+
+# Seconds between two checkpoints of a running job's alive cells
+CHECKPOINT_INTERVAL = 30.0
+
+# Running jobs without a heartbeat for this long belong to a dead worker and are queued again
+STALE_AFTER = timedelta(minutes=2)
+
+# Longest cycle looked for by jobs, which keeps the memory of long runs flat
+JOB_MAX_PERIOD = 1000
+
+
+def submit_job(cells, max_generations: int, rule: Rule = CONWAY) -> SimulationJob:
+    """Queue a simulation of cells under rule for up to max_generations generations."""
+    job = SimulationJob.objects.create(
+        initial_cells=encode_cells(cells, 'rle', rule),
+        max_generations=max_generations,
+        rule=rule.rulestring,
+        population=len(cells),
+    )
+    logger.info(f"Queued simulation job {job.id} with {len(cells)} cells for {max_generations} generations under {rule.rulestring}")
+    return job
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Queue again the running jobs whose worker stopped sending heartbeats.
+
+    Returns:
+        Number of jobs queued again
+    """
+    stale = SimulationJob.objects.filter(
+        status=SimulationJob.Status.RUNNING,
+        heartbeat_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status=SimulationJob.Status.PENDING)
+    if stale:
+        logger.warning(f"Queued {stale} stale simulation jobs again")
+    return stale
+
+
+def claim_next_job() -> SimulationJob | None:
+    """
+    Take the oldest pending job and mark it as running.
+
+    The status is switched with a conditional update, so when several
+    workers race for the same job only one of them gets it.
+    """
+    while True:
+        job = SimulationJob.objects.filter(status=SimulationJob.Status.PENDING).first()
+        if job is None:
+            return None
+
+        now = timezone.now()
+        claimed = SimulationJob.objects.filter(pk=job.pk, status=SimulationJob.Status.PENDING).update(
+            status=SimulationJob.Status.RUNNING,
+            started_at=job.started_at or now,
+            heartbeat_at=now,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def run_job(job: SimulationJob) -> None:
+    """
+    Run a claimed job to completion, writing progress and checkpoints as it goes.
+
+    Jobs that were interrupted resume from their last checkpoint.
+    """
+    if job.alive_cells is not None:
+        cells = decode_cells(job.alive_cells)
+        # Progress may have gone past the checkpoint before the job was interrupted
+        start_generation = job.checkpoint_generation
+        logger.info(f"Resuming simulation job {job.id} at generation {start_generation}")
+    else:
+        cells = decode_cells(job.initial_cells)
+        start_generation = 0
+        logger.info(f"Starting simulation job {job.id}")
+
+    queryset = SimulationJob.objects.filter(pk=job.pk)
+    rule = parse_rule(job.rule)
+    detector = CycleDetector(cells, max_period=JOB_MAX_PERIOD)
+    remaining = job.max_generations - start_generation
+    generation = start_generation
+    # The engine's own set may already be one generation further when the run stops on a cycle
+    final_cells = list(cells)
+    last_progress = last_checkpoint = time.monotonic()
+
+    try:
+        for generation, (cells, _, _) in enumerate(iter_game_of_life_steps(cells, remaining, settings.GAME_OF_LIFE_ENGINE, detector=detector, rule=rule), start=start_generation + 1):
+            final_cells = Generation.from_cells(cells)
+            now = time.monotonic()
+            if now - last_checkpoint >= CHECKPOINT_INTERVAL:
+                queryset.update(
+                    generation=generation,
+                    population=len(final_cells),
+                    alive_cells=encode_cells(final_cells, 'rle', rule),
+                    checkpoint_generation=generation,
+                    heartbeat_at=timezone.now(),
+                )
+                last_checkpoint = last_progress = now
+            elif now - last_progress >= PROGRESS_INTERVAL:
+                queryset.update(generation=generation, population=len(cells), heartbeat_at=timezone.now())
+                last_progress = now
+    except Exception as e:
+        logger.exception(f"Simulation job {job.id} failed")
+        queryset.update(status=SimulationJob.Status.FAILED, error=str(e), finished_at=timezone.now())
+        return
+
+    # Cycle starts are counted like generations, from 1 for the pattern after one step
+    cycle_start = start_generation + detector.cycle_start + 1 if detector.period is not None else None
+    queryset.update(
+        status=SimulationJob.Status.DONE,
+        generation=generation,
+        population=len(final_cells),
+        alive_cells=encode_cells(final_cells, 'rle', rule),
+        checkpoint_generation=generation,
+        period=detector.period,
+        cycle_start=cycle_start,
+        finished_at=timezone.now(),
+        heartbeat_at=timezone.now(),
+    )
+    logger.info(f"Simulation job {job.id} done at generation {generation}")
@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from playground.game_of_life.benchmark import DEFAULT_GENERATIONS, DEFAULT_REGRESSION_THRESHOLD, DEFAULT_REPEAT, compare_results, run_benchmarks
+from playground.game_of_life.engine import ENGINES
+
+
+class Command(BaseCommand):
+    help = "Benchmark the Game of Life engines and serialization formats on a fixed corpus"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Write the results as JSON to this path")
+        parser.add_argument('--baseline', help="JSON results of an earlier run to check for regressions")
+        parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD, help="Relative slowdown or memory growth over the baseline that fails the run")
+        parser.add_argument('--generations', type=int, default=DEFAULT_GENERATIONS, help="Maximum generations simulated per pattern")
+        parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Timed runs per measurement, the fastest one is kept")
+        parser.add_argument('--engine', action='append', choices=list(ENGINES), help="Engine to benchmark, can be repeated (default: all available)")
+        parser.add_argument('--pattern', action='append', help="Corpus pattern to benchmark, can be repeated (default: all)")
+
+    def handle(self, *args, **options):
+        if options['generations'] < 1 or options['repeat'] < 1:
+            raise CommandError("--generations and --repeat must be at least 1")
+
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline'], 'r', encoding='utf-8') as file:
+                    baseline = json.load(file)
+            except (OSError, json.JSONDecodeError) as e:
+                raise CommandError(f"Cannot read baseline results: {e}")
+
+        try:
+            results = run_benchmarks(options['generations'], options['repeat'], options['engine'], options['pattern'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for result in results['engines']:
+            self.stdout.write(
+                f"{result['pattern']:<24} {result['engine']:<12} {result['generations']:>6} generations "
+                f"{result['generations_per_second'] or 0:>10.1f} gen/s {result['peak_memory_bytes'] / 1024:>10.0f} KiB peak"
+            )
+        for result in results['serialization']:
+            self.stdout.write(
+                f"{result['pattern']:<24} {result['format'] + '/' + result['encoding']:<16} "
+                f"{result['seconds'] * 1000:>10.2f} ms {result['bytes']:>10} bytes"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(f"Wrote benchmark results to {options['output']}")
+
+        if baseline is not None:
+            try:
+                regressions = compare_results(baseline, results, options['threshold'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            if regressions:
+                for regression in regressions:
+                    self.stderr.write(regression)
+                raise CommandError(f"{len(regressions)} benchmark regressions over {options['threshold']:.0%}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions over {options['threshold']:.0%} against {options['baseline']}"))
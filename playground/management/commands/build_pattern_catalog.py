@@ -0,0 +1,27 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from playground.game_of_life.catalog import PATTERNS_PATH, build_catalog
+from playground.game_of_life.delta import DEFAULT_KEYFRAME_INTERVAL
+
+
+class Command(BaseCommand):
+    help = "Precompute the simulations of the preset Game of Life patterns"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.GAME_OF_LIFE_CATALOG_PATH, help="Path of the catalog artifact")
+        parser.add_argument('--generations', type=int, default=1000, help="Generations simulated per pattern")
+        parser.add_argument('--keyframe-interval', type=int, default=DEFAULT_KEYFRAME_INTERVAL, help="Generations between two keyframes of the delta frames")
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        artifact = build_catalog(PATTERNS_PATH.read_bytes(), options['generations'], options['keyframe_interval'])
+
+        # Write next to the target and swap it in, so running workers never map a half-written file
+        temporary = output.with_name(output.name + '.tmp')
+        temporary.write_bytes(artifact)
+        os.replace(temporary, output)
+        self.stdout.write(f"Wrote pattern catalog to {output} ({len(artifact)} bytes)")
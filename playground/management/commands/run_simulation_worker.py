@@ -0,0 +1,38 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from playground.jobs import claim_next_job, requeue_stale_jobs, run_job
+
+logger = logging.getLogger('playground.jobs')
+
+
+class Command(BaseCommand):
+    help = "Run queued Game of Life simulation jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds to wait between checks for new jobs")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty instead of waiting for new jobs")
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval']
+        self.stdout.write("Simulation worker started")
+
+        try:
+            while True:
+                requeue_stale_jobs()
+                job = claim_next_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                self.stdout.write(f"Running simulation job {job.id}")
+                run_job(job)
+        except KeyboardInterrupt:
+            # Running jobs keep their last checkpoint and are picked up again once they go stale
+            logger.info("Simulation worker interrupted")
+
+        self.stdout.write("Simulation worker stopped")
@@ -0,0 +1,37 @@
+# Generated by Django 6.1.2 on 2026-10-18 15:52
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimulationJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=16)),
+                ('initial_cells', models.JSONField()),
+                ('max_generations', models.PositiveIntegerField()),
+                ('generation', models.PositiveIntegerField(default=0)),
+                ('population', models.PositiveIntegerField(default=0)),
+                ('alive_cells', models.JSONField(blank=True, null=True)),
+                ('period', models.PositiveIntegerField(blank=True, null=True)),
+                ('cycle_start', models.PositiveIntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playground', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationjob',
+            name='rule',
+            field=models.CharField(default='B3/S23', max_length=24),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.1.2 on 2026-10-18 17:21
+
+from django.db import migrations, models
+
+
+def label_existing_checkpoints(apps, schema_editor):
+    # Checkpoints of existing jobs were labelled with their progress, the closest known generation
+    SimulationJob = apps.get_model('playground', 'SimulationJob')
+    SimulationJob.objects.filter(alive_cells__isnull=False).update(checkpoint_generation=models.F('generation'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playground', '0002_simulationjob_rule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simulationjob',
+            name='checkpoint_generation',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(label_existing_checkpoints, migrations.RunPython.noop),
+    ]
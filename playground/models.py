@@ -1,2 +1,69 @@
+import uuid
 
-# Create your models here.
+from django.db import models
+
+
+class SimulationJob(models.Model):
+    """
+    A Game of Life simulation too long for a request, run in the background by the
+    simulation worker (see the run_simulation_worker management command).
+
+    While the job runs, alive_cells holds the latest checkpoint, so a job interrupted
+    by a worker restart resumes from there instead of from the initial pattern.
+    Once the job is done, it holds the final generation.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING, db_index=True)
+
+    # Patterns are stored RLE encoded, which keeps large soups small
+    initial_cells = models.JSONField()
+    max_generations = models.PositiveIntegerField()
+    # Canonical B/S rulestring the pattern evolves under
+    rule = models.CharField(max_length=24, default='B3/S23')
+
+    # Progress: the latest generation reached and its population
+    generation = models.PositiveIntegerField(default=0)
+    population = models.PositiveIntegerField(default=0)
+    # Latest checkpoint, written less often than progress, and the generation it holds
+    alive_cells = models.JSONField(null=True, blank=True)
+    checkpoint_generation = models.PositiveIntegerField(default=0)
+    period = models.PositiveIntegerField(null=True, blank=True)
+    cycle_start = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Updated by the worker while the job runs, so jobs of a dead worker can be picked up again
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"Simulation job {self.id} ({self.status})"
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+    def to_status_dict(self) -> dict:
+        """Return the job's progress, as sent by the status endpoints."""
+        return {
+            'job_id': str(self.id),
+            'status': self.status,
+            'generation': self.generation,
+            'max_generations': self.max_generations,
+            'rule': self.rule,
+            'population': self.population,
+            'period': self.period,
+            'cycle_start': self.cycle_start,
+            'error': self.error or None,
+        }
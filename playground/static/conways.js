@@ -19,6 +19,8 @@ let pan = { x: 0, y: 0 };  // Current pan/offset position of the grid
 let running = false;       // Whether simulation is running or paused
 let animationTimeout = null; // For controlling animation delay
 let animationDelay = 100;  // Default animation delay in ms
+const KEYFRAME_INTERVAL = 50; // Generations between full keyframes in the delta-encoded stream
+const MAX_VIEWPORT_AREA = 1 << 20; // Largest viewport the server accepts, in cells (MAX_VIEWPORT_AREA in views.py)
 
 // Create tooltip element to show cell coordinates
 const tooltip = document.createElement('div');
@@ -36,6 +38,9 @@ document.body.appendChild(tooltip);
 // Set to track which cells are alive (using string keys like "x,y")
 let aliveCells = new Set();
 
+// Slug of the preset pattern on the grid, while it is unchanged: its generations are precomputed by the server
+let loadedPreset = null;
+
 // Convert x,y coordinates to string keys for the Set
 function posToKey(x, y) {
   return `${x},${y}`;
@@ -125,8 +130,27 @@ function getMouseCell(evt) {
   return [Math.floor(x / CELL_SIZE), Math.floor(y / CELL_SIZE)];
 }
 
+// Cells visible on the canvas, plus up to one screen of margin on every side so panning during
+// playback still finds cells; the server only sends the cells inside this rectangle. Large screens
+// zoomed out get a narrower margin, keeping the rectangle within MAX_VIEWPORT_AREA (and screens
+// past it, such as 8K at the smallest cell size, only get the middle of the screen)
+function getViewport() {
+  const cols = Math.ceil(width / CELL_SIZE);
+  const rows = Math.ceil(height / CELL_SIZE);
+  const scale = Math.min(3, Math.sqrt(MAX_VIEWPORT_AREA / (cols * rows)));
+  const viewportCols = Math.max(1, Math.floor(cols * scale));
+  const viewportRows = Math.max(1, Math.floor(rows * scale));
+  return {
+    x: -Math.floor(pan.x / CELL_SIZE) - Math.floor((viewportCols - cols) / 2),
+    y: -Math.floor(pan.y / CELL_SIZE) - Math.floor((viewportRows - rows) / 2),
+    width: viewportCols,
+    height: viewportRows
+  };
+}
+
 // Toggle a cell between alive and dead states
 function toggleCell(x, y) {
+  loadedPreset = null;
   const key = posToKey(x, y);
   if (aliveCells.has(key)) {
     aliveCells.delete(key);
@@ -144,6 +168,41 @@ function updateGrid(cellsArray) {
   drawGrid();
 }
 
+// Apply a delta frame (births and deaths since the previous generation) to the grid
+function applyDelta(frame) {
+  frame.deaths.forEach(([x, y]) => aliveCells.delete(posToKey(x, y)));
+  frame.births.forEach(([x, y]) => aliveCells.add(posToKey(x, y)));
+}
+
+// Apply a frame from the server, either a keyframe with all alive cells or a delta
+function applyFrame(frame) {
+  if (frame.alive_cells) {
+    updateGrid(frame.alive_cells);
+  } else {
+    applyDelta(frame);
+    drawGrid();
+  }
+}
+
+// Rebuild generation `index` from the nearest keyframe at or before it.
+// `keyframes` lists the indexes of the frames carrying all alive cells, in order: every chunk
+// restarts its keyframes at its own first frame, so they are not always multiples of the interval
+function restoreGeneration(frames, keyframes, index) {
+  let keyframe = keyframes[0];
+  for (let i = keyframes.length - 1; i >= 0; i--) {
+    if (keyframes[i] <= index) {
+      keyframe = keyframes[i];
+      break;
+    }
+  }
+  aliveCells = new Set();
+  frames[keyframe].alive_cells.forEach(([x, y]) => aliveCells.add(posToKey(x, y)));
+  for (let i = keyframe + 1; i <= index; i++) {
+    applyDelta(frames[i]);
+  }
+  drawGrid();
+}
+
 // Clear all cells from the grid
 function clearGrid() {
   // Stop simulation if running
@@ -153,13 +212,14 @@ function clearGrid() {
   
   // Clear all alive cells
   aliveCells = new Set();
+  loadedPreset = null;
   
   // Redraw the grid
   drawGrid();
   console.log("Grid cleared");
 }
 
-// Handle chunked game of life simulation
+// Handle streamed game of life simulation
 function startSimulation() {
   if (running) return;
   
@@ -173,61 +233,187 @@ function startSimulation() {
   delaySlider.disabled = true;
   delayInput.disabled = true;
   
-  // Prepare request data - the current alive cells
+  // Prepare request data - the current alive cells, streamed back one delta-encoded generation per line
   const requestData = {
-    alive_cells: getAliveCellsArray()
+    alive_cells: getAliveCellsArray(),
+    stream: true,
+    format: 'delta',
+    keyframe_interval: KEYFRAME_INTERVAL,
+    viewport: getViewport()
   };
   
   console.log("Starting simulation with cells:", requestData.alive_cells);
-  
-  // Make the API request to get all generations
-  fetch('/playground/conways/stream/', {
-    method: 'POST',
-    headers: {
-      'Content-Type': 'application/json'
-    },
-    body: JSON.stringify(requestData)
-  })
-  .then(response => {
-    if (!response.ok) {
-      throw new Error(`HTTP error: ${response.status}`);
-    }
-    return response.json();
-  })
-  .then(data => {
+
+  // The grid moves on from the preset as soon as it starts playing
+  const preset = loadedPreset;
+  loadedPreset = null;
+
+  // Frames received so far, the indexes of their keyframes, and the summary sent once the stream is complete
+  const generations = [];
+  const keyframes = [];
+  let summary = null;
+  let currentGeneration = 0;
+
+  function finishPlayback() {
+    console.log("Simulation complete or stopped");
+    running = false;
+    delaySlider.disabled = false;
+    delayInput.disabled = false;
+  }
+
+  function playNextGeneration() {
     if (!running) {
-      console.log("Simulation stopped before processing data");
+      finishPlayback();
       return;
     }
+
+    if (currentGeneration >= generations.length) {
+      if (!summary) {
+        // Playback caught up with the server, wait for the next generation to arrive
+        animationTimeout = setTimeout(playNextGeneration, animationDelay);
+        return;
+      }
+
+      // Patterns that settle into a cycle are looped locally from the start of the cycle
+      if (summary.period && generations.length > 0) {
+        restoreGeneration(generations, keyframes, summary.cycle_start);
+        currentGeneration = summary.cycle_start + 1;
+        animationTimeout = setTimeout(playNextGeneration, animationDelay);
+        return;
+      } else {
+        finishPlayback();
+        return;
+      }
+    }
     
-    console.log("Received generations data:", data);
+    // Update grid with current generation
+    applyFrame(generations[currentGeneration]);
     
-    // Process the generations sequentially with animation delay
-    const generations = data.generations;
-    let currentGeneration = 0;
-      function playNextGeneration() {
-      if (!running || currentGeneration >= generations.length) {
-        console.log("Simulation complete or stopped");
-        running = false;
-        delaySlider.disabled = false;
-        delayInput.disabled = false;
-        return;
+    currentGeneration++;
+    
+    // Schedule next generation
+    animationTimeout = setTimeout(() => {
+      playNextGeneration();
+    }, animationDelay);
+  }
+  
+  // Append a received frame, remembering where the keyframes are
+  function addGeneration(frame) {
+    if (frame.alive_cells) {
+      keyframes.push(generations.length);
+    }
+    generations.push(frame);
+  }
+
+  // Read one chunk of the simulation, returning its summary line
+  async function readChunk(body) {
+    const response = await fetch('/playground/conways/stream/', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify(body)
+    });
+    if (!response.ok) {
+      throw new Error(`HTTP error: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let chunkSummary = null;
+
+    while (running) {
+      const { done, value } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop(); // Keep the incomplete last line for the next chunk
+
+      lines.forEach(line => {
+        if (!line) return;
+        const message = JSON.parse(line);
+        if (message.done) {
+          chunkSummary = message;
+          console.log("Simulation summary:", chunkSummary);
+        } else {
+          addGeneration(message);
+        }
+      });
+
+      // Start playing as soon as the first generation arrives
+      if (!playbackStarted && generations.length > 0) {
+        playbackStarted = true;
+        playNextGeneration();
       }
-      
-      // Update grid with current generation
-      updateGrid(generations[currentGeneration]);
-      
-      currentGeneration++;
-      
-      // Schedule next generation
-      animationTimeout = setTimeout(() => {
+    }
+
+    if (!running) {
+      reader.cancel();
+    }
+    return chunkSummary;
+  }
+
+  // Read the precomputed generations of a preset, returning their summary, or null to simulate it instead
+  async function readPresetFrames(slug) {
+    try {
+      const response = await fetch(`/playground/conways/patterns/${slug}/frames/`);
+      if (!response.ok) return null;
+
+      const data = await response.json();
+
+      data.generations.forEach(addGeneration);
+      if (!playbackStarted && generations.length > 0) {
+        playbackStarted = true;
         playNextGeneration();
-      }, animationDelay);
+      }
+      console.log("Loaded precomputed generations of preset:", slug);
+      return data;
+    } catch (error) {
+      console.warn('Failed to load precomputed generations, simulating instead:', error);
+      return null;
     }
-    
-    // Start playing generations
-    playNextGeneration();
-  })  .catch(error => {
+  }
+
+  // Make the API request and keep following continuation cursors while the pattern evolves
+  let playbackStarted = false;
+  (async () => {
+    let chunkSummary = preset ? await readPresetFrames(preset) : null;
+    if (!chunkSummary && running) {
+      chunkSummary = await readChunk(requestData);
+    }
+    while (running && chunkSummary && chunkSummary.next_cursor) {
+      chunkSummary = await readChunk({
+        cursor: chunkSummary.next_cursor,
+        stream: true,
+        format: 'delta',
+        keyframe_interval: KEYFRAME_INTERVAL,
+        viewport: requestData.viewport
+      });
+    }
+
+    if (!running) {
+      console.log("Simulation stopped before the stream completed");
+      return;
+    }
+
+    if (chunkSummary) {
+      // Cycle starts are relative to the chunk they were found in
+      summary = {
+        ...chunkSummary,
+        cycle_start: chunkSummary.period ? chunkSummary.start_generation + chunkSummary.cycle_start : null
+      };
+    } else {
+      // The stream ended without a summary, play what was received and stop
+      summary = { period: null, cycle_start: null };
+    }
+    if (!playbackStarted) {
+      playbackStarted = true;
+      playNextGeneration();
+    }
+  })()
+  .catch(error => {
     console.error('Fetch error:', error);
     running = false;
     delaySlider.disabled = false;
@@ -510,24 +696,28 @@ function displayPatterns(patterns) {
     const patternDiv = document.createElement('div');
     patternDiv.className = 'pattern-item';
     
-    // Create pattern preview canvas
-    const canvas = document.createElement('canvas');
-    canvas.width = 100;
-    canvas.height = 60;
-    canvas.className = 'pattern-preview';
-    
-    drawPatternPreview(canvas, pattern.cells);
+    // Use the server's thumbnail when the patterns come from the precomputed catalog
+    const preview = document.createElement(pattern.thumbnail ? 'img' : 'canvas');
+    preview.width = 100;
+    preview.height = 60;
+    preview.className = 'pattern-preview';
+    if (pattern.thumbnail) {
+      preview.src = pattern.thumbnail;
+      preview.alt = pattern.name;
+    } else {
+      drawPatternPreview(preview, pattern.cells);
+    }
     
     patternDiv.innerHTML = `
       <h3>${pattern.name}</h3>
       <div class="pattern-preview-container"></div>
       <p>${pattern.description}</p>
-      <button onclick="loadPattern('${pattern.name}', ${JSON.stringify(pattern.cells).replace(/"/g, '&quot;')})">Load Pattern</button>
+      <button onclick="loadPattern('${pattern.name}', ${JSON.stringify(pattern.cells).replace(/"/g, '&quot;')}, '${pattern.slug || ''}')">Load Pattern</button>
     `;
     
-    // Insert canvas into the preview container
+    // Insert the preview into its container
     const previewContainer = patternDiv.querySelector('.pattern-preview-container');
-    previewContainer.appendChild(canvas);
+    previewContainer.appendChild(preview);
     
     patternsList.appendChild(patternDiv);
   });
@@ -605,9 +795,10 @@ function drawPatternPreview(canvas, cells) {
 }
 
 // Load a specific pattern onto the grid
-function loadPattern(patternName, cells) {
+function loadPattern(patternName, cells, slug) {
   // Clear the grid first
   clearGrid();
+  loadedPreset = slug || null;
   
   // Center the view
   centerGrid();
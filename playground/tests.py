@@ -1,2 +1,218 @@
+import json
+import random
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from . import views
+from .game_of_life.continuation import CURSOR_KEY_PREFIX
+from .game_of_life.cycles import CycleDetector
+from .game_of_life.dense import NUMPY_AVAILABLE
+from .game_of_life.engine import ENGINES, create_engine, play_game_of_life
+from .game_of_life.hashlife import advance_game_of_life
+from .game_of_life.pool import SimulationPool
+from .game_of_life.rules import CONWAY, parse_rule
+from .game_of_life.search import summarize_pattern
+from .game_of_life.serialization import bounding_box, decode_cells, encode_cells
+from .jobs import claim_next_job, run_job, submit_job
+from .models import SimulationJob
+
+RULES = [CONWAY, parse_rule('highlife'), parse_rule('seeds'), parse_rule('B3678/S34678'), parse_rule('B2/S23')]
+
+# A blinker stops on a cycle after two generations, where engines that reuse their set have already stepped again
+BLINKER = [(0, 1), (1, 1), (2, 1)]
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+def available_engines() -> list[str]:
+    """Names of the engines that can run here, without the sparse reference engine."""
+    return [name for name in ENGINES if name != 'sparse' and (NUMPY_AVAILABLE or name not in ('dense', 'tiled'))]
+
+
+def soup(seed: int, size: int = 20, density: float = 0.4) -> list[tuple[int, int]]:
+    rng = random.Random(seed)
+    return [(x, y) for x in range(size) for y in range(size) if rng.random() < density]
+
+
+def step(cells, generations: int, rule=CONWAY) -> set[tuple[int, int]]:
+    """Step cells with the sparse reference engine, ignoring cycles."""
+    board = create_engine(cells, 'sparse', rule)
+    for _ in range(generations):
+        board.step()
+    return set(board.cells())
+
+
+class EngineEquivalenceTests(SimpleTestCase):
+    """Every engine must compute the same generations as the sparse reference engine."""
+
+    def test_engines_match_sparse_engine(self):
+        for rule in RULES:
+            for seed in range(3):
+                cells = soup(seed)
+                expected = [set(generation) for generation in play_game_of_life(cells, 40, 'sparse', rule=rule)]
+                for engine in available_engines():
+                    with self.subTest(rule=rule.rulestring, seed=seed, engine=engine):
+                        generations = play_game_of_life(cells, 40, engine, rule=rule)
+                        self.assertEqual([set(generation) for generation in generations], expected)
+
+    def test_hashlife_matches_sparse_engine(self):
+        for rule in RULES:
+            for generations in (0, 1, 7, 32, 45):
+                with self.subTest(rule=rule.rulestring, generations=generations):
+                    cells = soup(generations)
+                    self.assertEqual(set(advance_game_of_life(cells, generations, rule=rule)), step(cells, generations, rule))
+
+    def test_hashlife_jumps_glider_far_ahead(self):
+        generations = 4 * 10**6
+        offset = generations // 4
+        self.assertEqual(set(advance_game_of_life(GLIDER, generations)), {(x + offset, y + offset) for x, y in GLIDER})
+
+
+class CycleStopTests(TestCase):
+    """The final state of a run stopped by a cycle is the last generation yielded, whatever the engine."""
+
+    def test_summarize_pattern_final_state(self):
+        for engine in available_engines():
+            with self.subTest(engine=engine):
+                expected = play_game_of_life(BLINKER, 100, engine, CycleDetector(BLINKER))[-1]
+                summary = summarize_pattern(BLINKER, 100, engine=engine)
+                self.assertEqual(summary['outcome'], 'cycle')
+                self.assertEqual(summary['period'], 2)
+                self.assertEqual(summary['final_population'], len(expected))
+                self.assertEqual(summary['bounding_box'], list(bounding_box(expected)))
+
+    def test_job_final_state(self):
+        for engine in available_engines():
+            with self.subTest(engine=engine), self.settings(GAME_OF_LIFE_ENGINE=engine):
+                job = submit_job(BLINKER, 100)
+                run_job(claim_next_job())
+                job.refresh_from_db()
+                self.assertEqual(job.status, SimulationJob.Status.DONE)
+                self.assertEqual(job.period, 2)
+                self.assertEqual(set(decode_cells(job.alive_cells)), step(BLINKER, job.generation))
+
+    def test_job_resumes_from_its_checkpoint(self):
+        cells = soup(1)
+        job = submit_job(cells, 100)
+        # Interrupted after progress reached generation 30, with its last checkpoint at generation 10
+        SimulationJob.objects.filter(pk=job.pk).update(
+            generation=30,
+            alive_cells=encode_cells(step(cells, 10), 'rle'),
+            checkpoint_generation=10,
+        )
+        run_job(claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, SimulationJob.Status.DONE)
+        self.assertEqual(set(decode_cells(job.alive_cells)), step(cells, job.generation))
+
+
+class AdmissionViewTests(TestCase):
+    """Simulations over the limits are turned away before they run."""
+
+    def setUp(self):
+        # The throttle counts requests in the default cache
+        cache.clear()
+        views.simulation_cache.clear()
+        pool = mock.patch.object(views, 'simulation_pool', SimulationPool(max_workers=0))
+        pool.start()
+        self.addCleanup(pool.stop)
+
+    def post(self, **data):
+        return self.client.post(reverse('playground:stream'), json.dumps(data), content_type='application/json')
+
+    def test_admitted_simulation_releases_its_ticket(self):
+        response = self.post(alive_cells=GLIDER)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(views.admission.in_flight, 0)
+
+    def test_pattern_too_large(self):
+        with mock.patch.object(views.admission, 'max_population', 4):
+            response = self.post(alive_cells=GLIDER)
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['error'], 'Pattern is too large')
+
+    def test_simulation_too_expensive(self):
+        with mock.patch.object(views.admission, 'request_budget', 1):
+            response = self.post(alive_cells=GLIDER)
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['error'], 'Simulation is too expensive')
+
+    def test_overloaded(self):
+        with mock.patch.object(views.admission, 'in_flight', views.admission.process_budget):
+            for data in ({}, {'stream': True}, {'mode': 'final', 'generations': 100}):
+                with self.subTest(**data):
+                    response = self.post(alive_cells=GLIDER, **data)
+                    self.assertEqual(response.status_code, 429)
+
+    def test_final_state_too_expensive(self):
+        with mock.patch.object(views.admission, 'request_budget', 1000):
+            response = self.post(alive_cells=GLIDER, mode='final', generations=10**9)
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['error'], 'Simulation is too expensive')
+        self.assertEqual(views.admission.in_flight, 0)
+
+    def test_final_state_jump(self):
+        response = self.post(alive_cells=GLIDER, mode='final', generations=10**9)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['population'], len(GLIDER))
+        self.assertEqual(views.admission.in_flight, 0)
+
+    def test_final_state_out_of_time(self):
+        with self.settings(GAME_OF_LIFE_TIME_BUDGET=0):
+            response = self.post(alive_cells=soup(0, 60), mode='final', generations=1000)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(views.admission.in_flight, 0)
+
+    def test_search_overloaded(self):
+        with mock.patch.object(views.admission, 'in_flight', views.admission.process_budget):
+            response = self.client.post(reverse('playground:search'), json.dumps({'patterns': [GLIDER]}), content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+
+    def test_search_out_of_time(self):
+        with self.settings(GAME_OF_LIFE_SEARCH_TIME_BUDGET=0):
+            response = self.client.post(reverse('playground:search'), json.dumps({'patterns': [GLIDER, BLINKER]}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['truncated'])
+        self.assertEqual(response.json()['results'], [None, None])
+        self.assertEqual(views.admission.in_flight, 0)
+
+    def test_seek_out_of_time(self):
+        views.keyframe_indexes.clear()
+        with self.settings(GAME_OF_LIFE_TIME_BUDGET=0):
+            response = self.client.post(reverse('playground:seek'), json.dumps({'alive_cells': GLIDER, 'generation': 5000}), content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(views.admission.in_flight, 0)
+
+        response = self.client.post(reverse('playground:seek'), json.dumps({'alive_cells': GLIDER, 'generation': 5000}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({tuple(cell) for cell in response.json()['alive_cells']}, step(GLIDER, 5001))
+
+
+class ContinuationTests(TestCase):
+    """Cursors continue a simulation where the previous chunk ended."""
+
+    def setUp(self):
+        cache.clear()
+        views.simulation_cache.clear()
+        pool = mock.patch.object(views, 'simulation_pool', SimulationPool(max_workers=0))
+        pool.start()
+        self.addCleanup(pool.stop)
+
+    def post(self, **data):
+        return self.client.post(reverse('playground:stream'), json.dumps(data), content_type='application/json')
+
+    def test_cursor_continues_simulation(self):
+        first = self.post(alive_cells=GLIDER).json()
+        self.assertIsNotNone(first['next_cursor'])
+
+        second = self.post(cursor=first['next_cursor']).json()
+        generations = len(first['generations'])
+        self.assertEqual(second['start_generation'], generations)
+        self.assertEqual({tuple(cell) for cell in second['generations'][0]}, step(GLIDER, generations + 1))
+
+    def test_cursor_stored_as_rle(self):
+        gliders = GLIDER + [(x + 4000, y + 4000) for x, y in GLIDER]
+        cursor = self.post(alive_cells=gliders).json()['next_cursor']
+        self.assertIn('rle', views.cursor_store.get(CURSOR_KEY_PREFIX + cursor)['cells'])
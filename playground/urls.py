@@ -1,10 +1,21 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     TryoutConwaysView,
     stream_game_of_life,
+    seek_game_of_life,
+    search_game_of_life,
+    submit_game_of_life_job,
+    get_game_of_life_job,
+    get_game_of_life_job_result,
+    stream_game_of_life_job_events,
     get_game_of_life_patterns,
+    get_game_of_life_pattern_frames,
+    render_game_of_life,
+    render_game_of_life_pattern,
     TryoutZllmView,
     generate_text_streaming_api,
+    generate_text_streaming_async_api,
     generate_text_api,
     TryoutZllmChatView,
     chat_with_zllm_api,
@@ -15,10 +26,19 @@ app_name = 'playground'
 urlpatterns = [
     path('conways/', TryoutConwaysView.as_view(), name='tryout_conways'),
     path("conways/stream/", stream_game_of_life, name="stream"),
+    path("conways/seek/", seek_game_of_life, name="seek"),
+    path("conways/search/", search_game_of_life, name="search"),
+    path("conways/jobs/", submit_game_of_life_job, name="submit_job"),
+    path("conways/jobs/<uuid:job_id>/", get_game_of_life_job, name="job"),
+    path("conways/jobs/<uuid:job_id>/events/", stream_game_of_life_job_events, name="job_events"),
+    path("conways/jobs/<uuid:job_id>/result/", get_game_of_life_job_result, name="job_result"),
     path("conways/patterns/", get_game_of_life_patterns, name="patterns"),
+    path("conways/patterns/<slug:slug>/frames/", get_game_of_life_pattern_frames, name="pattern_frames"),
+    path("conways/patterns/<slug:slug>/render/", render_game_of_life_pattern, name="pattern_render"),
+    path("conways/render/", render_game_of_life, name="render"),
     path('zllm/', TryoutZllmView.as_view(), name='tryout_zllm'),
     # path('zllm/generate_text/', generate_text_api, name='generate_text'),
-    path('zllm/generate_text_streaming/', generate_text_streaming_api, name='generate_text_streaming'),
+    path('zllm/generate_text_streaming/', generate_text_streaming_async_api if settings.ZLLM_ASYNC_STREAMING else generate_text_streaming_api, name='generate_text_streaming'),
     path('zllm/chat/', TryoutZllmChatView.as_view(), name='tryout_zllm_chat'),
     path('zllm/chat/chat_with_zllm/', chat_with_zllm_api, name='chat_with_zllm'),
 ]
@@ -1,19 +1,129 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
 from django.shortcuts import render
 from django.views import View
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
 import json
 import os
+import random
+import time
 import logging
 
+from asgiref.sync import sync_to_async
 from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.throttling import AnonRateThrottle
 from portifolio.language_utils import get_current_language, get_template_name, get_language_context
-from .game_of_life.engine import play_game_of_life
-from .zllm.service import generate_text_streaming, generate_text, chat_with_zllm
+from .game_of_life.admission import AdmissionController, Overloaded, PatternTooLarge
+from .game_of_life.cache import CachedSimulation, SimulationCache
+from .game_of_life.catalog import load_catalog, preset_patterns
+from .game_of_life.continuation import load_checkpoint, save_checkpoint
+from .game_of_life.delta import DEFAULT_KEYFRAME_INTERVAL, encode_deltas, steps_from_generations
+from .game_of_life.engine import ENGINES
+from .game_of_life.keyframes import KeyframeIndexCache
+from .game_of_life.pool import SimulationPool
+from .game_of_life.render import MAX_RENDER_SIDE, RENDER_FORMATS, render_cache_key
+from .game_of_life.rules import CONWAY, parse_rule
+from .game_of_life.search import RUNNING, random_soup
+from .game_of_life.serialization import ENCODINGS, decode_cells, encode_cells, encode_frame
+from .game_of_life.viewport import Viewport
+from .jobs import submit_job
+from .models import SimulationJob
+from .zllm.service import generate_text_streaming, generate_text_streaming_async, generate_text, chat_with_zllm
 
 logger = logging.getLogger('playground.views')
 
 ### Conway's Game of Life Views and Functions ###
+
+MAX_GENERATIONS = 1000
+
+# Limits for the "final" mode, which jumps straight to generation N with Hashlife
+MAX_FINAL_GENERATIONS = 1_000_000_000
+MAX_FINAL_POPULATION = 100_000
+
+# Output formats for generations: full lists of alive cells, or keyframes plus births/deaths
+OUTPUT_FORMATS = ('full', 'delta')
+MAX_KEYFRAME_INTERVAL = 1000
+
+# Largest viewport a request may clip its output to, in cells; bounds the cells sent per generation
+MAX_VIEWPORT_AREA = 1 << 20
+
+# Generations the streaming mode computes per pool run. Cycles are looked for within each run, so
+# this is also the longest cycle a stream detects, and it keeps a stream's memory flat.
+STREAM_CHUNK_GENERATIONS = 100
+
+if settings.GAME_OF_LIFE_ENGINE != 'auto' and settings.GAME_OF_LIFE_ENGINE not in ENGINES:
+    raise ImproperlyConfigured(f"GAME_OF_LIFE_ENGINE must be 'auto' or one of: {', '.join(ENGINES)}")
+
+# Per-process cache of simulation results, so presets and popular drawings are only simulated once
+simulation_cache = SimulationCache(
+    max_entries=settings.GAME_OF_LIFE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.GAME_OF_LIFE_CACHE_MAX_BYTES,
+)
+
+# Per-process keyframe indexes, so seeking into a pattern's timeline only steps from the nearest keyframe
+keyframe_indexes = KeyframeIndexCache(
+    max_entries=settings.GAME_OF_LIFE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.GAME_OF_LIFE_CACHE_MAX_BYTES,
+    engine=settings.GAME_OF_LIFE_ENGINE,
+)
+
+# Cost budgets shared by the simulations running in this process
+admission = AdmissionController(
+    max_population=settings.GAME_OF_LIFE_MAX_POPULATION,
+    max_area=settings.GAME_OF_LIFE_MAX_AREA,
+    request_budget=settings.GAME_OF_LIFE_REQUEST_BUDGET,
+    process_budget=settings.GAME_OF_LIFE_PROCESS_BUDGET,
+    engine=settings.GAME_OF_LIFE_ENGINE,
+)
+
+# Simulations run in separate processes so they never block the gevent hub of a web worker
+simulation_pool = SimulationPool(max_workers=settings.GAME_OF_LIFE_POOL_WORKERS)
+
+# Animated renders: generations per image, and the time each frame is shown in milliseconds
+DEFAULT_RENDER_GENERATIONS = 200
+MAX_RENDER_GENERATIONS = 500
+DEFAULT_RENDER_DELAY = 100
+MIN_RENDER_DELAY = 20
+MAX_RENDER_DELAY = 1000
+
+# Rendered images, shared by every request for the same shape
+render_cache = caches['game_of_life_renders']
+
+# Limits of the batch search endpoint; soups are generated server side within MAX_SOUP_SIDE x MAX_SOUP_SIDE boxes
+MAX_SOUP_SIDE = 256
+
+# Seconds between two status checks of a job followed through server-sent events, and the longest
+# time a client stays connected before it has to reconnect
+JOB_EVENTS_INTERVAL = 1.0
+JOB_EVENTS_MAX_DURATION = 300
+
+# Continuation checkpoints, evicted by the cache's own TTL
+cursor_store = caches['game_of_life']
+
+# Precomputed preset simulations, memory-mapped once per process (None when the catalog wasn't built)
+pattern_catalog = load_catalog(settings.GAME_OF_LIFE_CATALOG_PATH)
+
+class AdmittedStreamingHttpResponse(StreamingHttpResponse):
+    """
+    Streaming response holding an admission ticket until it is closed.
+
+    The server closes every response it was handed, including when the client disconnects
+    before the first chunk, so the ticket is released even if the content is never iterated.
+    """
+
+    def __init__(self, *args, ticket=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ticket = ticket
+
+    def close(self):
+        if self.ticket is not None:
+            admission.release(self.ticket)
+            self.ticket = None
+        super().close()
+
 class TryoutConwaysView(View):
     def get(self, request):
         logger.info("Rendering Conway's Game of Life page")
@@ -27,7 +137,38 @@ def stream_game_of_life(request):
     
     Accepts POST requests with JSON data containing 'alive_cells' - an array of [x, y] coordinates
     representing the initial alive cells. Returns up to 1000 generations or until the pattern
-    stabilizes/dies out.
+    stabilizes/dies out. When the pattern settles into a cycle, 'period' and 'cycle_start' describe
+    it so the client can loop generations[cycle_start:] instead of receiving repeated frames.
+
+    With 'mode' set to 'final' and 'generations' set to N, only the state after N generations
+    is returned, computed with the Hashlife engine.
+
+    With 'stream' set to true, generations are streamed as NDJSON while they are computed.
+
+    With 'format' set to 'delta', every 'keyframe_interval'-th generation (default 50) carries
+    its full 'alive_cells' and the generations in between only carry 'births' and 'deaths'.
+
+    With 'viewport' set to {'x', 'y', 'width', 'height'}, generations only carry the cells inside
+    that rectangle, and 'offscreen' holds the 'population' and 'bounding_box' of the cells outside
+    it for each generation (as a list aligned with 'generations', or on every streamed line).
+    Continuation cursors still resume from the whole pattern.
+
+    'rule' selects a Life-like rule as a B/S rulestring ('B36/S23') or a well-known name
+    ('highlife'); Conway's B3/S23 is the default. Responses echo the rule in canonical form.
+
+    'alive_cells' may also be sent as an RLE object ({'rle', 'x', 'y'}) or a packed bitmap object
+    ({'bitmap', 'x', 'y', 'width', 'height'}), and 'encoding' ('pairs', 'rle' or 'bitmap') selects
+    how cell lists are encoded in the response.
+
+    Simulations run in a process pool with a wall-clock budget (GAME_OF_LIFE_TIME_BUDGET). When
+    the budget runs out, the generations computed so far are returned with 'truncated' set to true.
+    Patterns over the size limits are rejected with 413. Simulations over the per-request cost
+    budget run for fewer generations (also flagged 'truncated'), or are rejected with 413 when too
+    few would remain, and 429 is returned while the process budget is used up.
+
+    When a chunk ends while the pattern is still evolving, the response carries a 'next_cursor'.
+    Sending it back as 'cursor' (instead of 'alive_cells') continues the simulation from
+    'start_generation' onwards without re-simulating the earlier generations, under the same rule.
     """
     if request.method != 'POST':
         return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
@@ -39,41 +180,797 @@ def stream_game_of_life(request):
         logger.warning("Invalid JSON data received in Game of Life API")
         return JsonResponse({'error': 'Invalid JSON data'}, status=400)
     
-    # Get the initial grid (array of tuples) from the request
-    initial_alive_cells = data.get('alive_cells')
+    cursor = data.get('cursor')
+    if cursor is not None:
+        # Resume from a checkpoint saved at the end of a previous chunk
+        checkpoint = load_checkpoint(cursor_store, cursor)
+        if checkpoint is None:
+            logger.warning("Game of Life API called with an unknown or expired cursor")
+            return JsonResponse({'error': 'Cursor is unknown or has expired'}, status=410)
+        validated_cells, start_generation, rule = checkpoint
+        logger.debug(f"Game of Life resumed at generation {start_generation} with {len(validated_cells)} alive cells")
+    else:
+        # Get the initial grid (array of tuples) from the request
+        initial_alive_cells = data.get('alive_cells')
 
-    if not initial_alive_cells:
-        logger.warning("Game of Life API called without initial grid")
-        return JsonResponse({'error': 'Initial grid is required'}, status=400)
+        if not initial_alive_cells:
+            logger.warning("Game of Life API called without initial grid")
+            return JsonResponse({'error': 'Initial grid is required'}, status=400)
+
+        # Validate input format
+        try:
+            # Ensure each cell is a valid coordinate pair, decoding RLE and bitmap payloads in bulk
+            validated_cells = decode_cells(initial_alive_cells)
+            logger.debug(f"Game of Life started with {len(validated_cells)} initial alive cells")
+        except (ValueError, TypeError, IndexError, KeyError) as e:
+            logger.warning(f"Invalid cell coordinates received in Game of Life API: {e}")
+            return JsonResponse({'error': 'Invalid cell coordinates format'}, status=400)
+        start_generation = 0
+
+        rule = rule_from_request(data)
+        if isinstance(rule, JsonResponse):
+            return rule
 
-    # Validate input format
     try:
-        # Ensure each cell is a valid coordinate pair
-        validated_cells = [(int(cell[0]), int(cell[1])) for cell in initial_alive_cells]
-        logger.debug(f"Game of Life started with {len(validated_cells)} initial alive cells")
-    except (ValueError, TypeError, IndexError) as e:
-        logger.warning(f"Invalid cell coordinates received in Game of Life API: {e}")
-        return JsonResponse({'error': 'Invalid cell coordinates format'}, status=400)
+        admission.check_size(validated_cells)
+    except PatternTooLarge as e:
+        logger.warning(f"Game of Life pattern rejected: {e}")
+        return JsonResponse({'error': 'Pattern is too large'}, status=413)
+
+    encoding = data.get('encoding', 'pairs')
+    if encoding not in ENCODINGS:
+        logger.warning(f"Unknown encoding requested in Game of Life API: {encoding}")
+        return JsonResponse({'error': f'Encoding must be one of: {", ".join(ENCODINGS)}'}, status=400)
+
+    viewport = viewport_from_request(data)
+    if isinstance(viewport, JsonResponse):
+        return viewport
+
+    if data.get('mode', 'frames') == 'final':
+        return final_game_of_life_state(validated_cells, data.get('generations'), encoding, rule, viewport)
+
+    output_format = data.get('format', 'full')
+    if output_format not in OUTPUT_FORMATS:
+        logger.warning(f"Unknown output format requested in Game of Life API: {output_format}")
+        return JsonResponse({'error': f'Format must be one of: {", ".join(OUTPUT_FORMATS)}'}, status=400)
+
+    try:
+        keyframe_interval = int(data.get('keyframe_interval', DEFAULT_KEYFRAME_INTERVAL))
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid keyframe interval received in Game of Life API: {data.get('keyframe_interval')}")
+        return JsonResponse({'error': 'Keyframe interval must be an integer'}, status=400)
+
+    if keyframe_interval < 1 or keyframe_interval > MAX_KEYFRAME_INTERVAL:
+        return JsonResponse({'error': f'Keyframe interval must be between 1 and {MAX_KEYFRAME_INTERVAL}'}, status=400)
+
+    if data.get('stream'):
+        return ndjson_game_of_life_stream(validated_cells, start_generation, output_format, keyframe_interval, encoding, rule, viewport)
+
+    # Run the game logic, unless the same shape was simulated recently
+    simulation = simulation_cache.get(validated_cells, MAX_GENERATIONS, rule)
+    truncated = False
+    if simulation is None:
+        response = admit_simulation(validated_cells, MAX_GENERATIONS)
+        if isinstance(response, JsonResponse):
+            return response
+        ticket = response
+
+        try:
+            result = simulation_pool.run(validated_cells, ticket.generations, settings.GAME_OF_LIFE_TIME_BUDGET, rule, settings.GAME_OF_LIFE_ENGINE)
+        finally:
+            admission.release(ticket)
 
-    # Run the game logic
-    generations = play_game_of_life(validated_cells)
-    logger.info(f"Game of Life completed with {len(generations)} generations")
+        # A downscaled run that used all its generations stopped early as well
+        truncated = result.truncated or (ticket.downscaled and len(result.generations) == ticket.generations)
+        simulation = CachedSimulation(result.generations, result.period, result.cycle_start)
+        if truncated:
+            logger.info(f"Game of Life truncated by its budgets after {len(result.generations)} generations")
+        else:
+            simulation_cache.put(validated_cells, MAX_GENERATIONS, result.generations, result.period, result.cycle_start, rule)
+            logger.info(f"Game of Life completed with {len(result.generations)} generations")
+
+        # Fresh runs also fill the pattern's keyframe index, unless it was recorded at another position
+        keyframes, shift_x, shift_y = keyframe_indexes.get(validated_cells, rule)
+        if not (shift_x or shift_y or start_generation):
+            keyframes.record_run(result.generations, result.period, result.cycle_start)
+    else:
+        logger.info(f"Game of Life served from cache with {len(simulation.generations)} generations ({simulation_cache.stats()})")
+
+    generations = simulation.generations
+    next_cursor = continuation_cursor(generations[-1] if generations else (), len(generations), simulation.period, start_generation, truncated, rule)
+
+    offscreen = []
+    if output_format == 'delta':
+        steps = steps_from_generations(validated_cells, generations)
+        if viewport is not None:
+            steps = viewport.clip_steps(steps, offscreen)
+        generations = list(encode_deltas(steps, keyframe_interval))
+    elif viewport is not None:
+        clipped = [viewport.clip_with_summary(generation) for generation in generations]
+        generations = [cells for cells, _ in clipped]
+        offscreen = [summary for _, summary in clipped]
+
+    if output_format == 'delta':
+        if encoding != 'pairs':
+            generations = [encode_frame(frame, encoding, rule) for frame in generations]
+    else:
+        # Packed generations are only unpacked here, right before serialization
+        generations = [encode_cells(generation, encoding, rule) for generation in generations]
     
     # Split generations into chunks of 1000
     chunk_size = 1000
     response_data = {
         'total_generations': len(generations),
         'chunk_size': chunk_size,
+        'format': output_format,
+        'keyframe_interval': keyframe_interval,
+        'rule': rule.rulestring,
+        'period': simulation.period,
+        'cycle_start': simulation.cycle_start,
+        'start_generation': start_generation,
+        'next_cursor': next_cursor,
+        'truncated': truncated,
         'generations': generations[:chunk_size]  # First chunk
     }
+    if viewport is not None:
+        response_data['viewport'] = viewport_to_dict(viewport)
+        response_data['offscreen'] = offscreen[:chunk_size]
     
     return JsonResponse(response_data)
 
+def rule_from_request(data):
+    """
+    Read the optional 'rule' of a request.
+
+    Returns:
+        The compiled Rule (Conway's when none is given), or a 400 JsonResponse if it is invalid
+    """
+    rulestring = data.get('rule')
+    if rulestring is None:
+        return CONWAY
+    try:
+        return parse_rule(rulestring)
+    except ValueError as e:
+        logger.warning(f"Invalid rule received in Game of Life API: {e}")
+        return JsonResponse({'error': f'Invalid rule: {e}'}, status=400)
+
+def viewport_from_request(data):
+    """
+    Read the optional 'viewport' of a request.
+
+    Returns:
+        The Viewport, None when there is none, or a 400 JsonResponse if it is invalid
+    """
+    if data.get('viewport') is None:
+        return None
+    try:
+        viewport = Viewport.from_dict(data['viewport'])
+    except ValueError as e:
+        logger.warning(f"Invalid viewport received in Game of Life API: {e}")
+        return JsonResponse({'error': str(e)}, status=400)
+    if viewport.area > MAX_VIEWPORT_AREA:
+        return JsonResponse({'error': f'Viewport must cover at most {MAX_VIEWPORT_AREA} cells'}, status=400)
+    return viewport
+
+def viewport_to_dict(viewport):
+    """Return a viewport in its API form."""
+    return {
+        'x': viewport.min_x,
+        'y': viewport.min_y,
+        'width': viewport.max_x - viewport.min_x + 1,
+        'height': viewport.max_y - viewport.min_y + 1,
+    }
+
+def admit_simulation(validated_cells, generations, allow_downscale=True):
+    """
+    Admit a simulation against the cost budgets.
+
+    Returns:
+        The admission Ticket, or a 413/429 JsonResponse if the simulation is turned away
+    """
+    try:
+        return admission.admit(validated_cells, generations, allow_downscale)
+    except PatternTooLarge as e:
+        logger.warning(f"Game of Life simulation rejected: {e}")
+        return JsonResponse({'error': 'Simulation is too expensive'}, status=413)
+    except Overloaded as e:
+        logger.warning(f"Game of Life simulation turned away: {e}")
+        return JsonResponse({'error': 'Too many simulations are running, please try again later'}, status=429)
+
+def continuation_cursor(last_cells, total_generations, period, start_generation, truncated=False, rule=CONWAY):
+    """
+    Save a checkpoint for a chunk that ended while the pattern was still evolving.
+
+    Chunks cut short by the time budget can be continued as well.
+
+    Returns:
+        The cursor to continue the simulation, or None if there is nothing left to compute
+    """
+    next_generation = start_generation + total_generations
+    if period is not None or (total_generations < MAX_GENERATIONS and not truncated) or not last_cells:
+        return None
+    if next_generation >= settings.GAME_OF_LIFE_MAX_TOTAL_GENERATIONS:
+        logger.info(f"Game of Life reached the maximum of {settings.GAME_OF_LIFE_MAX_TOTAL_GENERATIONS} generations")
+        return None
+    return save_checkpoint(cursor_store, last_cells, next_generation, rule)
+
+def ndjson_game_of_life_stream(validated_cells, start_generation, output_format, keyframe_interval, encoding, rule=CONWAY, viewport=None):
+    """
+    Build a streaming response that writes each generation as soon as it is computed.
+
+    Every line is a JSON object with 'generation' and either 'alive_cells', or 'births' and
+    'deaths' for delta frames, clipped to the viewport along with an 'offscreen' summary if one
+    is given. The last line has 'done' set to true and carries
+    'total_generations', 'rule', 'period', 'cycle_start', 'start_generation' and 'next_cursor'.
+    """
+    # Cached results are replayed as-is, otherwise generations are computed in the pool a chunk
+    # at a time, so a stream never holds more than one chunk in memory
+    simulation = simulation_cache.get(validated_cells, MAX_GENERATIONS, rule)
+    ticket = None
+    outcome = {'period': None, 'cycle_start': None, 'truncated': False}
+    if simulation is not None:
+        outcome.update(period=simulation.period, cycle_start=simulation.cycle_start)
+        steps = steps_from_generations(validated_cells, simulation.generations)
+    else:
+        response = admit_simulation(validated_cells, MAX_GENERATIONS)
+        if isinstance(response, JsonResponse):
+            return response
+        ticket = response
+        steps = pooled_game_of_life_steps(validated_cells, ticket.generations, rule, outcome)
+
+    # Remember the latest generation so the stream can end with a continuation cursor
+    last_cells = set()
+
+    def tracked_steps():
+        nonlocal last_cells
+        for step in steps:
+            last_cells = step[0]
+            yield step
+
+    # Clipping comes after tracking, the continuation cursor needs the whole generation
+    output_steps = tracked_steps()
+    offscreen = []
+    if viewport is not None:
+        output_steps = viewport.clip_steps(output_steps, offscreen)
+
+    if output_format == 'delta':
+        frames = encode_deltas(output_steps, keyframe_interval)
+    else:
+        frames = ({'alive_cells': list(cells)} for cells, _, _ in output_steps)
+
+    def generation_stream():
+        total_generations = 0
+        for generation, frame in enumerate(frames):
+            total_generations += 1
+            # Let other greenlets run between generations when served by gevent workers
+            time.sleep(0)
+            if encoding != 'pairs':
+                frame = encode_frame(frame, encoding, rule)
+            if viewport is not None:
+                frame['offscreen'] = offscreen.pop()
+            yield json.dumps({'generation': generation, **frame}) + '\n'
+
+        # A downscaled run that used all its generations stopped early as well
+        truncated = outcome['truncated'] or (ticket is not None and ticket.downscaled and total_generations == ticket.generations)
+        logger.info(f"Game of Life stream completed with {total_generations} generations")
+        yield json.dumps({
+            'done': True,
+            'total_generations': total_generations,
+            'rule': rule.rulestring,
+            'period': outcome['period'],
+            'cycle_start': outcome['cycle_start'],
+            'start_generation': start_generation,
+            'next_cursor': continuation_cursor(last_cells, total_generations, outcome['period'], start_generation, truncated, rule),
+            'truncated': truncated,
+        }) + '\n'
+
+    # The ticket is released when the response is closed, once the stream completes or the client disconnects
+    response = AdmittedStreamingHttpResponse(generation_stream(), content_type='application/x-ndjson', ticket=ticket)
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Ask Nginx to forward lines without buffering them
+    return response
+
+def pooled_game_of_life_steps(validated_cells, max_generations, rule, outcome):
+    """
+    Compute the generations of a stream in the simulation pool, STREAM_CHUNK_GENERATIONS per run.
+
+    Each run continues from the last generation of the previous one, and all of them share the
+    request's time budget. Cycles are found within each run, so a stream may send up to one
+    chunk of repeated generations before it notices a cycle. The 'period', 'cycle_start' and
+    'truncated' of the whole stream are written to outcome.
+
+    Yields:
+        Tuples of (cells, births, deaths), like iter_game_of_life_steps
+    """
+    deadline = time.monotonic() + settings.GAME_OF_LIFE_TIME_BUDGET
+    cells = validated_cells
+    total_generations = 0
+    while total_generations < max_generations:
+        budget = deadline - time.monotonic()
+        if budget <= 0:
+            outcome['truncated'] = True
+            return
+
+        chunk_generations = min(STREAM_CHUNK_GENERATIONS, max_generations - total_generations)
+        result = simulation_pool.run(cells, chunk_generations, budget, rule, settings.GAME_OF_LIFE_ENGINE)
+        yield from steps_from_generations(cells, result.generations)
+
+        if result.truncated:
+            outcome['truncated'] = True
+            return
+        if result.period is not None:
+            outcome.update(period=result.period, cycle_start=total_generations + result.cycle_start)
+            return
+        if len(result.generations) < chunk_generations or not result.generations[-1]:
+            # The pattern died out
+            return
+        cells = result.generations[-1]
+        total_generations += chunk_generations
+
+def final_game_of_life_state(validated_cells, generations, encoding, rule=CONWAY, viewport=None):
+    """
+    Build the response for the "final" mode: the alive cells after a number of generations,
+    clipped to the viewport if one is given.
+    """
+    try:
+        generations = int(generations)
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid generation count received in Game of Life API: {generations}")
+        return JsonResponse({'error': 'Generations must be an integer'}, status=400)
+
+    if generations < 0 or generations > MAX_FINAL_GENERATIONS:
+        logger.warning(f"Generation count out of range in Game of Life API: {generations}")
+        return JsonResponse({'error': f'Generations must be between 0 and {MAX_FINAL_GENERATIONS}'}, status=400)
+
+    try:
+        ticket = admission.admit_jump(validated_cells, generations)
+    except PatternTooLarge as e:
+        logger.warning(f"Game of Life final state rejected: {e}")
+        return JsonResponse({'error': 'Simulation is too expensive'}, status=413)
+    except Overloaded as e:
+        logger.warning(f"Game of Life final state turned away: {e}")
+        return JsonResponse({'error': 'Too many simulations are running, please try again later'}, status=429)
+
+    try:
+        alive_cells = simulation_pool.jump(validated_cells, generations, settings.GAME_OF_LIFE_TIME_BUDGET, rule, MAX_FINAL_POPULATION)
+    except ValueError as e:
+        logger.warning(f"Game of Life final state rejected: {e}")
+        return JsonResponse({'error': 'Final state is too large to return'}, status=413)
+    finally:
+        admission.release(ticket)
+    if alive_cells is None:
+        return JsonResponse({'error': 'Computing the final state took too long, please try again later'}, status=503)
+
+    logger.info(f"Game of Life final state computed after {generations} generations with {len(alive_cells)} alive cells")
+    response_data = {
+        'generation': generations,
+        'rule': rule.rulestring,
+        'population': len(alive_cells),
+    }
+    if viewport is not None:
+        alive_cells, response_data['offscreen'] = viewport.clip_with_summary(alive_cells)
+        response_data['viewport'] = viewport_to_dict(viewport)
+    response_data['alive_cells'] = encode_cells(alive_cells, encoding, rule)
+    return JsonResponse(response_data)
+
+@api_view(['POST'])
+@throttle_classes([AnonRateThrottle])
+def seek_game_of_life(request):
+    """
+    API controller for jumping to any generation of a pattern's timeline.
+
+    Accepts POST requests with JSON data containing 'alive_cells' and 'generation'. The nearest
+    keyframe at or before the generation is restored and stepped forward, so scrubbing through a
+    timeline never re-simulates it from the start. 'rule' and 'encoding' work like in
+    stream_game_of_life.
+
+    Seeks run in the simulation pool within GAME_OF_LIFE_TIME_BUDGET and answer 503 when they
+    need longer. Keyframes found meanwhile are kept, so a retry gets further.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        logger.warning("Invalid JSON data received in Game of Life seek API")
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+
+    initial_alive_cells = data.get('alive_cells')
+    if not initial_alive_cells:
+        logger.warning("Game of Life seek API called without initial grid")
+        return JsonResponse({'error': 'Initial grid is required'}, status=400)
+
+    try:
+        validated_cells = decode_cells(initial_alive_cells)
+    except (ValueError, TypeError, IndexError, KeyError) as e:
+        logger.warning(f"Invalid cell coordinates received in Game of Life seek API: {e}")
+        return JsonResponse({'error': 'Invalid cell coordinates format'}, status=400)
+
+    rule = rule_from_request(data)
+    if isinstance(rule, JsonResponse):
+        return rule
+
+    try:
+        generation = int(data.get('generation'))
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid generation received in Game of Life seek API: {data.get('generation')}")
+        return JsonResponse({'error': 'Generation must be an integer'}, status=400)
+
+    max_generation = settings.GAME_OF_LIFE_MAX_TOTAL_GENERATIONS - 1
+    if generation < 0 or generation > max_generation:
+        return JsonResponse({'error': f'Generation must be between 0 and {max_generation}'}, status=400)
+
+    encoding = data.get('encoding', 'pairs')
+    if encoding not in ENCODINGS:
+        logger.warning(f"Unknown encoding requested in Game of Life seek API: {encoding}")
+        return JsonResponse({'error': f'Encoding must be one of: {", ".join(ENCODINGS)}'}, status=400)
+
+    try:
+        admission.check_size(validated_cells)
+    except PatternTooLarge as e:
+        logger.warning(f"Game of Life seek pattern rejected: {e}")
+        return JsonResponse({'error': 'Pattern is too large'}, status=413)
+
+    # Seeks never downscale, a shorter seek would land on the wrong generation
+    index, _, _ = keyframe_indexes.get(validated_cells, rule)
+    response = admit_simulation(validated_cells, max(index.steps_to(generation), 1), allow_downscale=False)
+    if isinstance(response, JsonResponse):
+        return response
+
+    try:
+        alive_cells = keyframe_indexes.seek(validated_cells, generation, rule, simulation_pool, settings.GAME_OF_LIFE_TIME_BUDGET)
+    finally:
+        admission.release(response)
+    if alive_cells is None:
+        # Keyframes found so far are kept, so trying again carries on from them
+        return JsonResponse({'error': 'Seeking took too long, please try again later'}, status=503)
+    logger.info(f"Game of Life seek to generation {generation} returned {len(alive_cells)} alive cells")
+    return JsonResponse({
+        'generation': generation,
+        'population': len(alive_cells),
+        'keyframe_interval': keyframe_indexes.interval,
+        'rule': rule.rulestring,
+        'alive_cells': encode_cells(alive_cells, encoding, rule),
+    })
+
+@api_view(['POST'])
+@throttle_classes([AnonRateThrottle])
+def render_game_of_life(request):
+    """
+    API endpoint that renders a simulation to an animated image.
+
+    Accepts 'alive_cells' (in any of the stream endpoint's encodings), 'format' ('webp', the
+    default, or 'gif'), 'generations' (default 200, at most 500), 'delay' between frames in
+    milliseconds (default 100), and the optional 'rule' and 'viewport'. Without a viewport the
+    image frames the whole simulation, cropped to 256x256 cells around the initial pattern.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        logger.warning("Invalid JSON data received in Game of Life render API")
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+
+    initial_alive_cells = data.get('alive_cells')
+    if not initial_alive_cells:
+        return JsonResponse({'error': 'Initial grid is required'}, status=400)
+    try:
+        validated_cells = decode_cells(initial_alive_cells)
+    except (ValueError, TypeError, IndexError, KeyError) as e:
+        logger.warning(f"Invalid cell coordinates received in Game of Life render API: {e}")
+        return JsonResponse({'error': 'Invalid cell coordinates format'}, status=400)
+
+    rule = rule_from_request(data)
+    if isinstance(rule, JsonResponse):
+        return rule
+
+    viewport = viewport_from_request(data)
+    if isinstance(viewport, JsonResponse):
+        return viewport
+
+    return rendered_game_of_life(validated_cells, data, rule, viewport)
+
+@require_GET
+def render_game_of_life_pattern(request, slug):
+    """
+    API endpoint that renders a predefined pattern to an animated image, for link previews.
+
+    Takes the same 'format', 'generations' and 'delay' options as render_game_of_life, as query
+    parameters. It is a plain Django view, as DRF would read the 'format' query parameter as a
+    content negotiation override.
+    """
+    cells = preset_patterns().get(slug)
+    if cells is None:
+        return JsonResponse({'error': 'Pattern not found'}, status=404)
+    return rendered_game_of_life(cells, request.GET, CONWAY)
+
+def rendered_game_of_life(validated_cells, options, rule=CONWAY, viewport=None):
+    """
+    Build the response of a render request, from the render cache when the same shape was rendered before.
+    """
+    output_format = options.get('format', 'webp')
+    if output_format not in RENDER_FORMATS:
+        return JsonResponse({'error': f'Format must be one of: {", ".join(RENDER_FORMATS)}'}, status=400)
+
+    try:
+        generations = int(options.get('generations', DEFAULT_RENDER_GENERATIONS))
+        delay = int(options.get('delay', DEFAULT_RENDER_DELAY))
+    except (ValueError, TypeError):
+        return JsonResponse({'error': 'Generations and delay must be integers'}, status=400)
+    if generations < 1 or generations > MAX_RENDER_GENERATIONS:
+        return JsonResponse({'error': f'Generations must be between 1 and {MAX_RENDER_GENERATIONS}'}, status=400)
+    if delay < MIN_RENDER_DELAY or delay > MAX_RENDER_DELAY:
+        return JsonResponse({'error': f'Delay must be between {MIN_RENDER_DELAY} and {MAX_RENDER_DELAY} milliseconds'}, status=400)
+    if viewport is not None and (viewport.max_x - viewport.min_x >= MAX_RENDER_SIDE or viewport.max_y - viewport.min_y >= MAX_RENDER_SIDE):
+        return JsonResponse({'error': f'Rendered viewport must be at most {MAX_RENDER_SIDE}x{MAX_RENDER_SIDE} cells'}, status=400)
+
+    try:
+        admission.check_size(validated_cells)
+    except PatternTooLarge as e:
+        logger.warning(f"Game of Life render rejected: {e}")
+        return JsonResponse({'error': 'Pattern is too large'}, status=413)
+
+    key = render_cache_key(validated_cells, generations, output_format, delay, rule, viewport)
+    image = render_cache.get(key)
+    if image is None:
+        ticket = admit_simulation(validated_cells, generations)
+        if isinstance(ticket, JsonResponse):
+            return ticket
+
+        try:
+            result = simulation_pool.render(validated_cells, ticket.generations, settings.GAME_OF_LIFE_TIME_BUDGET, output_format, delay, rule, settings.GAME_OF_LIFE_ENGINE, viewport)
+        finally:
+            admission.release(ticket)
+        if result is None:
+            return JsonResponse({'error': 'Rendering took too long, please try again later'}, status=503)
+
+        image, truncated = result
+        # Cut short renders are still sent, but a later request may get the complete image
+        if not (truncated or ticket.downscaled):
+            render_cache.set(key, image)
+        logger.info(f"Game of Life rendered to {len(image)} bytes of {output_format}")
+    else:
+        logger.info(f"Game of Life render served from cache ({len(image)} bytes of {output_format})")
+
+    response = HttpResponse(image, content_type=RENDER_FORMATS[output_format])
+    response['Cache-Control'] = 'public, max-age=86400'
+    return response
+
+@api_view(['POST'])
+@throttle_classes([AnonRateThrottle])
+def search_game_of_life(request):
+    """
+    API controller for summarizing many patterns in one request.
+
+    Accepts POST requests with JSON data containing either 'patterns', a list of patterns in any
+    supported encoding, or 'soups', an object with 'count', 'width', 'height', 'density' and an
+    optional 'seed' describing random soups to generate. Each pattern is simulated for up to
+    'generations' generations (default and maximum 1000) across the simulation pool, and only a
+    summary is returned: 'outcome' ('died', 'cycle' or 'running'), 'lifespan', 'final_population',
+    'period' and 'bounding_box'. 'rule' works like in stream_game_of_life.
+
+    Results follow the order of the patterns. Patterns left out by the time budget have a null
+    result and set 'truncated'. Generated soups are returned RLE encoded in 'soups', along with the
+    'seed' that reproduces them. Searches hold their estimated cost (up to GAME_OF_LIFE_SEARCH_BUDGET)
+    from the process budget while they run, and 429 is returned while it is used up.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        logger.warning("Invalid JSON data received in Game of Life search API")
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+
+    rule = rule_from_request(data)
+    if isinstance(rule, JsonResponse):
+        return rule
+
+    max_patterns = settings.GAME_OF_LIFE_SEARCH_MAX_PATTERNS
+    response_data = {}
+    if data.get('soups') is not None:
+        soups = data['soups']
+        try:
+            count = int(soups.get('count', 100))
+            width = int(soups.get('width', 16))
+            height = int(soups.get('height', 16))
+            density = float(soups.get('density', 0.5))
+            seed = int(soups['seed']) if soups.get('seed') is not None else random.randrange(1 << 32)
+        except (AttributeError, ValueError, TypeError):
+            logger.warning(f"Invalid soup parameters received in Game of Life search API: {soups}")
+            return JsonResponse({'error': 'Invalid soup parameters'}, status=400)
+
+        if not 1 <= count <= max_patterns:
+            return JsonResponse({'error': f'Soup count must be between 1 and {max_patterns}'}, status=400)
+        if not (1 <= width <= MAX_SOUP_SIDE and 1 <= height <= MAX_SOUP_SIDE):
+            return JsonResponse({'error': f'Soup width and height must be between 1 and {MAX_SOUP_SIDE}'}, status=400)
+        if not 0 <= density <= 1:
+            return JsonResponse({'error': 'Soup density must be between 0 and 1'}, status=400)
+
+        rng = random.Random(seed)
+        patterns = [random_soup(width, height, density, rng) for _ in range(count)]
+        response_data['seed'] = seed
+        response_data['soups'] = [encode_cells(cells, 'rle', rule) for cells in patterns]
+    else:
+        raw_patterns = data.get('patterns')
+        if not isinstance(raw_patterns, list) or not raw_patterns:
+            logger.warning("Game of Life search API called without patterns")
+            return JsonResponse({'error': 'Patterns or soups are required'}, status=400)
+        if len(raw_patterns) > max_patterns:
+            return JsonResponse({'error': f'At most {max_patterns} patterns can be searched at once'}, status=400)
+
+        try:
+            patterns = [decode_cells(pattern) for pattern in raw_patterns]
+        except (ValueError, TypeError, IndexError, KeyError) as e:
+            logger.warning(f"Invalid cell coordinates received in Game of Life search API: {e}")
+            return JsonResponse({'error': 'Invalid cell coordinates format'}, status=400)
+
+    try:
+        generations = int(data.get('generations', MAX_GENERATIONS))
+    except (ValueError, TypeError):
+        return JsonResponse({'error': 'Generations must be an integer'}, status=400)
+    if not 1 <= generations <= MAX_GENERATIONS:
+        return JsonResponse({'error': f'Generations must be between 1 and {MAX_GENERATIONS}'}, status=400)
+
+    try:
+        ticket = admission.admit_batch(patterns, generations, settings.GAME_OF_LIFE_SEARCH_BUDGET)
+    except PatternTooLarge as e:
+        logger.warning(f"Game of Life search pattern rejected: {e}")
+        return JsonResponse({'error': 'Pattern is too large'}, status=413)
+    except Overloaded as e:
+        logger.warning(f"Game of Life search turned away: {e}")
+        return JsonResponse({'error': 'Too many simulations are running, please try again later'}, status=429)
+
+    try:
+        summaries, truncated = simulation_pool.summarize(patterns, generations, settings.GAME_OF_LIFE_SEARCH_TIME_BUDGET, rule, settings.GAME_OF_LIFE_ENGINE)
+    finally:
+        admission.release(ticket)
+    logger.info(f"Game of Life search summarized {len(patterns)} patterns (truncated: {truncated})")
+    return JsonResponse({
+        'generations': generations,
+        'rule': rule.rulestring,
+        'truncated': truncated,
+        'results': summaries,
+        **response_data,
+    })
+
+@api_view(['POST'])
+@throttle_classes([AnonRateThrottle])
+def submit_game_of_life_job(request):
+    """
+    API controller for queueing a simulation too long for a single request.
+
+    Accepts POST requests with JSON data containing 'alive_cells' (in any supported encoding) and
+    'generations', and optionally a 'rule' like stream_game_of_life. The simulation is run by the
+    background worker; the returned 'job_id' is used to follow it through the status, events and
+    result endpoints.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        logger.warning("Invalid JSON data received in Game of Life job API")
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+
+    initial_alive_cells = data.get('alive_cells')
+    if not initial_alive_cells:
+        logger.warning("Game of Life job API called without initial grid")
+        return JsonResponse({'error': 'Initial grid is required'}, status=400)
+
+    try:
+        validated_cells = decode_cells(initial_alive_cells)
+    except (ValueError, TypeError, IndexError, KeyError) as e:
+        logger.warning(f"Invalid cell coordinates received in Game of Life job API: {e}")
+        return JsonResponse({'error': 'Invalid cell coordinates format'}, status=400)
+
+    rule = rule_from_request(data)
+    if isinstance(rule, JsonResponse):
+        return rule
+
+    try:
+        generations = int(data.get('generations'))
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid generation count received in Game of Life job API: {data.get('generations')}")
+        return JsonResponse({'error': 'Generations must be an integer'}, status=400)
+
+    max_generations = settings.GAME_OF_LIFE_JOB_MAX_GENERATIONS
+    if generations < 1 or generations > max_generations:
+        return JsonResponse({'error': f'Generations must be between 1 and {max_generations}'}, status=400)
+
+    try:
+        admission.check_size(validated_cells)
+    except PatternTooLarge as e:
+        logger.warning(f"Game of Life job pattern rejected: {e}")
+        return JsonResponse({'error': 'Pattern is too large'}, status=413)
+
+    pending = SimulationJob.objects.filter(status=SimulationJob.Status.PENDING).count()
+    if pending >= settings.GAME_OF_LIFE_JOB_MAX_PENDING:
+        logger.warning(f"Game of Life job queue is full with {pending} pending jobs")
+        return JsonResponse({'error': 'Too many simulations are queued, please try again later'}, status=429)
+
+    job = submit_job(validated_cells, generations, rule)
+    return JsonResponse(job.to_status_dict(), status=202)
+
+def get_simulation_job(job_id):
+    """Return the job with the given id, or None if there is none."""
+    try:
+        return SimulationJob.objects.get(pk=job_id)
+    except SimulationJob.DoesNotExist:
+        return None
+
+@api_view(['GET'])
+def get_game_of_life_job(request, job_id):
+    """
+    API controller for polling the progress of a simulation job.
+    """
+    job = get_simulation_job(job_id)
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(job.to_status_dict())
+
+@api_view(['GET'])
+def get_game_of_life_job_result(request, job_id):
+    """
+    API controller for the final generation of a finished simulation job.
+
+    'encoding' ('pairs', 'rle' or 'bitmap') may be passed as a query parameter.
+    Jobs that are not done yet answer with 409 and their current status.
+    """
+    job = get_simulation_job(job_id)
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+
+    encoding = request.GET.get('encoding', 'pairs')
+    if encoding not in ENCODINGS:
+        return JsonResponse({'error': f'Encoding must be one of: {", ".join(ENCODINGS)}'}, status=400)
+
+    if job.status != SimulationJob.Status.DONE:
+        return JsonResponse({'error': 'Job is not done', **job.to_status_dict()}, status=409)
+
+    alive_cells = decode_cells(job.alive_cells)
+    return JsonResponse({
+        **job.to_status_dict(),
+        'alive_cells': encode_cells(alive_cells, encoding, parse_rule(job.rule)),
+    })
+
+@require_GET
+def stream_game_of_life_job_events(request, job_id):
+    """
+    Follow a simulation job through server-sent events.
+
+    Plain Django view, since DRF's content negotiation would turn away the
+    'text/event-stream' Accept header sent by EventSource. An event carrying
+    the job's status is sent whenever its progress changes, and the stream
+    ends once the job is finished (or after JOB_EVENTS_MAX_DURATION seconds,
+    after which EventSource reconnects on its own).
+    """
+    job = get_simulation_job(job_id)
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+
+    def event_stream():
+        deadline = time.monotonic() + JOB_EVENTS_MAX_DURATION
+        last_status = None
+        while True:
+            status = get_simulation_job(job_id).to_status_dict()
+            if status != last_status:
+                yield f"data: {json.dumps(status)}\n\n"
+                last_status = status
+            if status['status'] in (SimulationJob.Status.DONE, SimulationJob.Status.FAILED):
+                return
+            if time.monotonic() >= deadline:
+                return
+            # Yields to other greenlets under gevent workers
+            time.sleep(JOB_EVENTS_INTERVAL)
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 @api_view(['GET'])
 def get_game_of_life_patterns(request):
     """
     API endpoint to get predefined Game of Life patterns.
     """
+    if pattern_catalog is not None:
+        # The catalog holds the response ready to send, with each pattern's summary and thumbnail
+        return HttpResponse(pattern_catalog.listing(), content_type='application/json')
+
     try:
         # Get the path to the patterns JSON file
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -94,6 +991,39 @@ def get_game_of_life_patterns(request):
     except Exception as e:
         logger.error(f"Failed to load Game of Life patterns: {e}")
         return JsonResponse({'error': 'Failed to load patterns'}, status=500)
+
+@api_view(['GET'])
+def get_game_of_life_pattern_frames(request, slug):
+    """
+    API endpoint to get the precomputed generations of a predefined pattern.
+
+    The response has the same shape as a delta-format stream request for the
+    pattern, with a cursor to continue patterns that are still evolving.
+    """
+    if pattern_catalog is None or slug not in pattern_catalog.patterns:
+        return JsonResponse({'error': 'Pattern not found'}, status=404)
+
+    pattern = pattern_catalog.patterns[slug]
+    next_cursor = None
+    if pattern['outcome'] == RUNNING and pattern['last_cells'] is not None:
+        next_cursor = continuation_cursor(decode_cells(pattern['last_cells']), pattern['total_generations'], None, 0, truncated=True)
+
+    response_data = {
+        'total_generations': pattern['total_generations'],
+        'chunk_size': pattern['total_generations'],
+        'format': 'delta',
+        'keyframe_interval': pattern_catalog.keyframe_interval,
+        'rule': CONWAY.rulestring,
+        'period': pattern['period'],
+        'cycle_start': pattern['cycle_start'],
+        'start_generation': 0,
+        'next_cursor': next_cursor,
+        'truncated': False,
+    }
+    # Splice the stored frames in as they are, so they are never parsed nor re-encoded
+    body = json.dumps(response_data)[:-1].encode() + b', "generations": ' + bytes(pattern_catalog.frames(slug)) + b'}'
+    logger.debug(f"Served precomputed frames of pattern {slug}")
+    return HttpResponse(body, content_type='application/json')
     
 ### ZLLM Related Views and Functions ###
 
@@ -125,6 +1055,26 @@ def generate_text_streaming_api(request):
     logger.info("ZLLM streaming text generation API called")
     return generate_text_streaming(request)
 
+@csrf_exempt
+async def generate_text_streaming_async_api(request):
+    """
+    Async REST API controller for streaming text generation, routed instead of
+    generate_text_streaming_api when settings.ZLLM_ASYNC_STREAMING is on.
+    
+    DRF views can't be async, so the rate limit and CSRF exemption of
+    @api_view are applied here.
+    """
+    logger.info("ZLLM async streaming text generation API called")
+    throttle = AnonRateThrottle()
+    # Reading request.user may hit the session store, so the check runs in a thread
+    if not await sync_to_async(throttle.allow_request)(request, None):
+        wait = throttle.wait()
+        response = JsonResponse({'detail': 'Request was throttled.'}, status=429)
+        if wait is not None:
+            response['Retry-After'] = str(int(wait))
+        return response
+    return await generate_text_streaming_async(request)
+
 @api_view(['POST'])
 @throttle_classes([AnonRateThrottle])
 def generate_text_api(request):
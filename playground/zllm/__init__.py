@@ -5,18 +5,26 @@ This package contains the core logic and utilities for integrating
 with the ZLLM API service.
 """
 
+from .async_client import AsyncZllmClient
+from .client import ZllmClient
 from .service import (
+    get_zllm_client,
     get_zllm_token,
     make_zllm_request,
     generate_text_streaming,
+    generate_text_streaming_async,
     generate_text,
     chat_with_zllm
 )
 
 __all__ = [
-    'get_zllm_token', 
+    'AsyncZllmClient',
+    'ZllmClient',
+    'get_zllm_client',
+    'get_zllm_token',
     'make_zllm_request',
     'generate_text_streaming',
+    'generate_text_streaming_async',
     'generate_text',
     'chat_with_zllm'
 ]
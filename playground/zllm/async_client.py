@@ -0,0 +1,196 @@
+"""
+Async HTTP client for streaming from the ZLLM API under ASGI.
+
+A generation can stream for minutes. With the sync client each stream holds
+a worker thread (or greenlet) for all that time; with this one a stream
+waiting on the service is just a suspended coroutine, so a single ASGI
+worker relays hundreds of them. Connections come from one httpx pool per
+process, bounded by max_connections: streams past that wait for a free
+connection instead of opening more.
+
+The sync ZllmClient is reused for everything that is not a stream: its
+settings, and its token cache, so both paths share one access token and one
+single-flight refresh. Requests are retried exactly like the sync client's,
+see the client module.
+"""
+
+import asyncio
+import json
+import logging
+import random
+from contextlib import asynccontextmanager
+
+import httpx
+
+from .client import BACKOFF_BASE, BACKOFF_MAX, RETRY_STATUSES, TIMEOUT, ZllmClient
+
+logger = logging.getLogger('playground.zllm.async_client')
+
+DEFAULT_MAX_CONNECTIONS = 500
+
+# Longest line of a stream kept in memory; longer lines are dropped, so a misbehaving upstream can't grow a stream's buffer without bound
+MAX_LINE_BYTES = 1024 * 1024
+
+# Failures to open a connection, which happen before the service received the request, see ZllmClient._send
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+class AsyncZllmClient:
+    """
+    Async, pooled client for streaming from the ZLLM API.
+
+    Args:
+        client: Sync client whose settings and access token are shared
+        max_connections: Maximum number of connections open to the service at once
+        pool_size: Maximum number of idle connections kept open to the service
+    """
+
+    def __init__(self, client: ZllmClient, max_connections: int = DEFAULT_MAX_CONNECTIONS, pool_size: int = 10):
+        self.client = client
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=pool_size)
+        # Waiting for a free pooled connection counts against the connect timeout
+        self.timeout = httpx.Timeout(TIMEOUT[1], connect=TIMEOUT[0], pool=TIMEOUT[0])
+        self._http: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._guard = None
+
+    @property
+    def model_name(self) -> str:
+        return self.client.model_name
+
+    async def get_http(self) -> httpx.AsyncClient:
+        """
+        Return the pooled httpx client of the running event loop.
+
+        Pooled connections belong to the loop that opened them, so a new loop (such
+        as each async_to_sync call) gets its own client. Each client is closed on its
+        own loop, see close_with_loop: a closed loop can't close its connections anymore.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._loop is not loop:
+            http = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            guard = close_with_loop(http)
+            await anext(guard)
+            # Dropping the previous guard closes the previous client, if its loop is still running
+            self._http, self._loop, self._guard = http, loop, guard
+        return self._http
+
+    async def get_token(self) -> str:
+        """
+        Return a valid access token, see TokenCache.
+
+        A cached token is returned right away; authenticating goes through the
+        sync client in a thread, so it does not block the event loop.
+
+        Raises:
+            requests.exceptions.RequestException: If authentication fails
+        """
+        return self.client.tokens.peek() or await asyncio.to_thread(self.client.get_token)
+
+    @asynccontextmanager
+    async def stream(self, path: str, data: dict):
+        """
+        Make an authenticated, streamed POST request to the API.
+
+        Failed attempts are retried and a rejected token is renewed once, like
+        ZllmClient.post. The response is closed, and its connection released,
+        when the context exits, including when the consumer is cancelled.
+
+        Args:
+            path: Endpoint path, such as '/llm/chat/stream'
+            data: JSON payload
+
+        Yields:
+            httpx.Response: API response with its body not read yet, whatever its final status
+
+        Raises:
+            httpx.HTTPError: If the service can't be reached
+        """
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        token = await self.get_token()
+        response = await self._send(path, body, token)
+        try:
+            if response.status_code == 401:
+                # The token expired or was revoked before its expected expiry
+                await response.aclose()
+                self.client.tokens.invalidate(token)
+                logger.info("ZLLM rejected the access token, authenticating again")
+                response = await self._send(path, body, await self.get_token())
+            yield response
+        finally:
+            await response.aclose()
+
+    async def _send(self, path: str, body: bytes, token: str) -> httpx.Response:
+        """Send a streamed request, retrying the failures that are safe to retry."""
+        http = await self.get_http()
+        request = http.build_request('POST', f"{self.client.base_url}{path}", content=body, headers={
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {token}',
+        })
+
+        attempt = 0
+        while True:
+            try:
+                response = await http.send(request, stream=True)
+            except RETRY_ERRORS as e:
+                if attempt >= self.client.max_retries:
+                    raise
+                logger.warning(f"ZLLM request to {path} failed to connect ({e!r}), retrying")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.client.max_retries:
+                    return response
+                await response.aclose()
+                logger.warning(f"ZLLM request to {path} answered {response.status_code}, retrying")
+
+            await asyncio.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        """Close the pooled connections, from the loop they were opened on."""
+        if self._guard is not None:
+            await self._guard.aclose()
+            self._http = self._loop = self._guard = None
+
+
+async def close_with_loop(http: httpx.AsyncClient):
+    """
+    Keep an httpx client open until its event loop shuts down, then close it.
+
+    Started async generators are finalized by their loop: asyncio.run closes the ones
+    still suspended before it closes the loop, and one collected earlier is closed on
+    its loop as soon as possible. Either way, the client is closed on the loop its
+    connections belong to.
+    """
+    try:
+        yield
+    finally:
+        await http.aclose()
+
+
+async def aiter_lines(response: httpx.Response, max_line_bytes: int = MAX_LINE_BYTES):
+    """
+    Iterate over the lines of a streamed response as bytes, like requests' iter_lines.
+
+    Lines are left undecoded, so that invalid UTF-8 can be reported instead
+    of silently replaced. Lines longer than max_line_bytes are dropped.
+
+    Yields:
+        bytes: Each line, without its line break
+    """
+    buffer = b''
+    skipping = False
+    async for chunk in response.aiter_bytes():
+        lines = (buffer + chunk).splitlines(keepends=True)
+        buffer = lines.pop() if lines and not lines[-1].endswith((b'\n', b'\r')) else b''
+        for line in lines:
+            if skipping:
+                # The end of a line that was too long
+                skipping = False
+                continue
+            yield line.rstrip(b'\r\n')
+        if len(buffer) > max_line_bytes:
+            logger.warning(f"Dropping a ZLLM stream line longer than {max_line_bytes} bytes")
+            buffer = b''
+            skipping = True
+    if buffer and not skipping:
+        yield buffer
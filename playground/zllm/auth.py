@@ -0,0 +1,126 @@
+"""
+Process-wide cache of the ZLLM access token.
+
+Authenticating is a full round-trip to the ZLLM service, so the token is
+fetched once and shared by every request of the process until it is about
+to expire. Expiry is read from the auth response ('expires_in'), or from
+the token itself when it is a JWT; otherwise tokens are assumed to last
+DEFAULT_TOKEN_TTL seconds.
+
+Refreshes are single-flight: when the token has to be renewed, one caller
+fetches the new token while concurrent callers wait for it (or keep using
+the old one while it is still valid) instead of all authenticating at once.
+"""
+
+import base64
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger('playground.zllm.auth')
+
+# Lifetime assumed for tokens that don't say when they expire, in seconds
+DEFAULT_TOKEN_TTL = 3600
+
+# Tokens are refreshed this many seconds before they expire, so requests never start with a token about to expire
+REFRESH_MARGIN = 60
+
+
+def token_lifetime(token: str, auth_response: dict) -> float:
+    """
+    Return how many seconds a freshly issued token stays valid.
+
+    Args:
+        token: The access token
+        auth_response: Body of the auth response the token came from
+
+    Returns:
+        The 'expires_in' of the response, the time left until the 'exp' claim
+        of a JWT token, or DEFAULT_TOKEN_TTL when neither is known
+    """
+    expires_in = auth_response.get('expires_in')
+    if isinstance(expires_in, (int, float)) and expires_in > 0:
+        return float(expires_in)
+
+    parts = token.split('.')
+    if len(parts) == 3:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(parts[1] + '=' * (-len(parts[1]) % 4)))
+            return max(0.0, float(payload['exp']) - time.time())
+        except (ValueError, TypeError, KeyError):
+            pass
+    return float(DEFAULT_TOKEN_TTL)
+
+
+class TokenCache:
+    """
+    Cached access token with single-flight refresh.
+
+    Args:
+        fetch: Callable authenticating with the service, returning (token, lifetime in seconds)
+        refresh_margin: Seconds before expiry at which the token is renewed
+    """
+
+    def __init__(self, fetch, refresh_margin: float = REFRESH_MARGIN):
+        self.fetch = fetch
+        self.refresh_margin = refresh_margin
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        """
+        Return a valid token, authenticating only when the cached one is missing or about to expire.
+
+        Raises:
+            Whatever fetch raises, when no valid token is left to fall back on
+        """
+        token, expires_at = self._token, self._expires_at
+        now = time.monotonic()
+        if token is not None and now < self._refresh_at:
+            return token
+
+        if token is not None and now < expires_at:
+            # Still valid: renew it early unless another request already is, and keep using it meanwhile
+            if not self._lock.acquire(blocking=False):
+                return token
+            try:
+                return self._refresh()
+            except Exception as e:
+                logger.warning(f"Early ZLLM token refresh failed, using the current token until it expires: {e}")
+                return token
+            finally:
+                self._lock.release()
+
+        with self._lock:
+            # Another request may have refreshed the token while this one waited for the lock
+            if self._token is not None and time.monotonic() < self._refresh_at:
+                return self._token
+            return self._refresh()
+
+    def peek(self) -> str | None:
+        """Return the cached token if it needs no refresh yet, without ever authenticating or waiting."""
+        token = self._token
+        if token is not None and time.monotonic() < self._refresh_at:
+            return token
+        return None
+
+    def invalidate(self, token: str) -> None:
+        """Forget a token the service rejected, unless it was already replaced by a newer one."""
+        if self._token == token:
+            self._token = None
+            self._expires_at = 0.0
+            self._refresh_at = 0.0
+            logger.info("ZLLM token was rejected, it will be renewed on the next request")
+
+    def _refresh(self) -> str:
+        token, lifetime = self.fetch()
+        now = time.monotonic()
+        self._token = token
+        self._expires_at = now + lifetime
+        # Short-lived tokens are renewed halfway through instead, so they are not renewed on every request
+        self._refresh_at = now + max(lifetime - self.refresh_margin, lifetime / 2)
+        logger.info(f"Fetched a new ZLLM token, valid for {lifetime:.0f}s")
+        return token
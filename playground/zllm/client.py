@@ -0,0 +1,171 @@
+"""
+Shared HTTP client for the ZLLM API.
+
+A single client per process owns a pooled requests.Session, so requests
+reuse keep-alive connections instead of paying a TCP and TLS handshake
+(and an ephemeral port) each. The pool is bounded: at most pool_size idle
+connections are kept open, and connections opened past that by bursts of
+concurrent requests are closed once done rather than queueing requests
+behind streams that may last minutes. Under gevent workers the session's
+sockets are monkey-patched, so waiting on them only blocks the calling
+greenlet.
+
+Failed requests are retried with exponential backoff and full jitter, but
+only when the service can't have started a generation: failures to open a
+connection, and 502, 503 and 429 answers. Anything that may have reached the
+service is not retried, as retrying could generate twice: read timeouts,
+connections dropped after the request was sent, and 504 answers (a gateway
+gave up while the service may still be generating). Nothing is retried once
+a stream has started.
+"""
+
+import json
+import logging
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .auth import TokenCache, token_lifetime
+
+logger = logging.getLogger('playground.zllm.client')
+
+# (connect timeout, read timeout) in seconds
+TIMEOUT = (30, 300)
+
+# Upstream statuses meaning the request was turned away before any work was done
+RETRY_STATUSES = frozenset({429, 502, 503})
+
+# Backoff before retry n is a random delay between 0 and min(BACKOFF_MAX, BACKOFF_BASE * 2 ** n) seconds
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+
+def failed_to_connect(error: requests.exceptions.ConnectionError) -> bool:
+    """Whether a connection error happened before the request could reach the service."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # Refused connections and failed DNS lookups, as opposed to connections dropped mid-request
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class ZllmClient:
+    """
+    Pooled, authenticated client for the ZLLM API.
+
+    Args:
+        base_url: Root URL of the ZLLM API
+        api_key: Key exchanged for access tokens
+        model_name: Model used for generations
+        pool_size: Maximum number of idle connections kept open to the service
+        max_retries: Retries of a failed request on top of the first attempt
+    """
+
+    def __init__(self, base_url: str, api_key: str, model_name: str, pool_size: int = 10, max_retries: int = 2):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.model_name = model_name
+        self.max_retries = max_retries
+
+        self.session = requests.Session()
+        # Retries are done here, where the request's idempotency is known, not by urllib3
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=False, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.tokens = TokenCache(self._fetch_token)
+
+    @classmethod
+    def from_settings(cls, settings) -> 'ZllmClient':
+        """
+        Build the client from the ZLLM_* Django settings.
+
+        Raises:
+            ValueError: If the URL, API key or model name is not configured
+        """
+        missing = [name for name in ('ZLLM_BASE_URL', 'ZLLM_API_KEY', 'ZLLM_MODEL_NAME') if not getattr(settings, name, None)]
+        if missing:
+            raise ValueError(f"{', '.join(missing)} must be set")
+        return cls(settings.ZLLM_BASE_URL, settings.ZLLM_API_KEY, settings.ZLLM_MODEL_NAME, settings.ZLLM_POOL_SIZE, settings.ZLLM_MAX_RETRIES)
+
+    def get_token(self) -> str:
+        """
+        Return a valid access token, see TokenCache.
+
+        Raises:
+            requests.exceptions.RequestException: If authentication fails
+        """
+        return self.tokens.get()
+
+    def post(self, path: str, data: dict, stream: bool = False) -> requests.Response:
+        """
+        Make an authenticated POST request to the API.
+
+        Failed attempts are retried as described in the module docstring, and a
+        rejected token is renewed once. The caller owns the returned response
+        and must close it (or use it as a context manager) when streaming.
+
+        Args:
+            path: Endpoint path, such as '/llm/chat'
+            data: JSON payload
+            stream: Whether to stream the response body
+
+        Returns:
+            requests.Response: API response, whatever its final status
+
+        Raises:
+            requests.exceptions.RequestException: If the service can't be reached
+        """
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        token = self.get_token()
+        response = self._send(path, body, token, stream)
+        if response.status_code == 401:
+            # The token expired or was revoked before its expected expiry
+            response.close()
+            self.tokens.invalidate(token)
+            logger.info("ZLLM rejected the access token, authenticating again")
+            response = self._send(path, body, self.get_token(), stream)
+        return response
+
+    def _send(self, path: str, body: bytes, token: str | None, stream: bool = False) -> requests.Response:
+        """Send a request, retrying the failures that are safe to retry."""
+        headers = {'Content-Type': 'application/json'}
+        if token is not None:
+            headers['Authorization'] = f'Bearer {token}'
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(f"{self.base_url}{path}", headers=headers, data=body, stream=stream, timeout=TIMEOUT)
+            except requests.exceptions.ConnectionError as e:
+                if not failed_to_connect(e) or attempt >= self.max_retries:
+                    raise
+                logger.warning(f"ZLLM request to {path} failed to connect ({e}), retrying")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                response.close()
+                logger.warning(f"ZLLM request to {path} answered {response.status_code}, retrying")
+
+            time.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+            attempt += 1
+
+    def _fetch_token(self) -> tuple[str, float]:
+        """Exchange the API key for a new access token, returning it with its lifetime in seconds."""
+        response = self._send('/auth', json.dumps({'api_key': self.api_key}).encode('utf-8'), None)
+        try:
+            response.raise_for_status()
+            auth_response = response.json()
+            token = auth_response['token']
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            logger.error(f"Error during ZLLM authentication: {e}")
+            if isinstance(e, requests.exceptions.RequestException):
+                raise
+            raise requests.exceptions.RequestException(f"Invalid ZLLM authentication response: {e}")
+        return token, token_lifetime(token, auth_response)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
@@ -5,74 +5,214 @@ This module contains the core logic for ZLLM API integration,
 including authentication, request handling, and response processing.
 """
 
+import httpx
 import requests
 import json
 import os
 import logging
+from django.conf import settings
 from django.http import JsonResponse, StreamingHttpResponse
 
+from .async_client import AsyncZllmClient, aiter_lines
+from .client import ZllmClient
+
 logger = logging.getLogger('playground.zllm.service')
 
-def get_zllm_token():
+# One client per process, built when the app starts so the ZLLM settings are validated only once
+try:
+    zllm_client = ZllmClient.from_settings(settings)
+except ValueError as e:
+    logger.error(f"ZLLM is not configured: {e}")
+    zllm_client = None
+
+# Async counterpart for ASGI streaming, sharing the sync client's settings and access token
+async_zllm_client = AsyncZllmClient(zllm_client, settings.ZLLM_ASYNC_MAX_CONNECTIONS, settings.ZLLM_POOL_SIZE) if zllm_client else None
+
+
+def get_zllm_client():
     """
-    Authenticates with ZLLM and returns the access token.
+    Returns the process-wide ZLLM client.
     
     Returns:
-        str: Authentication token if successful
+        ZllmClient: The shared client
         
     Raises:
-        ValueError: If required environment variables are missing
-        requests.exceptions.RequestException: If authentication request fails
+        ValueError: If the ZLLM settings are incomplete
     """
-    ZLLM_BASE_URL = os.getenv("ZLLM_BASE_URL", None)
-    ZLLM_API_KEY = os.getenv("ZLLM_API_KEY", None)
+    if zllm_client is None:
+        raise ValueError("ZLLM_BASE_URL, ZLLM_API_KEY and ZLLM_MODEL_NAME must be set")
+    return zllm_client
 
-    if not ZLLM_BASE_URL:
-        raise ValueError("ZLLM_BASE_URL environment variable is not set")
-    
-    if not ZLLM_API_KEY:
-        raise ValueError("ZLLM_API_KEY environment variable is not set")
 
-    headers = {'Content-Type': 'application/json'}
-    data = {'api_key': ZLLM_API_KEY}
+def get_zllm_token():
+    """
+    Returns a valid ZLLM access token, authenticating only when the cached one is missing or about to expire.
     
-    try:
-        response = requests.post(
-            url=f"{ZLLM_BASE_URL}/auth",
-            headers=headers, 
-            data=json.dumps(data),
-            timeout=(30, 300)  # (connect timeout, read timeout)
-        )
-
-        response.raise_for_status()
-        return response.json()['token']
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error during ZLLM authentication: {e}")
-        return e
+    Returns:
+        str: Authentication token
+        
+    Raises:
+        ValueError: If the ZLLM settings are incomplete
+        requests.exceptions.RequestException: If authentication request fails
+    """
+    return get_zllm_client().get_token()
 
 
-def make_zllm_request(url, headers, data):
+def make_zllm_request(path, data):
     """
-    Makes a request to the ZLLM API with retry logic.
+    Makes a request to the ZLLM API, with retries and re-authentication (see ZllmClient.post).
     
     Args:
-        url: API endpoint URL
-        headers: Request headers
+        path: API endpoint path
         data: Request payload
         
     Returns:
         requests.Response: API response
     """
-    response = requests.post(
-        url=url,
-        headers=headers,
-        data=json.dumps(data),
-        timeout=(30, 300)  # (connect timeout, read timeout)
-    )
+    response = get_zllm_client().post(path, data)
     response.raise_for_status()
     return response
 
 
+def format_stream_line(raw_line):
+    """
+    Converts one line of the ZLLM stream into the Server-Sent Events sent to the browser.
+    
+    Args:
+        raw_line: Line of the upstream response, as bytes
+        
+    Yields:
+        str: SSE messages, none for blank lines
+    """
+    try:
+        # Explicitly decode as UTF-8
+        line = raw_line.decode('utf-8', errors='strict').strip()
+        if not line:
+            return
+
+        # Handle SSE-formatted responses from ZLLM API
+        if line.startswith('data: '):
+            json_content = line[6:]  # Remove 'data: ' prefix
+        else:
+            json_content = line
+
+        if not json_content:
+            return
+
+        # Parse the JSON response from ZLLM API
+        json_data = json.loads(json_content)
+
+        # Handle done:false responses (streaming tokens)
+        if json_data.get('done') == False:
+            # Extract content from either 'response' (generate) or 'message.content' (chat)
+            content = ''
+            if 'message' in json_data and 'content' in json_data['message']:
+                content = json_data['message']['content']
+            elif 'response' in json_data:
+                content = json_data['response']
+
+            token_data = {
+                'response': content,
+                'done': False,
+                'model': json_data.get('model', ''),
+                'created_at': json_data.get('created_at', '')
+            }
+            json_str = json.dumps(token_data, ensure_ascii=False)
+            yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
+
+        # Handle done:true responses (completion with metadata)
+        elif json_data.get('done') == True:
+            completion_data = {
+                'done': True,
+                'done_reason': json_data.get('done_reason', 'stop'),
+                'model': json_data.get('model', ''),
+                'created_at': json_data.get('created_at', ''),
+                'context': json_data.get('context', []),
+                'total_duration': json_data.get('total_duration', 0),
+                'load_duration': json_data.get('load_duration', 0),
+                'prompt_eval_count': json_data.get('prompt_eval_count', 0),
+                'prompt_eval_duration': json_data.get('prompt_eval_duration', 0),
+                'eval_count': json_data.get('eval_count', 0),
+                'eval_duration': json_data.get('eval_duration', 0)
+            }
+            json_str = json.dumps(completion_data, ensure_ascii=False)
+            yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
+
+        else:
+            # Handle other response formats (fallback)
+            if line.startswith('data:'):
+                yield f"{line}\n\n"
+            else:
+                yield f"data: {line}\n\n"
+
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        logger.error(f"Error processing streaming response: {e}")
+
+        # Handle UTF-8 decode errors
+        if isinstance(e, UnicodeDecodeError):
+            try:
+                # Try decoding with error handling
+                line = raw_line.decode('utf-8', errors='replace')
+                error_data = {
+                    'error': 'UTF-8 encoding error in API response',
+                    'debug_info': f'Invalid UTF-8 sequence: {str(e)}'
+                }
+                json_str = json.dumps(error_data, ensure_ascii=False)
+                yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
+                return
+            except Exception:
+                return
+
+        # Handle JSON decode errors
+        line_preview = line[:100] if len(line) > 100 else line
+        json_preview = json_content[:100] if len(json_content) > 100 else json_content
+        logger.error(f"JSON decode error: {e}, line: {line_preview}")
+        logger.debug(f"Attempted to parse JSON: {json_preview}")
+
+        # Try to handle partial JSON or malformed responses
+        if json_content:
+            # Check if it might be a partial JSON response
+            if json_content.startswith('{') or json_content.startswith('"'):
+                # Send as error to client for debugging
+                error_data = {
+                    'error': f'Malformed JSON response from API: {json_preview}',
+                    'debug_info': 'The API returned invalid JSON format'
+                }
+                json_str = json.dumps(error_data, ensure_ascii=False)
+                yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
+            else:
+                # Treat as plain text if it doesn't look like JSON
+                yield f"data: {json_content}\n\n"
+        elif line:
+            # Handle cases where the line doesn't have proper SSE format
+            if line.startswith('data:'):
+                yield f"{line}\n\n"
+            else:
+                yield f"data: {line}\n\n"
+
+def stream_error_message(status_code, error):
+    """
+    Returns the message shown to the user when a streaming request failed.
+    
+    Args:
+        status_code: Status of the ZLLM API response, or None if there was no response
+        error: The exception raised by the request
+    """
+    if status_code is None:
+        return 'Unable to connect to the AI service. Please check your connection and try again.'
+    if status_code == 502:
+        return 'The AI service is temporarily unavailable. Please try again in a moment.'
+    if status_code >= 500:
+        return 'The AI service is experiencing issues. Please try again later.'
+    return f'Request failed: {str(error)}'
+
+
+def stream_error_event(error_msg):
+    """Formats an error message as the Server-Sent Event the page displays."""
+    json_str = json.dumps({'error': error_msg}, ensure_ascii=False)
+    return f"data: {json_str}\n\n"
+
+
 def generate_text_streaming(request):
     """
     HTTP controller for streaming text generation endpoint.
@@ -94,35 +234,19 @@ def generate_text_streaming(request):
         logger.warning("Prompt is missing in generate_text_streaming request")
         return JsonResponse({'error': 'Prompt is required'}, status=400)
     
-    # Authenticate with ZLLM and get the token
+    # Authenticate up front, a cache hit after the first request, so failures are reported before any work
     try:
-        token = get_zllm_token()
+        get_zllm_token()
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
         return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
     except requests.exceptions.RequestException as e:
         logger.error(f"Authentication request failed: {e}")
         return JsonResponse({'error': 'Failed to authenticate with ZLLM service'}, status=500)
-    
-    ZLLM_BASE_URL = os.getenv("ZLLM_BASE_URL", None)
-    ZLLM_MODEL_NAME = os.getenv("ZLLM_MODEL_NAME", None)
-
-    if not ZLLM_BASE_URL:
-        logger.error("ZLLM_BASE_URL environment variable is not set")
-        return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
-    
-    if not ZLLM_MODEL_NAME:
-        logger.error("ZLLM_MODEL_NAME environment variable is not set")
-        return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
-
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': f'Bearer {token}'
-    }
 
     # Prepare the data for the request in messages format
     data = {
-        'model': ZLLM_MODEL_NAME,
+        'model': zllm_client.model_name,
         'messages': [
             {
                 'role': 'user',
@@ -133,144 +257,91 @@ def generate_text_streaming(request):
 
     def event_stream():
         try:
-            # Use requests to make a streaming request with timeout
-            with requests.post(
-                url=f"{ZLLM_BASE_URL}/llm/chat/stream",
-                headers=headers,
-                data=json.dumps(data, ensure_ascii=False).encode('utf-8'),
-                stream=True,
-                timeout=(30, 300)  # (connect timeout, read timeout)
-            ) as response:
+            # Stream through the shared client; retries and re-authentication only happen before the first token
+            with zllm_client.post('/llm/chat/stream', data, stream=True) as response:
                 response.raise_for_status()
                 
                 # Process each line from the ZLLM API with explicit UTF-8 decoding
                 for raw_line in response.iter_lines(decode_unicode=False):
                     if raw_line:
-                        try:
-                            # Explicitly decode as UTF-8
-                            line = raw_line.decode('utf-8', errors='strict').strip()
-                            if not line:
-                                continue
-                            
-                            # Handle SSE-formatted responses from ZLLM API
-                            if line.startswith('data: '):
-                                json_content = line[6:]  # Remove 'data: ' prefix
-                            else:
-                                json_content = line
-                                
-                            if not json_content:
-                                continue
-                                
-                            # Parse the JSON response from ZLLM API
-                            json_data = json.loads(json_content)
-
-                            # Handle done:false responses (streaming tokens)
-                            if json_data.get('done') == False:
-                                # Extract content from either 'response' (generate) or 'message.content' (chat)
-                                content = ''
-                                if 'message' in json_data and 'content' in json_data['message']:
-                                    content = json_data['message']['content']
-                                elif 'response' in json_data:
-                                    content = json_data['response']
-
-                                token_data = {
-                                    'response': content,
-                                    'done': False,
-                                    'model': json_data.get('model', ''),
-                                    'created_at': json_data.get('created_at', '')
-                                }
-                                json_str = json.dumps(token_data, ensure_ascii=False)
-                                yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
-                            
-                            # Handle done:true responses (completion with metadata)
-                            elif json_data.get('done') == True:
-                                completion_data = {
-                                    'done': True,
-                                    'done_reason': json_data.get('done_reason', 'stop'),
-                                    'model': json_data.get('model', ''),
-                                    'created_at': json_data.get('created_at', ''),
-                                    'context': json_data.get('context', []),
-                                    'total_duration': json_data.get('total_duration', 0),
-                                    'load_duration': json_data.get('load_duration', 0),
-                                    'prompt_eval_count': json_data.get('prompt_eval_count', 0),
-                                    'prompt_eval_duration': json_data.get('prompt_eval_duration', 0),
-                                    'eval_count': json_data.get('eval_count', 0),
-                                    'eval_duration': json_data.get('eval_duration', 0)
-                                }
-                                json_str = json.dumps(completion_data, ensure_ascii=False)
-                                yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
-                            
-                            else:
-                                # Handle other response formats (fallback)
-                                if line.startswith('data:'):
-                                    yield f"{line}\n\n"
-                                else:
-                                    yield f"data: {line}\n\n"
-                                    
-                        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                            logger.error(f"Error processing streaming response: {e}")
-                            
-                            # Handle UTF-8 decode errors
-                            if isinstance(e, UnicodeDecodeError):
-                                try:
-                                    # Try decoding with error handling
-                                    line = raw_line.decode('utf-8', errors='replace')
-                                    error_data = {
-                                        'error': 'UTF-8 encoding error in API response',
-                                        'debug_info': f'Invalid UTF-8 sequence: {str(e)}'
-                                    }
-                                    json_str = json.dumps(error_data, ensure_ascii=False)
-                                    yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
-                                    continue
-                                except Exception:
-                                    continue
-                            
-                            # Handle JSON decode errors
-                            line_preview = line[:100] if len(line) > 100 else line
-                            json_preview = json_content[:100] if len(json_content) > 100 else json_content
-                            logger.error(f"JSON decode error: {e}, line: {line_preview}")
-                            logger.debug(f"Attempted to parse JSON: {json_preview}")
-                            
-                            # Try to handle partial JSON or malformed responses
-                            if json_content:
-                                # Check if it might be a partial JSON response
-                                if json_content.startswith('{') or json_content.startswith('"'):
-                                    # Send as error to client for debugging
-                                    error_data = {
-                                        'error': f'Malformed JSON response from API: {json_preview}',
-                                        'debug_info': 'The API returned invalid JSON format'
-                                    }
-                                    json_str = json.dumps(error_data, ensure_ascii=False)
-                                    yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
-                                else:
-                                    # Treat as plain text if it doesn't look like JSON
-                                    yield f"data: {json_content}\n\n"
-                            elif line:
-                                # Handle cases where the line doesn't have proper SSE format
-                                if line.startswith('data:'):
-                                    yield f"{line}\n\n"
-                                else:
-                                    yield f"data: {line}\n\n"
+                        yield from format_stream_line(raw_line)
         except requests.exceptions.Timeout:
             logger.error("ZLLM API timeout during streaming request")
-            error_data = {'error': 'The service is taking too long to respond. Please try again.'}
-            json_str = json.dumps(error_data, ensure_ascii=False)
-            yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
+            yield stream_error_event('The service is taking too long to respond. Please try again.')
         except requests.exceptions.RequestException as e:
             logger.error(f"Error during ZLLM streaming request: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                status_code = e.response.status_code
-                if status_code == 502:
-                    error_msg = 'The AI service is temporarily unavailable. Please try again in a moment.'
-                elif status_code >= 500:
-                    error_msg = 'The AI service is experiencing issues. Please try again later.'
-                else:
-                    error_msg = f'Request failed: {str(e)}'
-            else:
-                error_msg = 'Unable to connect to the AI service. Please check your connection and try again.'
-            error_data = {'error': error_msg}
-            json_str = json.dumps(error_data, ensure_ascii=False)
-            yield f"data: {json_str}\n\n".encode('utf-8').decode('utf-8')
+            status_code = e.response.status_code if getattr(e, 'response', None) is not None else None
+            yield stream_error_event(stream_error_message(status_code, e))
+    
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['Content-Encoding'] = 'identity'
+    return response
+
+
+
+async def generate_text_streaming_async(request):
+    """
+    Async HTTP controller for streaming text generation endpoint, for ASGI deployments.
+    
+    Takes the same requests and sends the same Server-Sent Events as
+    generate_text_streaming, but relays the tokens with the async client, so
+    a stream waiting on the ZLLM API holds no thread.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
+    
+    # Parse the JSON data from request body
+    try:
+        data = json.loads(request.body)
+        prompt = data.get('prompt')
+    except json.JSONDecodeError:
+        logger.error("Error decoding JSON in generate_text_streaming_async")
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    if not prompt:
+        logger.warning("Prompt is missing in generate_text_streaming_async request")
+        return JsonResponse({'error': 'Prompt is required'}, status=400)
+    
+    # Authenticate up front, a cache hit after the first request, so failures are reported before any work
+    if async_zllm_client is None:
+        logger.error("Configuration error: ZLLM_BASE_URL, ZLLM_API_KEY and ZLLM_MODEL_NAME must be set")
+        return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
+    try:
+        await async_zllm_client.get_token()
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Authentication request failed: {e}")
+        return JsonResponse({'error': 'Failed to authenticate with ZLLM service'}, status=500)
+
+    # Prepare the data for the request in messages format
+    data = {
+        'model': async_zllm_client.model_name,
+        'messages': [
+            {
+                'role': 'user',
+                'content': prompt
+            }
+        ]
+    }
+
+    async def event_stream():
+        try:
+            # Closing the stream, as Django does when the browser disconnects, releases the upstream connection
+            async with async_zllm_client.stream('/llm/chat/stream', data) as response:
+                response.raise_for_status()
+                
+                async for raw_line in aiter_lines(response):
+                    if raw_line:
+                        for event in format_stream_line(raw_line):
+                            yield event
+        except httpx.TimeoutException:
+            logger.error("ZLLM API timeout during streaming request")
+            yield stream_error_event('The service is taking too long to respond. Please try again.')
+        except (httpx.HTTPError, requests.exceptions.RequestException) as e:
+            # Renewing a rejected token goes through the sync client, hence requests errors
+            logger.error(f"Error during ZLLM streaming request: {e}")
+            status_code = e.response.status_code if getattr(e, 'response', None) is not None else None
+            yield stream_error_event(stream_error_message(status_code, e))
     
     response = StreamingHttpResponse(event_stream(), content_type='text/event-stream; charset=utf-8')
     response['Cache-Control'] = 'no-cache'
@@ -299,44 +370,24 @@ def generate_text(request):
         logger.warning("Prompt is missing")  # Log missing prompt
         return JsonResponse({'error': 'Prompt is required'}, status=400)
     
-    # Authenticate with ZLLM and get the token
+    # Authenticate up front, a cache hit after the first request, so failures are reported before any work
     try:
-        token = get_zllm_token()
+        get_zllm_token()
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
         return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
     except requests.exceptions.RequestException as e:
         logger.error(f"Authentication request failed: {e}")
         return JsonResponse({'error': 'Failed to authenticate with ZLLM service'}, status=500)
-    
-    ZLLM_BASE_URL = os.getenv("ZLLM_BASE_URL", None)
-    ZLLM_MODEL_NAME = os.getenv("ZLLM_MODEL_NAME", None)
-
-    if not ZLLM_BASE_URL:
-        logger.error("ZLLM_BASE_URL environment variable is not set")
-        return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
-    
-    if not ZLLM_MODEL_NAME:
-        logger.error("ZLLM_MODEL_NAME environment variable is not set")
-        return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
-
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': f'Bearer {token}'
-    }
 
     # Prepare the data for the request
     data = {
         'prompt': prompt,
-        'model': ZLLM_MODEL_NAME,
+        'model': zllm_client.model_name,
     }
 
     try:
-        response = make_zllm_request(
-            url=f"{ZLLM_BASE_URL}/llm/generate",
-            headers=headers,
-            data=data
-        )
+        response = make_zllm_request('/llm/generate', data)
         return JsonResponse(response.json())
     except requests.exceptions.Timeout:
         logger.error("ZLLM API timeout")
@@ -386,31 +437,15 @@ def chat_with_zllm(request):
         logger.warning("Prompt is missing")
         return JsonResponse({'error': 'Prompt is required'}, status=400)
     
-    # Authenticate with ZLLM and get the token
+    # Authenticate up front, a cache hit after the first request, so failures are reported before any work
     try:
-        token = get_zllm_token()
+        get_zllm_token()
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
         return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
     except requests.exceptions.RequestException as e:
         logger.error(f"Authentication request failed: {e}")
         return JsonResponse({'error': 'Failed to authenticate with ZLLM service'}, status=500)
-    
-    ZLLM_BASE_URL = os.getenv("ZLLM_BASE_URL", None)
-    ZLLM_MODEL_NAME = os.getenv("ZLLM_MODEL_NAME", None)
-
-    if not ZLLM_BASE_URL:
-        logger.error("ZLLM_BASE_URL environment variable is not set")
-        return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
-    
-    if not ZLLM_MODEL_NAME:
-        logger.error("ZLLM_MODEL_NAME environment variable is not set")
-        return JsonResponse({'error': 'ZLLM configuration is incomplete'}, status=500)
-
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': f'Bearer {token}'
-    }
 
     # Read the system prompt from file
     try:
@@ -442,15 +477,11 @@ def chat_with_zllm(request):
     # Prepare the data for the request
     data = {
         'messages': messages,
-        'model': ZLLM_MODEL_NAME,
+        'model': zllm_client.model_name,
     }
 
     try:
-        response = make_zllm_request(
-            url=f"{ZLLM_BASE_URL}/llm/chat",
-            headers=headers,
-            data=data
-        )
+        response = make_zllm_request('/llm/chat', data)
         response_data = response.json()
         return JsonResponse({'response': response_data.get('response', '')})
     except requests.exceptions.Timeout:
@@ -153,9 +153,81 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'rate_limit_cache',
-    }
+    },
+    # Continuation checkpoints of long Game of Life simulations, expired after TIMEOUT seconds.
+    # Kept in the database, so a cursor can be followed from any worker process
+    # (the table is created by the createcachetable command)
+    'game_of_life': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'game_of_life_cursors',
+        'TIMEOUT': int(os.environ.get('GAME_OF_LIFE_CURSOR_TTL', 600)),
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+    # Animated renders of Game of Life simulations, keyed by pattern hash
+    'game_of_life_renders': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'game_of_life_renders',
+        'TIMEOUT': int(os.environ.get('GAME_OF_LIFE_RENDER_TTL', 24 * 60 * 60)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('GAME_OF_LIFE_RENDER_CACHE_ENTRIES', 64)),
+        },
+    },
 }
 
+# Game of Life simulation result cache (kept in memory by each worker process)
+GAME_OF_LIFE_CACHE_MAX_ENTRIES = int(os.environ.get('GAME_OF_LIFE_CACHE_MAX_ENTRIES', 128))
+GAME_OF_LIFE_CACHE_MAX_BYTES = int(os.environ.get('GAME_OF_LIFE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Upper bound on generations reachable by following continuation cursors
+GAME_OF_LIFE_MAX_TOTAL_GENERATIONS = int(os.environ.get('GAME_OF_LIFE_MAX_TOTAL_GENERATIONS', 100_000))
+
+# Processes simulating Game of Life patterns for each web worker (0 runs them inline),
+# and the wall-clock budget in seconds after which a simulation returns partial results
+GAME_OF_LIFE_POOL_WORKERS = int(os.environ.get('GAME_OF_LIFE_POOL_WORKERS', 2))
+GAME_OF_LIFE_TIME_BUDGET = float(os.environ.get('GAME_OF_LIFE_TIME_BUDGET', 5.0))
+
+# Engine running simulations: 'auto' picks one per pattern, or force one of
+# 'sparse', 'incremental', 'dense', 'tiled' or 'bitset' (which needs no NumPy)
+GAME_OF_LIFE_ENGINE = os.environ.get('GAME_OF_LIFE_ENGINE', 'auto')
+
+# Game of Life admission control. Patterns over the population or bounding-box area limits are
+# rejected; costs are estimated in cell updates, per request and for all simulations in a process
+GAME_OF_LIFE_MAX_POPULATION = int(os.environ.get('GAME_OF_LIFE_MAX_POPULATION', 100_000))
+GAME_OF_LIFE_MAX_AREA = int(os.environ.get('GAME_OF_LIFE_MAX_AREA', 1 << 32))
+GAME_OF_LIFE_REQUEST_BUDGET = float(os.environ.get('GAME_OF_LIFE_REQUEST_BUDGET', 50_000_000))
+GAME_OF_LIFE_PROCESS_BUDGET = float(os.environ.get('GAME_OF_LIFE_PROCESS_BUDGET', 200_000_000))
+
+# Background simulation jobs, run by the run_simulation_worker management command
+GAME_OF_LIFE_JOB_MAX_GENERATIONS = int(os.environ.get('GAME_OF_LIFE_JOB_MAX_GENERATIONS', 1_000_000))
+GAME_OF_LIFE_JOB_MAX_PENDING = int(os.environ.get('GAME_OF_LIFE_JOB_MAX_PENDING', 100))
+
+# Batch pattern search: patterns per request, and the wall-clock budget in seconds for all of them
+GAME_OF_LIFE_SEARCH_MAX_PATTERNS = int(os.environ.get('GAME_OF_LIFE_SEARCH_MAX_PATTERNS', 500))
+GAME_OF_LIFE_SEARCH_TIME_BUDGET = float(os.environ.get('GAME_OF_LIFE_SEARCH_TIME_BUDGET', 20.0))
+# Most a search holds from the process budget: past it, the time budget cuts the search short anyway
+GAME_OF_LIFE_SEARCH_BUDGET = float(os.environ.get('GAME_OF_LIFE_SEARCH_BUDGET', 100_000_000))
+
+# Precomputed preset simulations, built by the build_pattern_catalog management command
+GAME_OF_LIFE_CATALOG_PATH = os.environ.get('GAME_OF_LIFE_CATALOG_PATH', str(BASE_DIR / 'playground' / 'game_of_life' / 'catalog.bin'))
+
+# ZLLM service, read once at startup; ZLLM pages answer with an error while any of these is missing
+ZLLM_BASE_URL = os.environ.get('ZLLM_BASE_URL')
+ZLLM_API_KEY = os.environ.get('ZLLM_API_KEY')
+ZLLM_MODEL_NAME = os.environ.get('ZLLM_MODEL_NAME')
+
+# Keep-alive connections kept open to the ZLLM service by each worker process, and retries of
+# requests that failed before reaching it
+ZLLM_POOL_SIZE = int(os.environ.get('ZLLM_POOL_SIZE', 10))
+ZLLM_MAX_RETRIES = int(os.environ.get('ZLLM_MAX_RETRIES', 2))
+
+# Serve the ZLLM token stream with an async view. Only enable it when running under an ASGI server
+# (portifolio_mlziade.asgi), since a WSGI server buffers async streams until they end. Each ASGI
+# worker then keeps at most ZLLM_ASYNC_MAX_CONNECTIONS connections open to the ZLLM service.
+ZLLM_ASYNC_STREAMING = os.environ.get('ZLLM_ASYNC_STREAMING', 'False') == 'True'
+ZLLM_ASYNC_MAX_CONNECTIONS = int(os.environ.get('ZLLM_ASYNC_MAX_CONNECTIONS', 500))
+
 REST_FRAMEWORK = {
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',